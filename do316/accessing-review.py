@@ -17,13 +17,11 @@ import os
 import sys
 import logging
 import requests
-import time
 
 from urllib3 import disable_warnings
 from urllib3.exceptions import InsecureRequestWarning
 from kubernetes.client.exceptions import ApiException
 
-from ocp import api
 from ocp.utils import OpenShift
 from labs import labconfig
 from labs.common import labtools, userinterface
@@ -44,12 +42,20 @@ _targets = [
 # Default namespace for the resources
 NAMESPACE = ["vm-images", "staging-db", "development-db"]
 
+# Objects listed once for the grading steps
+GRADED_KINDS = [
+    ("rbac.authorization.k8s.io/v1", "RoleBinding", NAMESPACE[1]),
+    ("rbac.authorization.k8s.io/v1", "RoleBinding", NAMESPACE[2]),
+    ("kubevirt.io/v1", "VirtualMachine", NAMESPACE[1]),
+    ("kubevirt.io/v1", "VirtualMachine", NAMESPACE[2]),
+]
+
 # Disable certificate validation
 disable_warnings(InsecureRequestWarning)
 
 
 # Change the class name to match your file name with WordCaps
-class AccessingReview(OpenShift):
+class AccessingReview(common.GradingLab, OpenShift):
     """
     Accessing Review GE script for DO316
     """
@@ -68,7 +74,7 @@ class AccessingReview(OpenShift):
     def __init__(self):
         logging.debug("{} / {}".format(SKU, sys._getframe().f_code.co_name))
         try:
-            super().__init__()
+            common.login(self)
         except requests.exceptions.ConnectionError:
             print(
                 "The Lab environment is not ready, please wait 10 minutes before trying again."
@@ -97,23 +103,13 @@ class AccessingReview(OpenShift):
                 "fatal": True,
             },
             {
-                "label": "Pinging API",
-                "task": self._start_ping_api,
-                "host": self.OCP_API["host"],
-                "fatal": True,
-            },
-            {
-                "label": "Checking API",
-                "task": self._start_check_api,
+                "label": "Checking the cluster and its API",
+                "task": common.preflight,
+                "oc_client": self.oc_client,
                 "host": self.OCP_API["host"],
                 "port": self.OCP_API["port"],
                 "fatal": True,
             },
-            {
-                "label": "Checking cluster readiness",
-                "task": self._start_check_cluster_ready,
-                "fatal": True,
-            },
             {
                 "label": "Verifying OpenShift Virtualization Operator",
                 "task": common.openshift_virt,
@@ -128,14 +124,18 @@ class AccessingReview(OpenShift):
             },
             {
                 "label": "Creating exercise users",
-                "task": self.run_playbook,
+                "task": common.apply_playbook,
                 "playbook": f"ansible/{self.__LAB__}/create-users.yml",
+                "oc_client": self.oc_client,
+                "fallback": self.run_playbook,
                 "fatal": True,
             },
             {
                 "label": "Creating exercise resources (please be patient)",
-                "task": self.run_playbook,
+                "task": common.apply_playbook,
                 "playbook": f"ansible/{self.__LAB__}/resources.yml",
+                "oc_client": self.oc_client,
+                "fallback": self.run_playbook,
                 "fatal": True,
             },
             {
@@ -146,8 +146,7 @@ class AccessingReview(OpenShift):
             },
             {
                 "label": "Confirming virtctl availability",
-                "task": self.run_playbook,
-                "playbook": "ansible/roles/deploy-virtctl.yml",
+                "task": common.ensure_virtctl,
                 "fatal": True,
             },
         ]
@@ -165,6 +164,14 @@ class AccessingReview(OpenShift):
                 "hosts": _targets,
                 "fatal": True,
             },
+            {
+                "label": "Checking the cluster and its API",
+                "task": common.preflight,
+                "oc_client": self.oc_client,
+                "host": self.OCP_API["host"],
+                "port": self.OCP_API["port"],
+                "fatal": True,
+            },
             {
                 "label": "Confirm admin rolebindings for the database-admins group",
                 "task": self._grade_rolebinding,
@@ -218,9 +225,7 @@ class AccessingReview(OpenShift):
                 "vm_project": "development-db",
             },
         ]
-        ui = userinterface.Console(items)
-        ui.run_items(action="Grading")
-        ui.report_grade()
+        self.grade_items(items, GRADED_KINDS)
 
     def finish(self):
         """
@@ -241,8 +246,10 @@ class AccessingReview(OpenShift):
             },
             {
                 "label": "Deleting exercise users",
-                "task": self.run_playbook,
+                "task": common.apply_playbook,
                 "playbook": f"ansible/{self.__LAB__}/delete-users.yml",
+                "oc_client": self.oc_client,
+                "fallback": self.run_playbook,
                 "fatal": True,
             },
             {
@@ -256,63 +263,6 @@ class AccessingReview(OpenShift):
 
     # Start tasks
 
-    def _start_ping_api(self, item):
-        """
-        Execute a task to prepare the system for the lab
-        """
-        if item["host"] is None:
-            item["failed"] = True
-            item["msgs"] = [{"text": "OCP_HOST is not defined"}]
-        else:
-            check = labtools.ping(item["host"])
-            for key in check:
-                item[key] = check[key]
-
-        # Return status to abort lab execution when failed
-        return item["failed"]
-
-    def _start_check_api(self, item):
-        if item["host"] is None or item["port"] is None:
-            item["failed"] = True
-            item["msgs"] = [{"text": "OCP_HOST and OCP_PORT are not defined"}]
-        else:
-            if api.isApiUp(item["host"], port=item["port"]):
-                item["failed"] = False
-            else:
-                item["failed"] = True
-                item["msgs"] = [
-                    {
-                        "text": "API could not be reached: https://{}:{}/".format(
-                            item["host"], item["port"]
-                        )
-                    }
-                ]
-
-        # Return status to abort lab execution when failed
-        return item["failed"]
-
-    def _start_check_cluster_ready(self, item):
-        item["failed"] = True
-        # Get resources from cluster to check API
-        self.oc_client.resources.get(
-            api_version="project.openshift.io/v1", kind="Project"
-        ).get()
-        self.oc_client.resources.get(api_version="v1", kind="Node").get()
-        self.oc_client.resources.get(api_version="v1", kind="Namespace").get()
-
-        try:
-            v1_config = self.oc_client.resources.get(
-                api_version="config.openshift.io/v1", kind="ClusterVersion"
-            )
-            cluster_version = v1_config.get().items[0]
-            if cluster_version.spec.clusterID is None:
-                item["failed"] = True
-                item["msgs"] = [{"text": "Cluster ID could not be found"}]
-            else:
-                item["failed"] = False
-        except Exception:
-            item["msgs"] = [{"text": "Cluster is not OpenShift"}]
-
     def _check_ge_namespace(self, item):
         """
         Check GE namespace
@@ -503,9 +453,7 @@ class AccessingReview(OpenShift):
 
         for x in projects:
             try:
-                self.delete_resource("v1", "Namespace", (x), "")
+                common.delete_namespace(self.oc_client, x)
             except Exception as e:
                 item["failed"] = True
                 item["msgs"] = [{"text": "Failed removing namespace: %s" % e}]
-            if not item["failed"]:
-                time.sleep(30)
@@ -17,13 +17,11 @@ import os
 import sys
 import logging
 import requests
-import time
 
 from urllib3 import disable_warnings
 from urllib3.exceptions import InsecureRequestWarning
 from kubernetes.client.exceptions import ApiException
 
-from ocp import api
 from ocp.utils import OpenShift
 from labs import labconfig
 from labs.common import labtools, userinterface
@@ -68,7 +66,7 @@ class AdvancedImport(OpenShift):
     def __init__(self):
         logging.debug("{} / {}".format(SKU, sys._getframe().f_code.co_name))
         try:
-            super().__init__()
+            common.login(self)
         except requests.exceptions.ConnectionError:
             print(
                 "The Lab environment is not ready, please wait 10 minutes before trying again."
@@ -97,23 +95,13 @@ class AdvancedImport(OpenShift):
                 "fatal": True,
             },
             {
-                "label": "Pinging API",
-                "task": self._start_ping_api,
-                "host": self.OCP_API["host"],
-                "fatal": True,
-            },
-            {
-                "label": "Checking API",
-                "task": self._start_check_api,
+                "label": "Checking the cluster and its API",
+                "task": common.preflight,
+                "oc_client": self.oc_client,
                 "host": self.OCP_API["host"],
                 "port": self.OCP_API["port"],
                 "fatal": True,
             },
-            {
-                "label": "Checking cluster readiness",
-                "task": self._start_check_cluster_ready,
-                "fatal": True,
-            },
             # TODO: Remove MTV if already installed
             {
                 "label": "Verifying migration toolkit for virtualization requirements",
@@ -123,26 +111,25 @@ class AdvancedImport(OpenShift):
             },
             {
                 "label": "Preparing the utility system for the exercise",
-                "task": self.run_playbook,
+                "task": common.apply_playbook,
                 "playbook": f"ansible/{self.__LAB__}/add_ova_image.yml",
-                "fatal": True,
-            },
-            {
-                "label": "Verifying OpenShift Virtualization Operator",
-                "task": common.openshift_virt,
                 "oc_client": self.oc_client,
+                "fallback": self.run_playbook,
                 "fatal": True,
             },
             {
-                "label": "Verifying Kubernetes NMState Operator",
-                "task": common.nmstate_operator,
+                "label": "Verifying OpenShift Virtualization and Kubernetes NMState Operators",
+                "task": common.install_operators,
+                "operators": ["openshift-virtualization", "nmstate"],
                 "oc_client": self.oc_client,
                 "fatal": True,
             },
             {
                 "label": "Configuring additional vm network",
-                "task": self.run_playbook,
+                "task": common.apply_playbook,
                 "playbook": f"ansible/{self.__LAB__}/add_net.yml",
+                "oc_client": self.oc_client,
+                "fallback": self.run_playbook,
                 "fatal": True,
             },
             {
@@ -163,8 +150,7 @@ class AdvancedImport(OpenShift):
             },
             {
                 "label": "Confirming virtctl availability",
-                "task": self.run_playbook,
-                "playbook": "ansible/roles/deploy-virtctl.yml",
+                "task": common.ensure_virtctl,
                 "fatal": True,
             },
         ]
@@ -184,8 +170,10 @@ class AdvancedImport(OpenShift):
             },
             {
                 "label": "Cleaning the utility system",
-                "task": self.run_playbook,
+                "task": common.apply_playbook,
                 "playbook": f"ansible/{self.__LAB__}/remove_ova_image.yml",
+                "oc_client": self.oc_client,
+                "fallback": self.run_playbook,
                 "fatal": True,
             },
             {
@@ -195,8 +183,10 @@ class AdvancedImport(OpenShift):
             },
             {
                 "label": "Removing VM network",
-                "task": self.run_playbook,
+                "task": common.apply_playbook,
                 "playbook": f"ansible/{self.__LAB__}/remove_net.yml",
+                "oc_client": self.oc_client,
+                "fallback": self.run_playbook,
                 "fatal": True,
             },
             {
@@ -214,63 +204,6 @@ class AdvancedImport(OpenShift):
         userinterface.Console(items).run_items(action="Finishing")
 
     # Start tasks
-    def _start_ping_api(self, item):
-        """
-        Execute a task to prepare the system for the lab
-        """
-        if item["host"] is None:
-            item["failed"] = True
-            item["msgs"] = [{"text": "OCP_HOST is not defined"}]
-        else:
-            check = labtools.ping(item["host"])
-            for key in check:
-                item[key] = check[key]
-
-        # Return status to abort lab execution when failed
-        return item["failed"]
-
-    def _start_check_api(self, item):
-        if item["host"] is None or item["port"] is None:
-            item["failed"] = True
-            item["msgs"] = [{"text": "OCP_HOST and OCP_PORT are not defined"}]
-        else:
-            if api.isApiUp(item["host"], port=item["port"]):
-                item["failed"] = False
-            else:
-                item["failed"] = True
-                item["msgs"] = [
-                    {
-                        "text": "API could not be reached: https://{}:{}/".format(
-                            item["host"], item["port"]
-                        )
-                    }
-                ]
-
-        # Return status to abort lab execution when failed
-        return item["failed"]
-
-    def _start_check_cluster_ready(self, item):
-        item["failed"] = True
-        # Get resources from cluster to check API
-        self.oc_client.resources.get(
-            api_version="project.openshift.io/v1", kind="Project"
-        ).get()
-        self.oc_client.resources.get(api_version="v1", kind="Node").get()
-        self.oc_client.resources.get(api_version="v1", kind="Namespace").get()
-
-        try:
-            v1_config = self.oc_client.resources.get(
-                api_version="config.openshift.io/v1", kind="ClusterVersion"
-            )
-            cluster_version = v1_config.get().items[0]
-            if cluster_version.spec.clusterID is None:
-                item["failed"] = True
-                item["msgs"] = [{"text": "Cluster ID could not be found"}]
-            else:
-                item["failed"] = False
-        except Exception:
-            item["msgs"] = [{"text": "Cluster is not OpenShift"}]
-
     def _create_ge_namespace(self, item):
         """
         Create GE namespace
@@ -354,16 +287,7 @@ class AdvancedImport(OpenShift):
         item["failed"] = False
 
         try:
-            ns = self.oc_client.resources.get(
-                api_version="v1",
-                kind="Namespace",
-            )
-            if ns.get(name=NAMESPACE):
-                ns.delete(name=NAMESPACE)
-                for t in range(120):
-                    time.sleep(1)
-                    if not ns.get(name=NAMESPACE):
-                        break
+            common.delete_namespace(self.oc_client, NAMESPACE, timeout=120)
 
         except ApiException as e:
             if e.status != 404:
@@ -378,61 +302,31 @@ class AdvancedImport(OpenShift):
         item["msgs"] = []
 
         try:
-            fc = self.oc_client.resources.get(
-                api_version="console.openshift.io/v1",
-                kind="ConsolePlugin",
+            common.delete_all(
+                self.oc_client,
+                [
+                    (
+                        "console.openshift.io/v1",
+                        "ConsolePlugin",
+                        "forklift-console-plugin",
+                        "",
+                    ),
+                    ("v1", "Namespace", "openshift-mtv", ""),
+                ],
+                timeout=120,
             )
-            if fc.get(name="forklift-console-plugin"):
-                fc.delete(name="forklift-console-plugin", namespace="")
-                for t in range(60):
-                    time.sleep(1)
-                    if not fc.get(name="forklift-console-plugin"):
-                        break
-
-            if fc.get(name="forklift-console-plugin"):
-                raise Exception(
-                    "forklift-console-plugin is not deleted after 60 seconds"
-                )
-
-        except ApiException as e:
-            if e.status != 404:
-                raise e
-
         except Exception as e:
             item["failed"] = True
             item["msgs"].append(
-                {"text": "Failed removing forklift-console-plugin resource: %s" % e}
-            )
-            return
-
-        try:
-            ns = self.oc_client.resources.get(
-                api_version="v1",
-                kind="Namespace",
-            )
-            if ns.get(name="openshift-mtv"):
-                ns.delete(name="openshift-mtv")
-                for t in range(120):
-                    time.sleep(1)
-                    if not ns.get(name="openshift-mtv"):
-                        break
-
-            if ns.get(name="openshift-mtv"):
-                raise Exception("openshift-mtv namespace not deleted after 120 seconds")
-
-        except ApiException as e:
-            if e.status != 404:
-                raise e
-
-        except Exception as e:
-            item["failed"] = True
-            item["msgs"].append(
-                {"text": "Failed removing namespace openshift-mtv: %s" % (e,)}
+                {
+                    "text": "Failed removing the migration toolkit for virtualization: %s"
+                    % e
+                }
             )
             return
 
         try:
-            crds = {
+            crds = [
                 "forkliftcontrollers.forklift.konveyor.io",
                 "hooks.forklift.konveyor.io",
                 "hosts.forklift.konveyor.io",
@@ -443,14 +337,14 @@ class AdvancedImport(OpenShift):
                 "plans.forklift.konveyor.io",
                 "providers.forklift.konveyor.io",
                 "storagemaps.forklift.konveyor.io",
-            }
-            for crd in crds:
-                self.delete_resource(
-                    "apiextensions.k8s.io",
-                    "customresourcedefinition",
-                    (crd),
-                    "",
-                )
+            ]
+            common.delete_all(
+                self.oc_client,
+                [
+                    ("apiextensions.k8s.io/v1", "CustomResourceDefinition", crd, "")
+                    for crd in crds
+                ],
+            )
         except Exception as e:
             item["failed"] = True
             item["msgs"].append(
@@ -459,6 +353,7 @@ class AdvancedImport(OpenShift):
                     % e
                 }
             )
+        common.invalidate_discovery(self.oc_client)
 
         pv_api = self.oc_client.resources.get(api_version="v1", kind="PersistentVolume")
         pvs = pv_api.get()
@@ -1,89 +1,417 @@
 import time
 import os
 import sys
+import re
+import copy
+import json
+import base64
+import hashlib
+import functools
+import shlex
+import shutil
+import tarfile
 import logging
+import tempfile
+import subprocess
 import pkg_resources
+import yaml
+import requests
+from concurrent.futures import ThreadPoolExecutor
 
 from labs import labconfig
 from labs.common import labtools, userinterface
-from ocp import utils
+from ocp import api, utils
 from ocp.utils import OpenShift
 
-# from openshift.dynamic import DynamicClient
+from openshift.dynamic import DynamicClient
 from openshift.dynamic.exceptions import (
     NotFoundError,
     ResourceNotFoundError,
     ForbiddenError,
     InternalServerError,
 )
+from kubernetes import client
 from kubernetes.client.exceptions import ApiException
 
+from do316.version import __version__
 
-def _wait_hyperconverged_ready(c):
-    a, k, n = "hco.kubevirt.io/v1beta1", "HyperConverged", "openshift-cnv"
-    s, t = 0, 600
-    ready = "False"
-    while ready == "False":
-        try:
-            r = c.resources.get(api_version=a, kind=k)
-        except InternalServerError:
-            s += 1
-            continue
-        if s > t:
+
+# Seconds between two checks when watching the objects is not possible
+POLL_INTERVAL = 5
+
+# Files that keep data between the lab commands
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "do316")
+# Seconds the API discovery of a cluster is reused
+DISCOVERY_TTL = 24 * 3600
+# Bearer tokens of the lab users, readable by the student only
+TOKENS_FILE = os.path.join(CACHE_DIR, "tokens.json")
+# Key of TOKENS_FILE with the attributes that OpenShift.__init__ sets
+_BASE_ATTRIBUTES = "attributes"
+# Seconds the index of the course operator catalog is reused
+CATALOG_TTL = 3600
+# Seconds a successful preflight of a cluster is reused
+PREFLIGHT_TTL = 600
+
+# OpenShift Virtualization release of the course, such as "4.14"
+CNV_VERSION = ".".join(__version__.split(".")[:2])
+VIRTCTL = "/usr/local/bin/virtctl"
+# Namespace of the golden images that the lab DataVolumes clone. No lab
+# creates or deletes it.
+IMAGES_NAMESPACE = "do316-images"
+VIRTCTL_URL = (
+    "https://hyperconverged-cluster-cli-download-openshift-cnv"
+    ".apps.ocp4.example.com/amd64/linux/virtctl.tar.gz"
+)
+
+
+def _available(obj):
+    for cond in (obj.get("status") or {}).get("conditions") or []:
+        if cond["type"] == "Available":
+            return cond["status"] == "True"
+    return False
+
+
+def _wait_available(c, api_version, kind, namespace, timeout=600):
+    """
+    Wait until every object of the given kind in the namespace reports the
+    Available condition, following a watch on them. When the API cannot be
+    watched, the objects are listed again every POLL_INTERVAL seconds.
+    """
+    deadline = time.time() + timeout
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
             raise TimeoutError
-        time.sleep(s)
-        for i in r.get(kind=k, namespace=n)["items"]:
-            try:
-                for j in i["status"]["conditions"]:
-                    if j["type"] == "Available":
-                        ready = j["status"]
-            except TypeError:
-                pass
-        s += s * 1.2 + 1
+        try:
+            r = c.resources.get(api_version=api_version, kind=kind)
+            listing = r.get(namespace=namespace).to_dict()
+            objs = {i["metadata"]["name"]: i for i in listing["items"]}
+            if objs and all(_available(i) for i in objs.values()):
+                return
+            for e in r.watch(
+                namespace=namespace,
+                resource_version=listing["metadata"]["resourceVersion"],
+                timeout=max(int(remaining), 1),
+            ):
+                name = e["raw_object"]["metadata"]["name"]
+                if e["type"] == "DELETED":
+                    objs.pop(name, None)
+                else:
+                    objs[name] = e["raw_object"]
+                if objs and all(_available(i) for i in objs.values()):
+                    return
+        except (
+            NotFoundError,
+            ResourceNotFoundError,
+            InternalServerError,
+            ApiException,
+        ):
+            time.sleep(max(min(POLL_INTERVAL, deadline - time.time()), 0))
+
+
+def _wait_hyperconverged_ready(c):
+    _wait_available(c, "hco.kubevirt.io/v1beta1", "HyperConverged", "openshift-cnv")
 
 
 def _wait_nmstate_ready(c):
-    s, t = 0, 600
-    ready = "False"
-    while ready == "False":
-        try:
-            r = c.resources.get(api_version="apps/v1", kind="Deployment")
-        except InternalServerError:
-            s += 1
-            continue
-        if s > t:
-            raise TimeoutError
-        time.sleep(s)
-        for i in r.get(namespace="openshift-nmstate")["items"]:
-            try:
-                for j in i["status"]["conditions"]:
-                    if j["type"] == "Available":
-                        ready = j["status"]
-            except TypeError:
-                pass
-        s += s * 1.2 + 1
+    _wait_available(c, "apps/v1", "Deployment", "openshift-nmstate")
 
 
 def _wait_node_maintenance_ready(c):
-    s, t = 0, 600
-    ready = "False"
-    while ready == "False":
-        try:
-            r = c.resources.get(api_version="apps/v1", kind="Deployment")
-        except InternalServerError:
-            s += 1
-            continue
-        if s > t:
-            raise TimeoutError
-        time.sleep(s)
-        for i in r.get(namespace="openshift-workload-availability")["items"]:
+    _wait_available(c, "apps/v1", "Deployment", "openshift-workload-availability")
+
+
+def cluster_id(c):
+    """
+    Return the ID of the cluster, read without going through API discovery.
+    """
+    path = "/apis/config.openshift.io/v1/clusterversions/version"
+    return c.request("GET", path).spec.clusterID
+
+
+def _discovery_file(cid):
+    path = os.path.join(CACHE_DIR, "discovery-%s.json" % cid)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    if os.path.exists(path) and os.path.getmtime(path) < time.time() - DISCOVERY_TTL:
+        os.remove(path)
+    return path
+
+
+def cached_client(c):
+    """
+    Return a client with the connection of 'c' that keeps the API discovery
+    in a file per cluster ID, so the lab commands do not discover every API
+    group again. The file is refreshed after DISCOVERY_TTL seconds.
+    Returns 'c' when the file cannot be used.
+    """
+    try:
+        path = _discovery_file(cluster_id(c))
+        # DynamicClient only takes its cache_file when it is built
+        return type(c)(c.client, cache_file=path, discoverer=type(c.resources))
+    except Exception as e:
+        logging.debug("Cannot cache the API discovery: %s" % e)
+    return c
+
+
+def _token_key(ocp_api):
+    return "%s@%s:%s" % (ocp_api["user"], ocp_api["host"], ocp_api["port"])
+
+
+def _load_tokens():
+    try:
+        with open(TOKENS_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_tokens(tokens):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # The other cache files may have created the directory already
+    os.chmod(CACHE_DIR, 0o700)
+    fd = os.open(TOKENS_FILE + ".tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(tokens, f)
+    os.rename(TOKENS_FILE + ".tmp", TOKENS_FILE)
+
+
+def token_client(ocp_api):
+    """
+    Return a client that uses the cached token of the OCP_API user, or None
+    when there is no token or the API server rejects it.
+    """
+    token = _load_tokens().get(_token_key(ocp_api))
+    if token is None:
+        return None
+    config = client.Configuration()
+    config.host = "https://%s:%s" % (ocp_api["host"], ocp_api["port"])
+    config.verify_ssl = False
+    config.api_key = {"authorization": "Bearer " + token}
+    api_client = client.ApiClient(config)
+    try:
+        # Checks the token without going through API discovery
+        version = api_client.call_api(
+            "/apis/config.openshift.io/v1/clusterversions/version",
+            "GET",
+            auth_settings=["BearerToken"],
+            response_type="object",
+            _return_http_data_only=True,
+        )
+    except ApiException as e:
+        if e.status == 401:
+            tokens = _load_tokens()
+            tokens.pop(_token_key(ocp_api), None)
             try:
-                for j in i["status"]["conditions"]:
-                    if j["type"] == "Available":
-                        ready = j["status"]
-            except TypeError:
+                _save_tokens(tokens)
+            except OSError:
                 pass
-        s += s * 1.2 + 1
+        return None
+    except Exception:
+        return None
+    try:
+        path = _discovery_file(version["spec"]["clusterID"])
+        return DynamicClient(api_client, cache_file=path)
+    except Exception:
+        return None
+
+
+def login(lab):
+    """
+    Set lab.oc_client. OpenShift.__init__ logs in with the password of
+    lab.OCP_API, and the new token is cached together with the attributes
+    that OpenShift.__init__ set. When those are only oc_client, the next
+    commands use the cached token of the lab user instead, while the API
+    server still accepts it.
+    """
+    if _load_tokens().get(_BASE_ATTRIBUTES) == ["oc_client"]:
+        c = token_client(lab.OCP_API)
+        if c is not None:
+            lab.oc_client = c
+            return
+    before = set(vars(lab))
+    OpenShift.__init__(lab)
+    tokens = _load_tokens()
+    tokens[_BASE_ATTRIBUTES] = sorted(set(vars(lab)) - before)
+    api_key = lab.oc_client.client.configuration.api_key or {}
+    token = api_key.get("authorization")
+    if token:
+        tokens[_token_key(lab.OCP_API)] = token.split(" ")[-1]
+    try:
+        _save_tokens(tokens)
+    except OSError as e:
+        logging.debug("Cannot cache the token: %s" % e)
+    lab.oc_client = cached_client(lab.oc_client)
+
+
+def invalidate_discovery(c):
+    """
+    Refresh the API discovery after installing or removing CRDs.
+    """
+    c.resources.invalidate_cache()
+
+
+def _ping(host):
+    check = labtools.ping(host)
+    if check.get("failed"):
+        raise Exception(" ".join(m["text"] for m in check.get("msgs") or []))
+
+
+def _check_api(host, port):
+    if not api.isApiUp(host, port=port):
+        raise Exception("API could not be reached: https://{}:{}/".format(host, port))
+
+
+def _check_list(c, api_version, kind):
+    c.resources.get(api_version=api_version, kind=kind).get(limit=1)
+
+
+def _check_cluster_id(c):
+    if cluster_id(c) is None:
+        raise Exception("Cluster ID could not be found")
+
+
+def preflight(item):
+    """
+    Task that checks that the cluster and its API are up before a lab
+    action. The probes run at the same time, and list at most one object.
+    A success is remembered for PREFLIGHT_TTL seconds per cluster ID, so
+    the next lab commands skip the probes.
+    item["oc_client"], item["host"], and item["port"] are required.
+    """
+    item["failed"] = False
+    c = item["oc_client"]
+    if item["host"] is None or item["port"] is None:
+        item["failed"] = True
+        item["msgs"] = [{"text": "OCP_HOST and OCP_PORT are not defined"}]
+        return item["failed"]
+    try:
+        marker = os.path.join(CACHE_DIR, "preflight-%s" % cluster_id(c))
+        if os.path.exists(marker):
+            if os.path.getmtime(marker) > time.time() - PREFLIGHT_TTL:
+                return item["failed"]
+    except Exception:
+        marker = None
+    probes = [
+        (_ping, item["host"]),
+        (_check_api, item["host"], item["port"]),
+        (_check_list, c, "project.openshift.io/v1", "Project"),
+        (_check_list, c, "v1", "Node"),
+        (_check_list, c, "v1", "Namespace"),
+        (_check_cluster_id, c),
+    ]
+    with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+        futures = [executor.submit(*p) for p in probes]
+    msgs = []
+    for f in futures:
+        try:
+            f.result()
+        except Exception as e:
+            msgs.append({"text": str(e)})
+    if msgs:
+        item["failed"] = True
+        item["msgs"] = msgs
+    elif marker is not None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(marker, "w"):
+            pass
+    return item["failed"]
+
+
+def _terminating(obj):
+    """
+    Describe what keeps an object that is being deleted: its finalizers and
+    the conditions that report remaining content.
+    """
+    reasons = []
+    finalizers = (obj["metadata"].get("finalizers") or []) + (
+        (obj.get("spec") or {}).get("finalizers") or []
+    )
+    if finalizers:
+        reasons.append("finalizers %s" % ", ".join(finalizers))
+    for cond in (obj.get("status") or {}).get("conditions") or []:
+        if cond["status"] == "True" and cond.get("message"):
+            reasons.append(cond["message"])
+    return "; ".join(reasons) or "no reason reported"
+
+
+def _wait_deleted(r, name, namespace, deadline):
+    """
+    Follow a watch on an object until it is deleted.
+    Returns None once the object is gone, or the object if it is still
+    there at the deadline.
+    """
+    while True:
+        try:
+            obj = r.get(name=name, namespace=namespace).to_dict()
+        except NotFoundError:
+            return None
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return obj
+        try:
+            for e in r.watch(
+                namespace=namespace,
+                field_selector="metadata.name=%s" % name,
+                resource_version=obj["metadata"]["resourceVersion"],
+                timeout=max(int(remaining), 1),
+            ):
+                if e["type"] == "DELETED":
+                    return None
+        except (InternalServerError, ApiException):
+            time.sleep(max(min(POLL_INTERVAL, deadline - time.time()), 0))
+
+
+def delete_namespace(c, name, timeout=600):
+    """
+    Delete a namespace and return as soon as it is gone, following a watch
+    on it. Returns False if the namespace did not exist. Raises TimeoutError
+    with what keeps the namespace when it is still there after timeout.
+    """
+    r = c.resources.get(api_version="v1", kind="Namespace")
+    try:
+        r.delete(name=name)
+    except NotFoundError:
+        return False
+    ns = _wait_deleted(r, name, None, time.time() + timeout)
+    if ns is not None:
+        raise TimeoutError(
+            "Namespace %s is still terminating: %s" % (name, _terminating(ns))
+        )
+    return True
+
+
+def _delete(c, obj, deadline):
+    api_version, kind, name, namespace = obj
+    try:
+        r = c.resources.get(api_version=api_version, kind=kind)
+        r.delete(name=name, namespace=namespace or None)
+    except (NotFoundError, ResourceNotFoundError):
+        return False
+    started = time.time()
+    left = _wait_deleted(r, name, namespace or None, deadline)
+    if left is not None:
+        raise TimeoutError("%s %s: %s" % (kind, name, _terminating(left)))
+    logging.debug("%s %s deleted in %ds", kind, name, time.time() - started)
+    return True
+
+
+def delete_all(c, objects, timeout=600):
+    """
+    Delete independent objects at the same time and wait until all of them
+    are gone, so the deletion takes as long as the slowest one.
+    'objects' is a list of (api_version, kind, name, namespace) tuples, with
+    an empty namespace for cluster objects. Objects that do not exist are
+    skipped. Raises an exception listing the objects that could not be
+    deleted, with the finalizers that keep them.
+    """
+    if not objects:
+        return
+    deadline = time.time() + timeout
+    with ThreadPoolExecutor(max_workers=len(objects)) as executor:
+        futures = [executor.submit(_delete, c, o, deadline) for o in objects]
+    errors = [str(f.exception()) for f in futures if f.exception() is not None]
+    if errors:
+        raise Exception("; ".join(errors))
 
 
 def _patch_hco(c):
@@ -142,21 +470,93 @@ def _install(c, b):
             s += s * 1.2 + 1
 
 
+def _catalog_index(c, refresh=False):
+    """
+    Return the channels of every package of the do316-catalog-cs catalog,
+    as {package: {channel: currentCSV}}. The package manifests are listed
+    in one request, and the index is kept in a file per cluster ID for
+    CATALOG_TTL seconds.
+    """
+    path = os.path.join(CACHE_DIR, "catalog-%s.json" % cluster_id(c))
+    if not refresh and os.path.exists(path):
+        if os.path.getmtime(path) > time.time() - CATALOG_TTL:
+            with open(path) as f:
+                return json.load(f)
+    a, k = "packages.operators.coreos.com/v1", "PackageManifest"
+    r = c.resources.get(api_version=a, kind=k)
+    packages = r.get(
+        namespace="openshift-marketplace", label_selector="catalog=do316-catalog-cs"
+    ).items
+    index = {
+        p.metadata.name: {ch.name: ch.currentCSV for ch in p.status.channels}
+        for p in packages
+    }
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(index, f)
+    return index
+
+
 def _current_csv(c, operator):
+    try:
+        index = _catalog_index(c)
+        if operator not in index:
+            index = _catalog_index(c, refresh=True)
+        # Channels keep the order of the package manifest
+        return next(iter(index[operator].values()))
+    except Exception as e:
+        logging.debug("Cannot use the catalog index: %s" % e)
     a, k = "packages.operators.coreos.com/v1", "PackageManifest"
     n = "openshift-marketplace"
     r = c.resources.get(api_version=a, kind=k)
     return r.get(name=operator, namespace=n).status.channels[0].currentCSV
 
 
-def openshift_virt(item):
-    item["failed"] = False
-    try:
-        oc_client = item["oc_client"]
-    except Exception as e:
-        item["failed"] = True
-        item["msgs"] = [{"text": "Must define oc_client within item: %s" % e}]
+def _virt_health(c):
+    """
+    Return whether the OpenShift Virtualization CSV succeeded, and the
+    HyperConverged object as a dict, or None when it does not exist.
+    Both are read at the same time, with one request each.
+    """
+
+    def csv_succeeded():
+        r = c.resources.get(
+            api_version="operators.coreos.com/v1alpha1", kind="ClusterServiceVersion"
+        )
+        csvs = r.get(
+            namespace="openshift-cnv",
+            label_selector="operators.coreos.com/kubevirt-hyperconverged.openshift-cnv",
+        ).items
+        return any(csv.status and csv.status.phase == "Succeeded" for csv in csvs)
+
+    def hyperconverged():
+        a, k = "hco.kubevirt.io/v1beta1", "HyperConverged"
+        r = c.resources.get(api_version=a, kind=k)
+        try:
+            return r.get(
+                name="kubevirt-hyperconverged", namespace="openshift-cnv"
+            ).to_dict()
+        except NotFoundError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        csv = executor.submit(csv_succeeded)
+        hco = executor.submit(hyperconverged)
     try:
+        return csv.result(), hco.result()
+    except (ResourceNotFoundError, ApiException):
+        # The CRDs are not there before the first install
+        return False, None
+
+
+def _create_virt(c):
+    """
+    Create what OpenShift Virtualization is missing.
+    Returns True when it was already healthy.
+    """
+    # Only run the steps that a healthy installation does not need
+    csv_succeeded, hco = _virt_health(c)
+    if not csv_succeeded:
         components = [
             {
                 "apiVersion": "project.openshift.io/v1",
@@ -183,140 +583,832 @@ def openshift_virt(item):
                     "source": "do316-catalog-cs",
                     "sourceNamespace": "openshift-marketplace",
                     "name": "kubevirt-hyperconverged",
-                    "startingCSV": _current_csv(oc_client, "kubevirt-hyperconverged"),
+                    "startingCSV": _current_csv(c, "kubevirt-hyperconverged"),
                     "channel": "stable",
                 },
             },
-            {
-                "apiVersion": "hco.kubevirt.io/v1beta1",
-                "kind": "HyperConverged",
-                "metadata": {
-                    "name": "kubevirt-hyperconverged",
-                    "namespace": "openshift-cnv",
-                },
-            },
         ]
         for i in components:
-            _install(oc_client, i)
+            _install(c, i)
+    gates = ((hco or {}).get("spec") or {}).get("featureGates") or {}
+    return (
+        hco is not None
+        and _available(hco)
+        and gates.get("enableCommonBootImageImport") is False
+    )
 
-        _wait_hyperconverged_ready(oc_client)
-        _patch_hco(oc_client)
 
-    except Exception as e:
-        item["failed"] = True
-        item["msgs"] = [{"text": "Failed installing OpenShift Virtualization: %s" % e}]
-    return item["failed"]
+def _ready_virt(c):
+    _install(
+        c,
+        {
+            "apiVersion": "hco.kubevirt.io/v1beta1",
+            "kind": "HyperConverged",
+            "metadata": {
+                "name": "kubevirt-hyperconverged",
+                "namespace": "openshift-cnv",
+            },
+        },
+    )
+    _wait_hyperconverged_ready(c)
+    _patch_hco(c)
 
 
-def node_maintenance(item):
+def _create_node_maintenance(c):
+    components = [
+        {
+            "apiVersion": "project.openshift.io/v1",
+            "kind": "Project",
+            "metadata": {
+                "name": "openshift-workload-availability",
+                "namespace": None,
+            },
+        },
+        {
+            "apiVersion": "operators.coreos.com/v1",
+            "kind": "OperatorGroup",
+            "metadata": {
+                "name": "openshift-workload-availability",
+                "namespace": "openshift-workload-availability",
+            },
+        },
+        {
+            "apiVersion": "operators.coreos.com/v1alpha1",
+            "kind": "Subscription",
+            "metadata": {
+                "name": "node-maintenance-operator",
+                "namespace": "openshift-workload-availability",
+            },
+            "spec": {
+                "source": "do316-catalog-cs",
+                "sourceNamespace": "openshift-marketplace",
+                "name": "node-maintenance-operator",
+                "startingCSV": _current_csv(c, "node-maintenance-operator"),
+                "channel": "stable",
+            },
+        },
+    ]
+    for i in components:
+        _install(c, i)
+    return False
+
+
+def _create_nmstate(c):
+    components = [
+        {
+            "apiVersion": "project.openshift.io/v1",
+            "kind": "Project",
+            "metadata": {
+                "name": "openshift-nmstate",
+                "namespace": None,
+            },
+        },
+        {
+            "apiVersion": "operators.coreos.com/v1",
+            "kind": "OperatorGroup",
+            "metadata": {
+                "name": "openshift-nmstate",
+                "namespace": "openshift-nmstate",
+            },
+            "spec": {"targetNamespaces": ["openshift-nmstate"]},
+        },
+        {
+            "apiVersion": "operators.coreos.com/v1alpha1",
+            "kind": "Subscription",
+            "metadata": {
+                "name": "kubernetes-nmstate-operator",
+                "namespace": "openshift-nmstate",
+            },
+            "spec": {
+                "source": "do316-catalog-cs",
+                "sourceNamespace": "openshift-marketplace",
+                "name": "kubernetes-nmstate-operator",
+                "startingCSV": _current_csv(c, "kubernetes-nmstate-operator"),
+                "channel": "stable",
+            },
+        },
+    ]
+    for i in components:
+        _install(c, i)
+    return False
+
+
+def _ready_nmstate(c):
+    # The NMState CRD only exists once the operator is installed
+    _install(
+        c,
+        {
+            "apiVersion": "nmstate.io/v1",
+            "kind": "NMState",
+            "metadata": {"name": "nmstate", "namespace": None},
+        },
+    )
+    _wait_nmstate_ready(c)
+
+
+# Operators that the labs install: (name, create, ready).
+# 'create' creates the Project, OperatorGroup, and Subscription, and returns
+# True when the operator is already healthy; 'ready' waits for the operator
+# and creates its operand.
+OPERATORS = {
+    "openshift-virtualization": (
+        "OpenShift Virtualization",
+        _create_virt,
+        _ready_virt,
+    ),
+    "node-maintenance": (
+        "Node Maintenance Operator",
+        _create_node_maintenance,
+        _wait_node_maintenance_ready,
+    ),
+    "nmstate": (
+        "Kubernetes NMState Operator",
+        _create_nmstate,
+        _ready_nmstate,
+    ),
+}
+
+
+def _install_operators(item, operators):
     item["failed"] = False
     try:
         oc_client = item["oc_client"]
     except Exception as e:
         item["failed"] = True
         item["msgs"] = [{"text": "Must define oc_client within item: %s" % e}]
+        return item["failed"]
+    msgs = []
+    pending = []
+    for key in operators:
+        name, create, ready = OPERATORS[key]
+        try:
+            if not create(oc_client):
+                pending.append((name, ready))
+        except Exception as e:
+            msgs.append({"text": "Failed installing %s: %s" % (name, e)})
+    if pending:
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            futures = [
+                (name, executor.submit(ready, oc_client)) for name, ready in pending
+            ]
+        for name, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                msgs.append({"text": "Failed installing %s: %s" % (name, e)})
+    if msgs:
+        item["failed"] = True
+        item["msgs"] = msgs
+    return item["failed"]
+
+
+def install_operators(item):
+    """
+    Task that installs several operators together: the subscriptions of
+    all of them are created first, and then they are waited for at the same
+    time. item["operators"] is a list of OPERATORS keys.
+    """
+    return _install_operators(item, item["operators"])
+
+
+def openshift_virt(item):
+    return _install_operators(item, ["openshift-virtualization"])
+
+
+def node_maintenance(item):
+    return _install_operators(item, ["node-maintenance"])
+
+
+def nmstate_operator(item):
+    return _install_operators(item, ["nmstate"])
+
+
+class GradingSnapshot:
+    """
+    Objects read by the grading steps of a lab.
+
+    Each kind is listed once per namespace and indexed by name, so the
+    graders that look at the same objects do not query the cluster again.
+    The kinds given to the constructor, as (api_version, kind, namespace)
+    tuples, are listed together on the first lookup; other kinds are
+    listed when they are first used.
+    """
+
+    def __init__(self, c, kinds=()):
+        self.c = c
+        self.kinds = list(kinds)
+        self._index = {}
+
+    def _list(self, key):
+        api_version, kind, namespace = key
+        try:
+            r = self.c.resources.get(api_version=api_version, kind=kind)
+            items = r.get(namespace=namespace or None).items
+        except (NotFoundError, ResourceNotFoundError, ForbiddenError, ApiException):
+            items = []
+        return key, {i.metadata.name: i for i in items}
+
+    def _kind(self, api_version, kind, namespace):
+        if not self._index and self.kinds:
+            with ThreadPoolExecutor(max_workers=len(self.kinds)) as executor:
+                self._index.update(executor.map(self._list, self.kinds))
+        key = (api_version, kind, namespace)
+        if key not in self._index:
+            self._index.update([self._list(key)])
+        return self._index[key]
+
+    def items(self, api_version, kind, namespace):
+        return list(self._kind(api_version, kind, namespace).values())
+
+    def get(self, api_version, kind, name, namespace):
+        return self._kind(api_version, kind, namespace).get(name)
+
+    def exists(self, api_version, kind, name, namespace):
+        return self.get(api_version, kind, name, namespace) is not None
+
+
+class GradingLab:
+    """
+    Mixin for the review labs, before OpenShift in the bases of the lab
+    class. While grade_items runs the grading steps, resource_get and
+    resource_exists read the objects from self.snapshot.
+    """
+
+    # Objects read by the grading steps, set during grade_items()
+    snapshot = None
+
+    def grade_items(self, items, kinds):
+        """
+        Run and report the grading items with a GradingSnapshot of 'kinds'.
+        """
+        self.snapshot = GradingSnapshot(self.oc_client, kinds)
+        try:
+            ui = userinterface.Console(items)
+            ui.run_items(action="Grading")
+            ui.report_grade()
+        finally:
+            self.snapshot = None
+
+    def resource_get(self, api_version, kind, name, namespace):
+        if self.snapshot is not None:
+            return self.snapshot.get(api_version, kind, name, namespace)
+        return super().resource_get(api_version, kind, name, namespace)
+
+    def resource_exists(self, api_version, kind, name, namespace):
+        if self.snapshot is not None:
+            return self.snapshot.exists(api_version, kind, name, namespace)
+        return super().resource_exists(api_version, kind, name, namespace)
+
+
+def _condition_met(obj, condition):
+    for cond in (obj.get("status") or {}).get("conditions") or []:
+        if cond["type"] == condition["type"]:
+            return cond["status"] == condition.get("status", "True") and (
+                "reason" not in condition or cond.get("reason") == condition["reason"]
+            )
+    return False
+
+
+def wait_condition(c, api_version, kind, name, namespace, condition, timeout=600):
+    """
+    Wait until an object reports a condition, following a watch on it.
+    'condition' is a dict with the "type" of the condition, and optionally
+    its "status" (default "True") and "reason".
+    """
+    deadline = time.time() + timeout
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise TimeoutError(
+                "%s %s does not report %s" % (kind, name, condition["type"])
+            )
+        try:
+            r = c.resources.get(api_version=api_version, kind=kind)
+            obj = r.get(name=name, namespace=namespace or None).to_dict()
+            if _condition_met(obj, condition):
+                return
+            for e in r.watch(
+                namespace=namespace or None,
+                field_selector="metadata.name=%s" % name,
+                resource_version=obj["metadata"]["resourceVersion"],
+                timeout=max(int(remaining), 1),
+            ):
+                if _condition_met(e["raw_object"], condition):
+                    return
+        except (
+            NotFoundError,
+            ResourceNotFoundError,
+            InternalServerError,
+            ApiException,
+        ):
+            time.sleep(max(min(POLL_INTERVAL, deadline - time.time()), 0))
+
+
+_READY = {"type": "Ready", "status": "True"}
+
+
+def _wait_datavolume(c, name, namespace, deadline):
     try:
-        components = [
-            {
-                "apiVersion": "project.openshift.io/v1",
-                "kind": "Project",
-                "metadata": {
-                    "name": "openshift-workload-availability",
-                    "namespace": None,
-                },
-            },
-            {
-                "apiVersion": "operators.coreos.com/v1",
-                "kind": "OperatorGroup",
-                "metadata": {
-                    "name": "openshift-workload-availability",
-                    "namespace": "openshift-workload-availability",
-                },
-            },
-            {
-                "apiVersion": "operators.coreos.com/v1alpha1",
-                "kind": "Subscription",
-                "metadata": {
-                    "name": "node-maintenance-operator",
-                    "namespace": "openshift-workload-availability",
-                },
-                "spec": {
-                    "source": "do316-catalog-cs",
-                    "sourceNamespace": "openshift-marketplace",
-                    "name": "node-maintenance-operator",
-                    "startingCSV": _current_csv(oc_client, "node-maintenance-operator"),
-                    "channel": "stable",
+        c.resources.get(api_version="cdi.kubevirt.io/v1beta1", kind="DataVolume").get(
+            name=name, namespace=namespace
+        )
+    except NotFoundError:
+        # CDI can garbage-collect a DataVolume once its PVC is populated
+        try:
+            c.resources.get(api_version="v1", kind="PersistentVolumeClaim").get(
+                name=name, namespace=namespace
+            )
+            return
+        except NotFoundError:
+            pass
+    wait_condition(
+        c,
+        "cdi.kubevirt.io/v1beta1",
+        "DataVolume",
+        name,
+        namespace,
+        _READY,
+        deadline - time.time(),
+    )
+
+
+def wait_vm_ready(c, name, namespace, timeout=1800):
+    """
+    Wait until a virtual machine is ready: its DataVolumes are populated,
+    and its VirtualMachineInstance and the VirtualMachine report Ready.
+    Stopped virtual machines only wait for their DataVolumes.
+    """
+    deadline = time.time() + timeout
+    vm = c.resources.get(api_version="kubevirt.io/v1", kind="VirtualMachine").get(
+        name=name, namespace=namespace
+    )
+    for dv in vm.spec.dataVolumeTemplates or []:
+        _wait_datavolume(c, dv.metadata.name, namespace, deadline)
+    if vm.spec.running is False or vm.spec.runStrategy in ("Halted", "Manual"):
+        return
+    for kind in ("VirtualMachineInstance", "VirtualMachine"):
+        wait_condition(
+            c, "kubevirt.io/v1", kind, name, namespace, _READY, deadline - time.time()
+        )
+
+
+def wait_vms_ready(c, vms, timeout=1800):
+    """
+    Wait for several virtual machines at the same time.
+    'vms' is a list of (name, namespace) tuples.
+    """
+    if not vms:
+        return
+    with ThreadPoolExecutor(max_workers=len(vms)) as executor:
+        futures = [
+            executor.submit(wait_vm_ready, c, name, namespace, timeout)
+            for name, namespace in vms
+        ]
+    errors = []
+    for f in futures:
+        try:
+            f.result()
+        except Exception as e:
+            errors.append(str(e))
+    if errors:
+        raise Exception("; ".join(errors))
+
+
+class UnsupportedPlaybook(Exception):
+    """
+    The playbook does more than applying Kubernetes manifests.
+    """
+
+
+# Play keywords that the native apply understands
+_PLAY_KEYS = {
+    "name",
+    "hosts",
+    "remote_user",
+    "gather_facts",
+    "module_defaults",
+    "vars",
+    "tasks",
+}
+# Arguments of the k8s module that the native apply understands
+_K8S_ARGS = {
+    "state",
+    "inline",
+    "definition",
+    "namespace",
+    "wait",
+    "wait_condition",
+    "wait_sleep",
+    "wait_timeout",
+}
+
+
+def _template(basedir):
+    try:
+        import jinja2
+    except ImportError:
+        raise UnsupportedPlaybook("jinja2 is not available")
+
+    def lookup(plugin, path):
+        if plugin not in ("file", "ansible.builtin.file"):
+            raise UnsupportedPlaybook("lookup plugin %s" % plugin)
+        for d in (basedir, os.path.join(basedir, "files")):
+            if os.path.exists(os.path.join(d, path)):
+                with open(os.path.join(d, path)) as f:
+                    return f.read().rstrip()
+        raise UnsupportedPlaybook("file %s not found" % path)
+
+    env = jinja2.Environment(undefined=jinja2.StrictUndefined)
+    env.globals["lookup"] = lookup
+    env.filters["b64encode"] = lambda v: base64.b64encode(v.encode()).decode()
+    env.filters["quote"] = lambda v: shlex.quote(str(v))
+
+    def render(value, variables):
+        if isinstance(value, dict):
+            return {k: render(v, variables) for k, v in value.items()}
+        if isinstance(value, list):
+            return [render(v, variables) for v in value]
+        if not isinstance(value, str) or "{{" not in value:
+            return value
+        try:
+            expr = value.strip()
+            if (
+                expr.startswith("{{")
+                and expr.endswith("}}")
+                and expr.count("{{") == 1
+                and "{{" not in expr[2:-2]
+            ):
+                # A single expression keeps the type of its result
+                result = env.compile_expression(expr[2:-2])(**variables)
+                return render(result, variables)
+            return env.from_string(value).render(**variables)
+        except jinja2.TemplateError as e:
+            raise UnsupportedPlaybook(str(e))
+
+    return render
+
+
+def load_manifests(playbook):
+    """
+    Read a playbook that only applies Kubernetes manifests with the k8s
+    module, and return the list of (manifest, wait) pairs, rendering the
+    variables of the plays. 'wait' is the dict of wait arguments of the
+    task. Raises UnsupportedPlaybook for any other playbook.
+    """
+    with open(playbook) as f:
+        plays = yaml.safe_load(f)
+    render = _template(os.path.dirname(playbook))
+    manifests = []
+    for play in plays:
+        if play.get("import_playbook", "").endswith("/deploy-virtctl.yml"):
+            # The labs install virtctl with ensure_virtctl
+            continue
+        if set(play) - _PLAY_KEYS:
+            raise UnsupportedPlaybook("play keywords %s" % ", ".join(play))
+        variables = dict(play.get("vars") or {})
+        # Variables may refer to each other
+        for _ in range(5):
+            variables = {k: render(v, variables) for k, v in variables.items()}
+        for task in play.get("tasks") or []:
+            module = set(task) - {"name"}
+            if module not in ({"k8s"}, {"kubernetes.core.k8s"}):
+                raise UnsupportedPlaybook("task %s" % task.get("name"))
+            args = task[module.pop()]
+            if set(args) - _K8S_ARGS or args.get("state", "present") != "present":
+                raise UnsupportedPlaybook("task %s" % task.get("name"))
+            if args.get("wait") and not args.get("wait_condition"):
+                raise UnsupportedPlaybook("task %s" % task.get("name"))
+            args = render(args, variables)
+            definition = args.get("inline") or args.get("definition")
+            if isinstance(definition, str):
+                definition = yaml.safe_load(definition)
+            if not isinstance(definition, dict):
+                raise UnsupportedPlaybook("task %s" % task.get("name"))
+            if args.get("namespace") and definition["kind"] != "Project":
+                definition["metadata"].setdefault("namespace", args["namespace"])
+            wait = None
+            if args.get("wait"):
+                wait = {
+                    "condition": args["wait_condition"],
+                    "timeout": int(args.get("wait_timeout", 120)),
+                }
+            manifests.append((definition, wait))
+    return manifests
+
+
+@functools.lru_cache(maxsize=None)
+def _image_version(url):
+    """
+    Return what the HTTP server reports about an image without downloading
+    it, so a changed image gets a new golden copy.
+    """
+    h = requests.head(url, verify=False, timeout=10)
+    h.raise_for_status()
+    return [h.headers.get(k, "") for k in ("ETag", "Last-Modified", "Content-Length")]
+
+
+def _golden_name(url, pvc):
+    """
+    Return the base name of the golden copies of the image at 'url', the
+    key of its copies for volumes with the 'pvc' spec, and the checksum of
+    the copy for the current version of the image.
+    """
+    base = os.path.basename(url).split(".")[0].lower()
+    base = re.sub("[^a-z0-9-]+", "-", base).strip("-")[:40] or "image"
+    source = hashlib.sha256(json.dumps([url, pvc], sort_keys=True).encode()).hexdigest()
+    checksum = hashlib.sha256(
+        json.dumps([url, _image_version(url), pvc], sort_keys=True).encode()
+    ).hexdigest()
+    return base, source[:20], checksum
+
+
+def golden_image(c, url, pvc):
+    """
+    Return the DataVolume source that clones the golden copy of the image
+    at 'url' for a volume with the 'pvc' spec, or None when that copy is
+    not ready yet. On a miss, the golden copy is imported in the background
+    into IMAGES_NAMESPACE, and the copies of older versions of the image
+    for the same 'pvc' spec are removed. The copies for other specs stay.
+    """
+    base, source, checksum = _golden_name(url, pvc)
+    name = "%s-%s" % (base, checksum[:10])
+    r = c.resources.get(api_version="cdi.kubevirt.io/v1beta1", kind="DataVolume")
+    try:
+        dv = r.get(name=name, namespace=IMAGES_NAMESPACE)
+        if dv.status and dv.status.phase == "Succeeded":
+            return {"pvc": {"namespace": IMAGES_NAMESPACE, "name": name}}
+        return None
+    except NotFoundError:
+        pass
+    projects = c.resources.get(api_version="project.openshift.io/v1", kind="Project")
+    try:
+        projects.get(name=IMAGES_NAMESPACE)
+    except NotFoundError:
+        projects.create(body={"metadata": {"name": IMAGES_NAMESPACE}})
+    label = "do316.example.com/source"
+    selector = "%s=%s" % (label, source)
+    for old in r.get(namespace=IMAGES_NAMESPACE, label_selector=selector).items:
+        r.delete(name=old.metadata.name, namespace=IMAGES_NAMESPACE)
+    r.create(
+        body={
+            "apiVersion": "cdi.kubevirt.io/v1beta1",
+            "kind": "DataVolume",
+            "metadata": {
+                "name": name,
+                "namespace": IMAGES_NAMESPACE,
+                "labels": {"do316.example.com/image": base, label: source},
+                "annotations": {
+                    "do316.example.com/url": url,
+                    "do316.example.com/checksum": checksum,
+                    # Keep the DataVolume to know that the import succeeded
+                    "cdi.kubevirt.io/storage.deleteAfterCompletion": "false",
                 },
             },
-        ]
-        for i in components:
-            _install(oc_client, i)
+            "spec": {"source": {"http": {"url": url}}, "pvc": pvc},
+        }
+    )
+    return None
+
+
+def _use_golden_images(c, definition):
+    """
+    Make the DataVolumes of a manifest that import an image over HTTP clone
+    its golden copy instead, when it is ready.
+    """
+    if definition["kind"] == "DataVolume":
+        specs = [definition.get("spec") or {}]
+    elif definition["kind"] == "VirtualMachine":
+        templates = (definition.get("spec") or {}).get("dataVolumeTemplates") or []
+        specs = [t.get("spec") or {} for t in templates]
+    else:
+        return
+    for spec in specs:
+        http = (spec.get("source") or {}).get("http") or {}
+        if set(http) != {"url"} or "pvc" not in spec:
+            continue
+        try:
+            source = golden_image(c, http["url"], copy.deepcopy(spec["pvc"]))
+        except Exception as e:
+            logging.debug("Not using a golden image for %s: %s" % (http["url"], e))
+            continue
+        if source is not None:
+            spec["source"] = source
+
 
-        _wait_node_maintenance_ready(oc_client)
+def apply_manifests(c, manifests):
+    """
+    Server-side apply the manifests returned by load_manifests, in order.
+    DataVolumes clone the golden copy of their image when there is one.
+    """
+    for definition, wait in manifests:
+        _use_golden_images(c, definition)
+        a, k = definition["apiVersion"], definition["kind"]
+        name = definition["metadata"]["name"]
+        r = c.resources.get(api_version=a, kind=k)
+        if k == "Project":
+            # Projects cannot be patched, only requested
+            try:
+                r.get(name=name)
+            except NotFoundError:
+                r.create(body=definition)
+            continue
+        r.server_side_apply(
+            body=definition,
+            name=name,
+            namespace=definition["metadata"].get("namespace"),
+            field_manager="do316-lab",
+            force_conflicts=True,
+        )
 
+
+def _wait_manifest(c, definition, wait):
+    name = definition["metadata"]["name"]
+    namespace = definition["metadata"].get("namespace")
+    if definition["kind"] == "VirtualMachine" and wait["condition"]["type"] == "Ready":
+        wait_vm_ready(c, name, namespace, wait["timeout"])
+    else:
+        wait_condition(
+            c,
+            definition["apiVersion"],
+            definition["kind"],
+            name,
+            namespace,
+            wait["condition"],
+            wait["timeout"],
+        )
+
+
+def wait_manifests(c, manifests):
+    """
+    Wait for the conditions of all the manifests at the same time.
+    """
+    waits = [(d, w) for d, w in manifests if w is not None]
+    if not waits:
+        return
+    with ThreadPoolExecutor(max_workers=len(waits)) as executor:
+        futures = [executor.submit(_wait_manifest, c, d, w) for d, w in waits]
+    for f in futures:
+        f.result()
+
+
+def apply_playbook(item):
+    """
+    Task that applies the manifests of item["playbook"] directly through
+    item["oc_client"], without starting Ansible. Playbooks that do more than
+    that, or that cannot be applied, run with item["fallback"], the
+    run_playbook method of the lab.
+    """
+    item["failed"] = False
+    base = os.path.dirname(os.path.abspath(__file__))
+    try:
+        manifests = load_manifests(os.path.join(base, item["playbook"]))
+        apply_manifests(item["oc_client"], manifests)
+    except Exception as e:
+        logging.debug("Running %s with Ansible: %s" % (item["playbook"], e))
+        return item["fallback"](item)
+    try:
+        wait_manifests(item["oc_client"], manifests)
     except Exception as e:
         item["failed"] = True
-        item["msgs"] = [{"text": "Failed installing Node Maintenance Operator: %s" % e}]
+        item["msgs"] = [{"text": "Failed applying %s: %s" % (item["playbook"], e)}]
     return item["failed"]
 
 
-def nmstate_operator(item):
+def apply_playbooks(item):
+    """
+    Task that creates a group of independent resources, such as the virtual
+    machines of a lab, together: the playbooks of item["playbooks"] are
+    applied like in apply_playbook, and then all of them are waited for at
+    the same time, while the ones that need Ansible run concurrently.
+    """
     item["failed"] = False
+    base = os.path.dirname(os.path.abspath(__file__))
+    applied, fallbacks = [], []
+    for playbook in item["playbooks"]:
+        try:
+            manifests = load_manifests(os.path.join(base, playbook))
+            apply_manifests(item["oc_client"], manifests)
+            applied.extend(manifests)
+        except Exception as e:
+            logging.debug("Running %s with Ansible: %s" % (playbook, e))
+            fallbacks.append(dict(item, playbook=playbook))
+    with ThreadPoolExecutor(max_workers=len(fallbacks) + 1) as executor:
+        waiting = executor.submit(wait_manifests, item["oc_client"], applied)
+        running = [executor.submit(item["fallback"], f) for f in fallbacks]
+    msgs = []
     try:
-        oc_client = item["oc_client"]
+        waiting.result()
     except Exception as e:
+        msgs.append({"text": "Failed creating the resources: %s" % e})
+    for f, future in zip(fallbacks, running):
+        try:
+            if future.result():
+                msgs.extend(f.get("msgs") or [])
+        except Exception as e:
+            msgs.append({"text": "Failed running %s: %s" % (f["playbook"], e)})
+    if msgs:
         item["failed"] = True
-        item["msgs"] = [{"text": "Must define oc_client within item: %s" % e}]
+        item["msgs"] = msgs
+    return item["failed"]
+
+
+def _virtctl_version():
+    """
+    Return the client version that VIRTCTL reports, or None when it cannot
+    run.
+    """
     try:
-        components = [
-            {
-                "apiVersion": "project.openshift.io/v1",
-                "kind": "Project",
-                "metadata": {
-                    "name": "openshift-nmstate",
-                    "namespace": None,
-                },
-            },
-            {
-                "apiVersion": "operators.coreos.com/v1",
-                "kind": "OperatorGroup",
-                "metadata": {
-                    "name": "openshift-nmstate",
-                    "namespace": "openshift-nmstate",
-                },
-                "spec": {"targetNamespaces": ["openshift-nmstate"]},
-            },
-            {
-                "apiVersion": "operators.coreos.com/v1alpha1",
-                "kind": "Subscription",
-                "metadata": {
-                    "name": "kubernetes-nmstate-operator",
-                    "namespace": "openshift-nmstate",
-                },
-                "spec": {
-                    "source": "do316-catalog-cs",
-                    "sourceNamespace": "openshift-marketplace",
-                    "name": "kubernetes-nmstate-operator",
-                    "startingCSV": _current_csv(
-                        oc_client, "kubernetes-nmstate-operator"
-                    ),
-                    "channel": "stable",
-                },
-            },
-            {
-                "apiVersion": "nmstate.io/v1",
-                "kind": "NMState",
-                "metadata": {"name": "nmstate", "namespace": None},
-            },
-        ]
-        for i in components:
-            _install(oc_client, i)
+        return subprocess.run(
+            [VIRTCTL, "version", "--client"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+            timeout=30,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _virtctl_installed():
+    """
+    Return True if VIRTCTL reports the client version that ensure_virtctl
+    installed for CNV_VERSION.
+    """
+    version = _virtctl_version()
+    if version is None:
+        return False
+    try:
+        with open(os.path.join(CACHE_DIR, "virtctl.installed")) as f:
+            return f.read() == "%s\n%s" % (CNV_VERSION, version)
+    except OSError:
+        return False
+
 
-        _wait_nmstate_ready(oc_client)
+def _download_virtctl():
+    """
+    Return the path of the virtctl tarball of CNV_VERSION, downloading it
+    only when it is not in CACHE_DIR yet.
+    """
+    path = os.path.join(CACHE_DIR, "virtctl-%s.tar.gz" % CNV_VERSION)
+    if os.path.exists(path):
+        return path
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    response = requests.get(VIRTCTL_URL, stream=True, verify=False, timeout=60)
+    response.raise_for_status()
+    with open(path + ".part", "wb") as f:
+        shutil.copyfileobj(response.raw, f)
+    os.rename(path + ".part", path)
+    return path
 
+
+def _install_virtctl(tarball):
+    with tempfile.TemporaryDirectory() as tmp:
+        with tarfile.open(tarball) as tar:
+            tar.extract(tar.getmember("virtctl"), tmp)
+        binary = os.path.join(tmp, "virtctl")
+        if os.access(os.path.dirname(VIRTCTL), os.W_OK):
+            shutil.copy(binary, VIRTCTL)
+            os.chmod(VIRTCTL, 0o755)
+        else:
+            # Fail instead of waiting for a password in the middle of a lab
+            sudo = subprocess.run(
+                ["sudo", "-n", "install", "-m", "0755", binary, VIRTCTL],
+                stderr=subprocess.PIPE,
+                universal_newlines=True,
+            )
+            if sudo.returncode != 0:
+                raise Exception(
+                    "Cannot install %s with sudo: %s" % (VIRTCTL, sudo.stderr.strip())
+                )
+    version = _virtctl_version()
+    if version is None:
+        raise Exception("%s does not run" % VIRTCTL)
+    with open(os.path.join(CACHE_DIR, "virtctl.installed"), "w") as f:
+        f.write("%s\n%s" % (CNV_VERSION, version))
+
+
+def ensure_virtctl(item):
+    """
+    Task that makes sure VIRTCTL is the client of CNV_VERSION. The tarball
+    is only downloaded when the binary is missing, does not run, or reports
+    another version than the one installed for CNV_VERSION, and it is kept
+    in CACHE_DIR for the next installs.
+    A download error only fails the task when there is no virtctl at all.
+    """
+    item["failed"] = False
+    if _virtctl_installed():
+        return item["failed"]
+    try:
+        try:
+            _install_virtctl(_download_virtctl())
+        except tarfile.TarError:
+            # Remove a damaged tarball so the next run downloads it again
+            os.remove(os.path.join(CACHE_DIR, "virtctl-%s.tar.gz" % CNV_VERSION))
+            raise
     except Exception as e:
-        item["failed"] = True
-        item["msgs"] = [
-            {"text": "Failed installing Kubernetes NMState Operator: %s" % e}
-        ]
+        logging.debug("Cannot install virtctl: %s" % e)
+        if not os.path.exists(VIRTCTL):
+            item["failed"] = True
+            item["msgs"] = [{"text": "Failed installing virtctl: %s" % e}]
     return item["failed"]
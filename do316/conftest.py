@@ -0,0 +1,37 @@
+"""
+The unit tests replace the DynoLabs packages with fakes, so they also run
+where labs and ocp are not installed.
+"""
+
+import sys
+import types
+
+
+def _module(name, **attributes):
+    module = sys.modules.get(name)
+    if module is None:
+        module = sys.modules[name] = types.ModuleType(name)
+        parent, _, child = name.rpartition(".")
+        if parent:
+            setattr(_module(parent), child, module)
+    module.__dict__.update(attributes)
+    return module
+
+
+try:
+    from labs import labconfig  # noqa: F401
+    from labs.common import labtools, userinterface  # noqa: F401
+except ImportError:
+    _module("labs.labconfig")
+    _module("labs.common.labtools", ping=lambda host: {"failed": False})
+    _module("labs.common.userinterface")
+
+try:
+    from ocp import api, utils  # noqa: F401
+except ImportError:
+
+    class OpenShift:
+        pass
+
+    _module("ocp.api", isApiUp=lambda host, port=None: True)
+    _module("ocp.utils", OpenShift=OpenShift)
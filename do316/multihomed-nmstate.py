@@ -19,13 +19,11 @@ import os
 import sys
 import logging
 import requests
-import time
 
 from urllib3 import disable_warnings
 from urllib3.exceptions import InsecureRequestWarning
 from kubernetes.client.exceptions import ApiException
 
-from ocp import api
 from ocp.utils import OpenShift
 from labs import labconfig
 from labs.common import labtools, userinterface
@@ -70,7 +68,7 @@ class MultihomedNmstate(OpenShift):
     def __init__(self):
         logging.debug("{} / {}".format(SKU, sys._getframe().f_code.co_name))
         try:
-            super().__init__()
+            common.login(self)
         except requests.exceptions.ConnectionError:
             print(
                 "The Lab environment is not ready, please wait 10 minutes before trying again."
@@ -99,23 +97,13 @@ class MultihomedNmstate(OpenShift):
                 "fatal": True,
             },
             {
-                "label": "Pinging API",
-                "task": self._start_ping_api,
-                "host": self.OCP_API["host"],
-                "fatal": True,
-            },
-            {
-                "label": "Checking API",
-                "task": self._start_check_api,
+                "label": "Checking the cluster and its API",
+                "task": common.preflight,
+                "oc_client": self.oc_client,
                 "host": self.OCP_API["host"],
                 "port": self.OCP_API["port"],
                 "fatal": True,
             },
-            {
-                "label": "Checking cluster readiness",
-                "task": self._start_check_cluster_ready,
-                "fatal": True,
-            },
             {
                 "label": "Verifying OpenShift Virtualization Operator",
                 "task": common.openshift_virt,
@@ -141,8 +129,10 @@ class MultihomedNmstate(OpenShift):
             },
             {
                 "label": "Creating exercise resources",
-                "task": self.run_playbook,
+                "task": common.apply_playbook,
                 "playbook": f"ansible/{self.__LAB__}/dev-dbaccess-vm.yml",
+                "oc_client": self.oc_client,
+                "fallback": self.run_playbook,
                 "fatal": True,
             },
             {
@@ -153,8 +143,7 @@ class MultihomedNmstate(OpenShift):
             },
             {
                 "label": "Confirming virtctl availability",
-                "task": self.run_playbook,
-                "playbook": "ansible/roles/deploy-virtctl.yml",
+                "task": common.ensure_virtctl,
                 "fatal": True,
             },
         ]
@@ -198,63 +187,6 @@ class MultihomedNmstate(OpenShift):
         userinterface.Console(items).run_items(action="Finishing")
 
     # Start tasks
-    def _start_ping_api(self, item):
-        """
-        Execute a task to prepare the system for the lab
-        """
-        if item["host"] is None:
-            item["failed"] = True
-            item["msgs"] = [{"text": "OCP_HOST is not defined"}]
-        else:
-            check = labtools.ping(item["host"])
-            for key in check:
-                item[key] = check[key]
-
-        # Return status to abort lab execution when failed
-        return item["failed"]
-
-    def _start_check_api(self, item):
-        if item["host"] is None or item["port"] is None:
-            item["failed"] = True
-            item["msgs"] = [{"text": "OCP_HOST and OCP_PORT are not defined"}]
-        else:
-            if api.isApiUp(item["host"], port=item["port"]):
-                item["failed"] = False
-            else:
-                item["failed"] = True
-                item["msgs"] = [
-                    {
-                        "text": "API could not be reached: https://{}:{}/".format(
-                            item["host"], item["port"]
-                        )
-                    }
-                ]
-
-        # Return status to abort lab execution when failed
-        return item["failed"]
-
-    def _start_check_cluster_ready(self, item):
-        item["failed"] = True
-        # Get resources from cluster to check API
-        self.oc_client.resources.get(
-            api_version="project.openshift.io/v1", kind="Project"
-        ).get()
-        self.oc_client.resources.get(api_version="v1", kind="Node").get()
-        self.oc_client.resources.get(api_version="v1", kind="Namespace").get()
-
-        try:
-            v1_config = self.oc_client.resources.get(
-                api_version="config.openshift.io/v1", kind="ClusterVersion"
-            )
-            cluster_version = v1_config.get().items[0]
-            if cluster_version.spec.clusterID is None:
-                item["failed"] = True
-                item["msgs"] = [{"text": "Cluster ID could not be found"}]
-            else:
-                item["failed"] = False
-        except Exception:
-            item["msgs"] = [{"text": "Cluster is not OpenShift"}]
-
     def _check_ge_namespace(self, item):
         """
         Check GE namespace
@@ -276,13 +208,10 @@ class MultihomedNmstate(OpenShift):
         item["failed"] = False
 
         try:
-            self.delete_resource("v1", "Namespace", (NAMESPACE), "")
+            common.delete_namespace(self.oc_client, NAMESPACE)
         except Exception as e:
             item["failed"] = True
             item["msgs"] = [{"text": "Failed removing namespace: %s" % e}]
-        if not item["failed"]:
-            # Give time for the namespace to terminate
-            time.sleep(60)
 
     def _delete_nmstate_operator(self, item):
         item["failed"] = False
@@ -321,21 +250,7 @@ class MultihomedNmstate(OpenShift):
             )
 
         try:
-            ns = self.oc_client.resources.get(
-                api_version="v1",
-                kind="Namespace",
-            )
-            if ns.get(name="openshift-nmstate"):
-                ns.delete(name="openshift-nmstate")
-                for t in range(120):
-                    time.sleep(1)
-                    if ns.get(name="openshift-nmstate"):
-                        continue
-
-            if ns.get(name="openshift-nmstate"):
-                raise Exception(
-                    "openshift-nmstate namespace not deleted after 120 seconds"
-                )
+            common.delete_namespace(self.oc_client, "openshift-nmstate", timeout=120)
 
         except ApiException as e:
             if e.status != 404:
@@ -359,6 +274,7 @@ class MultihomedNmstate(OpenShift):
                     (crd),
                     "",
                 )
+            common.invalidate_discovery(self.oc_client)
         except Exception as e:
             item["failed"] = True
             item["msgs"].append(
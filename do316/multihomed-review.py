@@ -17,13 +17,11 @@ import os
 import sys
 import logging
 import requests
-import time
 
 from urllib3 import disable_warnings
 from urllib3.exceptions import InsecureRequestWarning
 from kubernetes.client.exceptions import ApiException
 
-from ocp import api
 from ocp.utils import OpenShift
 from labs import labconfig
 from labs.common import labtools, userinterface
@@ -44,12 +42,20 @@ _targets = [
 # Default namespace for the resources
 NAMESPACE = "multihomed-review"
 
+# Objects listed once for the grading steps
+GRADED_KINDS = [
+    ("nmstate.io/v1", "NodeNetworkConfigurationPolicy", ""),
+    ("nmstate.io/v1beta1", "NodeNetworkConfigurationEnactment", ""),
+    ("k8s.cni.cncf.io/v1", "NetworkAttachmentDefinition", NAMESPACE),
+    ("kubevirt.io/v1", "VirtualMachineInstance", NAMESPACE),
+]
+
 # Disable certificate validation
 disable_warnings(InsecureRequestWarning)
 
 
 # Change the class name to match your file name with WordCaps
-class MultihomedReview(OpenShift):
+class MultihomedReview(common.GradingLab, OpenShift):
     """
     Multihomed Review lab script for DO316
     """
@@ -68,7 +74,7 @@ class MultihomedReview(OpenShift):
     def __init__(self):
         logging.debug("{} / {}".format(SKU, sys._getframe().f_code.co_name))
         try:
-            super().__init__()
+            common.login(self)
         except requests.exceptions.ConnectionError:
             print(
                 "The Lab environment is not ready, please wait 10 minutes before trying again."
@@ -97,32 +103,17 @@ class MultihomedReview(OpenShift):
                 "fatal": True,
             },
             {
-                "label": "Pinging API",
-                "task": self._start_ping_api,
-                "host": self.OCP_API["host"],
-                "fatal": True,
-            },
-            {
-                "label": "Checking API",
-                "task": self._start_check_api,
+                "label": "Checking the cluster and its API",
+                "task": common.preflight,
+                "oc_client": self.oc_client,
                 "host": self.OCP_API["host"],
                 "port": self.OCP_API["port"],
                 "fatal": True,
             },
             {
-                "label": "Checking cluster readiness",
-                "task": self._start_check_cluster_ready,
-                "fatal": True,
-            },
-            {
-                "label": "Verifying OpenShift Virtualization Operator",
-                "task": common.openshift_virt,
-                "oc_client": self.oc_client,
-                "fatal": True,
-            },
-            {
-                "label": "Verifying Kubernetes NMState Operator",
-                "task": common.nmstate_operator,
+                "label": "Verifying OpenShift Virtualization and Kubernetes NMState Operators",
+                "task": common.install_operators,
+                "operators": ["openshift-virtualization", "nmstate"],
                 "oc_client": self.oc_client,
                 "fatal": True,
             },
@@ -140,8 +131,10 @@ class MultihomedReview(OpenShift):
             },
             {
                 "label": "Creating the dev-external virtual machine",
-                "task": self.run_playbook,
+                "task": common.apply_playbook,
                 "playbook": f"ansible/{self.__LAB__}/resources.yml",
+                "oc_client": self.oc_client,
+                "fallback": self.run_playbook,
                 "fatal": True,
             },
             {
@@ -152,8 +145,7 @@ class MultihomedReview(OpenShift):
             },
             {
                 "label": "Confirming virtctl availability",
-                "task": self.run_playbook,
-                "playbook": "ansible/roles/deploy-virtctl.yml",
+                "task": common.ensure_virtctl,
                 "fatal": True,
             },
         ]
@@ -171,6 +163,14 @@ class MultihomedReview(OpenShift):
                 "hosts": _targets,
                 "fatal": True,
             },
+            {
+                "label": "Checking the cluster and its API",
+                "task": common.preflight,
+                "oc_client": self.oc_client,
+                "host": self.OCP_API["host"],
+                "port": self.OCP_API["port"],
+                "fatal": True,
+            },
             {
                 "label": "Check for NNCP and configured port",
                 "task": self._grade_nncp_port,
@@ -225,15 +225,15 @@ class MultihomedReview(OpenShift):
             },
             {
                 "label": "Test connectivity to VM from external network",
-                "task": self.run_playbook,
+                "task": common.apply_playbook,
                 "playbook": f"ansible/{self.__LAB__}/ping_test.yml",
+                "oc_client": self.oc_client,
+                "fallback": self.run_playbook,
                 "fatal": False,
                 "grading": True,
             },
         ]
-        ui = userinterface.Console(items)
-        ui.run_items(action="Grading")
-        ui.report_grade()
+        self.grade_items(items, GRADED_KINDS)
 
     def finish(self):
         """
@@ -273,63 +273,6 @@ class MultihomedReview(OpenShift):
         userinterface.Console(items).run_items(action="Finishing")
 
     # Start tasks
-    def _start_ping_api(self, item):
-        """
-        Execute a task to prepare the system for the lab
-        """
-        if item["host"] is None:
-            item["failed"] = True
-            item["msgs"] = [{"text": "OCP_HOST is not defined"}]
-        else:
-            check = labtools.ping(item["host"])
-            for key in check:
-                item[key] = check[key]
-
-        # Return status to abort lab execution when failed
-        return item["failed"]
-
-    def _start_check_api(self, item):
-        if item["host"] is None or item["port"] is None:
-            item["failed"] = True
-            item["msgs"] = [{"text": "OCP_HOST and OCP_PORT are not defined"}]
-        else:
-            if api.isApiUp(item["host"], port=item["port"]):
-                item["failed"] = False
-            else:
-                item["failed"] = True
-                item["msgs"] = [
-                    {
-                        "text": "API could not be reached: https://{}:{}/".format(
-                            item["host"], item["port"]
-                        )
-                    }
-                ]
-
-        # Return status to abort lab execution when failed
-        return item["failed"]
-
-    def _start_check_cluster_ready(self, item):
-        item["failed"] = True
-        # Get resources from cluster to check API
-        self.oc_client.resources.get(
-            api_version="project.openshift.io/v1", kind="Project"
-        ).get()
-        self.oc_client.resources.get(api_version="v1", kind="Node").get()
-        self.oc_client.resources.get(api_version="v1", kind="Namespace").get()
-
-        try:
-            v1_config = self.oc_client.resources.get(
-                api_version="config.openshift.io/v1", kind="ClusterVersion"
-            )
-            cluster_version = v1_config.get().items[0]
-            if cluster_version.spec.clusterID is None:
-                item["failed"] = True
-                item["msgs"] = [{"text": "Cluster ID could not be found"}]
-            else:
-                item["failed"] = False
-        except Exception:
-            item["msgs"] = [{"text": "Cluster is not OpenShift"}]
-
     def _check_ge_namespace(self, item):
         """
         Check GE namespace
@@ -542,15 +485,12 @@ class MultihomedReview(OpenShift):
     def _delete_ge_namespace(self, item):
         item["failed"] = False
         try:
-            self.delete_resource("v1", "Namespace", (NAMESPACE), "")
+            common.delete_namespace(self.oc_client, NAMESPACE)
         except Exception as e:
             item["failed"] = True
             item["msgs"] = [
                 {"text": "Failed removing namespace %s: %s" % (NAMESPACE, e)}
             ]
-        if not item["failed"]:
-            # Give time for the namespace to terminate
-            time.sleep(60)
 
     def _delete_nmstate_operator(self, item):
         item["failed"] = False
@@ -589,21 +529,7 @@ class MultihomedReview(OpenShift):
             )
 
         try:
-            ns = self.oc_client.resources.get(
-                api_version="v1",
-                kind="Namespace",
-            )
-            if ns.get(name="openshift-nmstate"):
-                ns.delete(name="openshift-nmstate")
-                for t in range(120):
-                    time.sleep(1)
-                    if ns.get(name="openshift-nmstate"):
-                        continue
-
-            if ns.get(name="openshift-nmstate"):
-                raise Exception(
-                    "openshift-nmstate namespace not deleted after 120 seconds"
-                )
+            common.delete_namespace(self.oc_client, "openshift-nmstate", timeout=120)
 
         except ApiException as e:
             if e.status != 404:
@@ -627,6 +553,7 @@ class MultihomedReview(OpenShift):
                     (crd),
                     "",
                 )
+            common.invalidate_discovery(self.oc_client)
         except Exception as e:
             item["failed"] = True
             item["msgs"].append(
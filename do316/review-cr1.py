@@ -15,7 +15,6 @@ This module either does start, grade, or finish for the review-cr1 lab.
 
 import os
 import sys
-import time
 import logging
 import requests
 
@@ -23,7 +22,6 @@ from urllib3 import disable_warnings
 from urllib3.exceptions import InsecureRequestWarning
 from kubernetes.client.exceptions import ApiException
 
-from ocp import api
 from ocp.utils import OpenShift
 from labs import labconfig
 from labs.common import labtools, userinterface
@@ -42,12 +40,24 @@ _targets = ["utility"]
 # Default namespace for the resources
 NAMESPACE = "review-cr1"
 
+# Objects listed once for the grading steps
+GRADED_KINDS = [
+    ("v1", "Namespace", ""),
+    ("v1", "Node", ""),
+    ("operators.coreos.com/v1alpha1", "Subscription", "openshift-cnv"),
+    ("hco.kubevirt.io/v1beta1", "HyperConverged", "openshift-cnv"),
+    ("nmstate.io/v1", "NodeNetworkConfigurationPolicy", ""),
+    ("k8s.cni.cncf.io/v1", "NetworkAttachmentDefinition", NAMESPACE),
+    ("kubevirt.io/v1", "VirtualMachine", NAMESPACE),
+    ("kubevirt.io/v1", "VirtualMachineInstance", NAMESPACE),
+]
+
 
 # Disable certificate validation
 disable_warnings(InsecureRequestWarning)
 
 
-class ReviewCR1(OpenShift):
+class ReviewCR1(common.GradingLab, OpenShift):
     """
     Comprehensive review 3 script for DO316
     """
@@ -66,7 +76,7 @@ class ReviewCR1(OpenShift):
     def __init__(self):
         logging.debug("{} / {}".format(SKU, sys._getframe().f_code.co_name))
         try:
-            super().__init__()
+            common.login(self)
         except requests.exceptions.ConnectionError:
             print(
                 "The Lab environment is not ready, please wait 10 minutes before trying again."
@@ -95,27 +105,16 @@ class ReviewCR1(OpenShift):
                 "fatal": True,
             },
             {
-                "label": "Pinging API",
-                "task": self._start_ping_api,
-                "host": self.OCP_API["host"],
-                "fatal": True,
-            },
-            {
-                "label": "Checking API",
-                "task": self._start_check_api,
+                "label": "Checking the cluster and its API",
+                "task": common.preflight,
+                "oc_client": self.oc_client,
                 "host": self.OCP_API["host"],
                 "port": self.OCP_API["port"],
                 "fatal": True,
             },
-            {
-                "label": "Checking cluster readiness",
-                "task": self._start_check_cluster_ready,
-                "fatal": True,
-            },
             {
                 "label": "Confirming virtctl availability",
-                "task": self.run_playbook,
-                "playbook": "ansible/roles/deploy-virtctl.yml",
+                "task": common.ensure_virtctl,
                 "fatal": True,
             },
             {
@@ -149,8 +148,10 @@ class ReviewCR1(OpenShift):
             },
             {
                 "label": f"Creating the {NAMESPACE} project",
-                "task": self.run_playbook,
+                "task": common.apply_playbook,
                 "playbook": f"ansible/{self.__LAB__}/start_projects.yml",
+                "oc_client": self.oc_client,
+                "fallback": self.run_playbook,
                 "fatal": True,
             },
             {
@@ -174,6 +175,14 @@ class ReviewCR1(OpenShift):
                 "hosts": _targets,
                 "fatal": True,
             },
+            {
+                "label": "Checking the cluster and its API",
+                "task": common.preflight,
+                "oc_client": self.oc_client,
+                "host": self.OCP_API["host"],
+                "port": self.OCP_API["port"],
+                "fatal": True,
+            },
             {
                 "label": "The OpenShift Virtualization Operator is installed",
                 "task": self._grade_virtualization,
@@ -242,9 +251,7 @@ class ReviewCR1(OpenShift):
                 "grading": True,
             },
         ]
-        ui = userinterface.Console(items)
-        ui.run_items(action="Grading")
-        ui.report_grade()
+        self.grade_items(items, GRADED_KINDS)
 
     def finish(self):
         """
@@ -260,8 +267,10 @@ class ReviewCR1(OpenShift):
             },
             {
                 "label": "Reverting nodes' network settings",
-                "task": self.run_playbook,
+                "task": common.apply_playbook,
                 "playbook": f"ansible/{self.__LAB__}/finish_network.yml",
+                "oc_client": self.oc_client,
+                "fallback": self.run_playbook,
                 "fatal": True,
             },
             {
@@ -278,57 +287,6 @@ class ReviewCR1(OpenShift):
         ]
         userinterface.Console(items).run_items(action="Finishing")
 
-    def _start_ping_api(self, item):
-        """
-        Execute a task to prepare the system for the lab
-        """
-        if item["host"] is None:
-            item["failed"] = True
-            item["msgs"] = [{"text": "OCP_HOST is not defined"}]
-        else:
-            check = labtools.ping(item["host"])
-            for key in check:
-                item[key] = check[key]
-
-    def _start_check_api(self, item):
-        if item["host"] is None or item["port"] is None:
-            item["failed"] = True
-            item["msgs"] = [{"text": "OCP_HOST and OCP_PORT are not defined"}]
-        else:
-            if api.isApiUp(item["host"], port=item["port"]):
-                item["failed"] = False
-            else:
-                item["failed"] = True
-                item["msgs"] = [
-                    {
-                        "text": "API could not be reached: https://{}:{}/".format(
-                            item["host"], item["port"]
-                        )
-                    }
-                ]
-
-    def _start_check_cluster_ready(self, item):
-        item["failed"] = True
-        # Get resources from cluster to check API
-        self.oc_client.resources.get(
-            api_version="project.openshift.io/v1", kind="Project"
-        ).get()
-        self.oc_client.resources.get(api_version="v1", kind="Node").get()
-        self.oc_client.resources.get(api_version="v1", kind="Namespace").get()
-
-        try:
-            v1_config = self.oc_client.resources.get(
-                api_version="config.openshift.io/v1", kind="ClusterVersion"
-            )
-            cluster_version = v1_config.get().items[0]
-            if cluster_version.spec.clusterID is None:
-                item["failed"] = True
-                item["msgs"] = [{"text": "Cluster ID could not be found"}]
-            else:
-                item["failed"] = False
-        except Exception:
-            item["msgs"] = [{"text": "Cluster is not OpenShift"}]
-
     def _check_ge_namespace(self, item):
         """
         Check GE namespace
@@ -347,27 +305,21 @@ class ReviewCR1(OpenShift):
         item["failed"] = False
         item["msgs"] = []
 
+        # The HyperConverged removes the components that it deployed, so it
+        # goes first (this can take a long time on a slow cluster)
         try:
-            try:
-                hco = self.oc_client.resources.get(
-                    api_version="hco.kubevirt.io/v1beta1",
-                    kind="HyperConverged",
-                )
-            except Exception:
-                item["msgs"] = [{"text": "HyperConverged does not exist"}]
-                return
-
-            if len(hco.get().items):
-                hco.delete(name="kubevirt-hyperconverged", namespace="openshift-cnv")
-                # gives 300 sec to remove the hco (this can take a long time on a slow cluster)
-                for t in range(300):
-                    time.sleep(1)
-                    if len(hco.get().items) == 0:
-                        break
-
-            if len(hco.get().items):
-                raise Exception("HyperConverged is not deleted after 120 seconds")
-
+            common.delete_all(
+                self.oc_client,
+                [
+                    (
+                        "hco.kubevirt.io/v1beta1",
+                        "HyperConverged",
+                        "kubevirt-hyperconverged",
+                        "openshift-cnv",
+                    )
+                ],
+                timeout=300,
+            )
         except Exception as e:
             item["failed"] = True
             item["msgs"].append(
@@ -379,82 +331,35 @@ class ReviewCR1(OpenShift):
             # don't go any further if the hco is not deleted
             return
 
-        # try:
-        #    self.delete_resource(
-        #        "operators.coreos.com/v1alpha1",
-        #        "Subscription",
-        #        "hco-operatorhub",
-        #        "openshift-cnv",
-        #    )
-        # except Exception as e:
-        #    item["failed"] = True
-        #    item["msgs"].append(
-        #        {
-        #            "text": "Failed removing hco-operatorhub subscription from the openshift-cnv project: %s"
-        #            % e
-        #        }
-        #    )
-
         try:
-            self.delete_resource(
-                "operators.coreos.com/v1alpha1",
-                "Subscription",
-                "kubevirt-hyperconverged",
-                "openshift-cnv",
+            common.delete_all(
+                self.oc_client,
+                [
+                    (
+                        "operators.coreos.com/v1alpha1",
+                        "Subscription",
+                        "kubevirt-hyperconverged",
+                        "openshift-cnv",
+                    ),
+                    (
+                        "operators.coreos.com/v1alpha1",
+                        "ClusterServiceVersion",
+                        "kubevirt-hyperconverged-operator.v4.14.1",
+                        "openshift-cnv",
+                    ),
+                    ("v1", "Namespace", "openshift-cnv", ""),
+                ],
+                timeout=300,
             )
         except Exception as e:
             item["failed"] = True
             item["msgs"].append(
-                {
-                    "text": "Failed removing kubevirt-hyperconverged subscription from the openshift-cnv project: %s"
-                    % e
-                }
-            )
-
-        try:
-            self.delete_resource(
-                "operators.coreos.com/v1alpha1",
-                "ClusterServiceVersion",
-                "kubevirt-hyperconverged-operator.v4.14.1",
-                "openshift-cnv",
-            )
-        except Exception as e:
-            item["failed"] = True
-            item["msgs"].append(
-                {
-                    "text": "Failed removing kubevirt-hyperconverged-operator.v4.14.1 cluster service version from the openshift-cnv project: %s"
-                    % e
-                }
-            )
-
-        try:
-            ns = self.oc_client.resources.get(
-                api_version="v1",
-                kind="Namespace",
-            )
-            if ns.get(name="openshift-cnv"):
-                ns.delete(name="openshift-cnv")
-                for t in range(120):
-                    time.sleep(1)
-                    if ns.get(name="openshift-cnv"):
-                        continue
-
-            if ns.get(name="openshift-cnv"):
-                raise Exception("openshift-cnv namespace not deleted after 120 seconds")
-
-        except ApiException as e:
-            if e.status != 404:
-                raise e
-
-        except Exception as e:
-            item["failed"] = True
-            item["msgs"].append(
-                {"text": "Failed removing namespace %s: %s" % (NAMESPACE, e)}
+                {"text": "Failed removing the openshift-cnv project: %s" % e}
             )
             return
 
         try:
-            crds = {
+            crds = [
                 "cdis.cdi.kubevirt.io",
                 "hostpathprovisioners.hostpathprovisioner.kubevirt.io",
                 "hyperconvergeds.hco.kubevirt.io",
@@ -462,14 +367,14 @@ class ReviewCR1(OpenShift):
                 "networkaddonsconfigs.networkaddonsoperator.network.kubevirt.io",
                 "ssps.ssp.kubevirt.io",
                 "tektontasks.tektontasks.kubevirt.io",
-            }
-            for crd in crds:
-                self.delete_resource(
-                    "apiextensions.k8s.io",
-                    "customresourcedefinition",
-                    (crd),
-                    "",
-                )
+            ]
+            common.delete_all(
+                self.oc_client,
+                [
+                    ("apiextensions.k8s.io/v1", "CustomResourceDefinition", crd, "")
+                    for crd in crds
+                ],
+            )
         except Exception as e:
             item["failed"] = True
             item["msgs"].append(
@@ -478,21 +383,17 @@ class ReviewCR1(OpenShift):
                     % e
                 }
             )
-
-        # time.sleep(15)
+        common.invalidate_discovery(self.oc_client)
 
     def _delete_ge_namespace(self, item):
         item["failed"] = False
         try:
-            self.delete_resource("v1", "Namespace", (NAMESPACE), "")
+            common.delete_namespace(self.oc_client, NAMESPACE)
         except Exception as e:
             item["failed"] = True
             item["msgs"] = [
                 {"text": "Failed removing namespace %s: %s" % (NAMESPACE, e)}
             ]
-        if not item["failed"]:
-            # Give time for the namespace to terminate
-            time.sleep(180)
 
     def _grade_virtualization(self, item):
         item["failed"] = False
@@ -565,11 +466,10 @@ class ReviewCR1(OpenShift):
         key = item["label_key"]
         value = item["label_value"]
 
-        resources = self.oc_client.resources.get(
-            api_version="nmstate.io/v1", kind="NodeNetworkConfigurationPolicy"
+        nncps = self.snapshot.items(
+            "nmstate.io/v1", "NodeNetworkConfigurationPolicy", ""
         )
-        nncps = resources.get()
-        for nncp in nncps.items:
+        for nncp in nncps:
             try:
                 if nncp.spec.nodeSelector.get(key) is not None:
                     break
@@ -0,0 +1,960 @@
+import copy
+import io
+import json
+import os
+import tarfile
+import threading
+import time
+import types
+
+import pytest
+from kubernetes import client
+from kubernetes.client.exceptions import ApiException
+from kubernetes.dynamic.client import meta_request
+from kubernetes.dynamic.resource import ResourceInstance
+from openshift.dynamic import DynamicClient
+from openshift.dynamic.discovery import LazyDiscoverer
+from openshift.dynamic.exceptions import NotFoundError
+
+from do316 import common
+
+
+class FakeResource:
+    """
+    Objects of one kind in the fake cluster. Deleting an object with
+    finalizers leaves it there, as a cluster does.
+    Each call to watch yields the next list of events of 'watches', as
+    (type, object) pairs, and applies them to the objects. An exception
+    in 'watches' is raised instead.
+    """
+
+    def __init__(self, api_version, kind):
+        self.api_version = api_version
+        self.kind = kind
+        self.objects = {}
+        self.watches = []
+        self.calls = []
+
+    def add(self, name, namespace=None, **fields):
+        obj = dict(fields, apiVersion=self.api_version, kind=self.kind)
+        obj["metadata"] = dict(
+            fields.get("metadata") or {},
+            name=name,
+            namespace=namespace,
+            resourceVersion="1",
+        )
+        self.objects[(namespace, name)] = obj
+        return obj
+
+    def _selected(self, obj, label_selector):
+        if not label_selector:
+            return True
+        key, value = label_selector.split("=")
+        return (obj["metadata"].get("labels") or {}).get(key) == value
+
+    def get(self, name=None, namespace=None, label_selector=None, **params):
+        self.calls.append(("get", name, namespace))
+        if name is None:
+            items = [
+                copy.deepcopy(o)
+                for (ns, n), o in self.objects.items()
+                if namespace in (None, ns) and self._selected(o, label_selector)
+            ]
+            listing = {
+                "apiVersion": self.api_version,
+                "kind": self.kind + "List",
+                "metadata": {"resourceVersion": "1"},
+                "items": items,
+            }
+            return ResourceInstance(None, listing)
+        if (namespace, name) not in self.objects:
+            raise NotFoundError(ApiException(status=404))
+        return ResourceInstance(None, copy.deepcopy(self.objects[(namespace, name)]))
+
+    def create(self, body, namespace=None):
+        self.calls.append(("create", body["metadata"]["name"]))
+        meta = body["metadata"]
+        self.add(meta["name"], meta.get("namespace", namespace), **body)
+
+    def delete(self, name, namespace=None):
+        self.calls.append(("delete", name))
+        obj = self.objects.get((namespace, name))
+        if obj is None:
+            raise NotFoundError(ApiException(status=404))
+        if not obj["metadata"].get("finalizers"):
+            del self.objects[(namespace, name)]
+
+    def server_side_apply(self, body, name, namespace, **params):
+        self.calls.append(("apply", name, namespace, params["field_manager"]))
+
+    def watch(self, **params):
+        self.calls.append(("watch", params.get("namespace")))
+        events = self.watches.pop(0) if self.watches else []
+        if isinstance(events, Exception):
+            raise events
+        for event_type, obj in events:
+            key = (obj["metadata"]["namespace"], obj["metadata"]["name"])
+            if event_type == "DELETED":
+                self.objects.pop(key, None)
+            else:
+                self.objects[key] = obj
+            yield {"type": event_type, "raw_object": copy.deepcopy(obj)}
+
+
+class FakeClient:
+    def __init__(self, cid="cluster-1"):
+        self.cid = cid
+        self.kinds = {}
+        self.resources = types.SimpleNamespace(get=self.resource)
+
+    def resource(self, api_version, kind):
+        if kind not in self.kinds:
+            self.kinds[kind] = FakeResource(api_version, kind)
+        return self.kinds[kind]
+
+    def request(self, method, path):
+        version = {"kind": "ClusterVersion", "spec": {"clusterID": self.cid}}
+        return ResourceInstance(None, version)
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(common, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(common, "POLL_INTERVAL", 0)
+    return tmp_path
+
+
+def _with_condition(obj, condition, status="True"):
+    obj = copy.deepcopy(obj)
+    obj["status"] = {"conditions": [{"type": condition, "status": status}]}
+    return obj
+
+
+def test_wait_available_follows_the_watch():
+    c = FakeClient()
+    deployments = c.resource("apps/v1", "Deployment")
+    operator = deployments.add("operator", "openshift-nmstate")
+    webhook = deployments.add("webhook", "openshift-nmstate")
+    deployments.watches.append(
+        [
+            ("MODIFIED", _with_condition(operator, "Available")),
+            ("MODIFIED", _with_condition(webhook, "Available")),
+        ]
+    )
+    common._wait_nmstate_ready(c)
+    assert [call[0] for call in deployments.calls] == ["get", "watch"]
+
+
+def test_wait_available_forgets_deleted_objects():
+    c = FakeClient()
+    deployments = c.resource("apps/v1", "Deployment")
+    deployments.add(
+        "operator",
+        "openshift-nmstate",
+        status={"conditions": [{"type": "Available", "status": "True"}]},
+    )
+    old = deployments.add("old", "openshift-nmstate")
+    deployments.watches.append([("DELETED", old)])
+    common._wait_nmstate_ready(c)
+    assert [call[0] for call in deployments.calls] == ["get", "watch"]
+
+
+def test_wait_available_lists_again_when_the_watch_fails():
+    c = FakeClient()
+    deployments = c.resource("apps/v1", "Deployment")
+    operator = deployments.add("operator", "openshift-nmstate")
+    deployments.watches.append(ApiException(status=500))
+    deployments.watches.append([("MODIFIED", _with_condition(operator, "Available"))])
+    common._wait_nmstate_ready(c)
+    assert [call[0] for call in deployments.calls] == ["get", "watch"] * 2
+
+
+def test_wait_available_times_out():
+    c = FakeClient()
+    c.resource("apps/v1", "Deployment").add("operator", "openshift-nmstate")
+    with pytest.raises(TimeoutError):
+        common._wait_available(c, "apps/v1", "Deployment", "openshift-nmstate", 0)
+
+
+def test_delete_namespace_returns_on_the_deleted_event():
+    c = FakeClient()
+    namespaces = c.resource("v1", "Namespace")
+    ns = namespaces.add("lab", metadata={"finalizers": ["kubernetes"]})
+    namespaces.watches.append([("MODIFIED", ns), ("DELETED", ns)])
+    assert common.delete_namespace(c, "lab")
+    assert namespaces.objects == {}
+
+
+def test_delete_namespace_skips_a_missing_namespace():
+    assert not common.delete_namespace(FakeClient(), "lab")
+
+
+def test_delete_namespace_reports_what_keeps_it():
+    c = FakeClient()
+    c.resource("v1", "Namespace").add(
+        "lab",
+        metadata={"finalizers": ["kubernetes"]},
+        status={
+            "conditions": [
+                {
+                    "type": "NamespaceContentRemaining",
+                    "status": "True",
+                    "message": "Some resources are remaining: pods. has 1",
+                }
+            ]
+        },
+    )
+    with pytest.raises(TimeoutError, match="finalizers kubernetes; Some resources"):
+        common.delete_namespace(c, "lab", timeout=0)
+
+
+class Console:
+    def __init__(self, items):
+        self.items = items
+
+    def run_items(self, action=None):
+        for item in self.items:
+            item["task"](item)
+
+    def report_grade(self):
+        pass
+
+
+class Lab:
+    def resource_get(self, api_version, kind, name, namespace):
+        return "read from the cluster"
+
+
+class ReviewLab(common.GradingLab, Lab):
+    def __init__(self):
+        self.oc_client = FakeClient()
+
+
+def test_grading_lab_reads_the_snapshot(monkeypatch):
+    monkeypatch.setattr(common.userinterface, "Console", Console, raising=False)
+    lab = ReviewLab()
+    vms = lab.oc_client.resource("kubevirt.io/v1", "VirtualMachine")
+    vms.add("web1", "review")
+    found = []
+
+    def grade(item):
+        for name in ("web1", "web2"):
+            found.append(
+                lab.resource_get("kubevirt.io/v1", "VirtualMachine", name, "review")
+            )
+
+    kinds = [("kubevirt.io/v1", "VirtualMachine", "review")]
+    lab.grade_items([{"task": grade}], kinds)
+    assert found[0].metadata.name == "web1"
+    assert found[1] is None
+    assert vms.calls == [("get", None, "review")]
+    assert lab.snapshot is None
+
+
+def test_grading_lab_resets_the_snapshot_after_an_error(monkeypatch):
+    monkeypatch.setattr(common.userinterface, "Console", Console, raising=False)
+    lab = ReviewLab()
+
+    def grade(item):
+        raise Exception("grading failed")
+
+    with pytest.raises(Exception, match="grading failed"):
+        lab.grade_items([{"task": grade}], [])
+    assert lab.snapshot is None
+    assert lab.resource_get("v1", "Node", "worker01", "") == "read from the cluster"
+
+
+# Answers of a cluster to the requests of the API discovery
+DISCOVERY = {
+    "/version": {"major": "1", "minor": "27", "gitVersion": "v1.27.0"},
+    "/version/openshift": {"major": "4", "minor": "14"},
+    "/apis": {"kind": "APIGroupList", "groups": []},
+    "/api/v1": {
+        "kind": "APIResourceList",
+        "groupVersion": "v1",
+        "resources": [
+            {
+                "name": "namespaces",
+                "singularName": "namespace",
+                "namespaced": False,
+                "kind": "Namespace",
+                "verbs": ["get", "list"],
+            }
+        ],
+    },
+    "/apis/config.openshift.io/v1/clusterversions/version": {
+        "kind": "ClusterVersion",
+        "spec": {"clusterID": "cluster-1"},
+    },
+}
+
+
+class DiscoveringClient(DynamicClient):
+    """
+    A real DynamicClient and Discoverer, that read the DISCOVERY answers
+    instead of calling the API server, and an empty list of resources for
+    the other paths.
+    """
+
+    @meta_request
+    def request(self, method, path, body=None, **params):
+        path = "/" + path.lstrip("/")
+        self.client.paths.append(path)
+        answer = DISCOVERY.get(path, {"kind": "APIResourceList", "resources": []})
+        return types.SimpleNamespace(data=json.dumps(answer).encode())
+
+
+@pytest.fixture
+def api_client():
+    api_client = client.ApiClient(client.Configuration(host="https://api.example.com"))
+    api_client.paths = []
+    return api_client
+
+
+@pytest.fixture
+def login_client(api_client, tmp_path):
+    """
+    Return a function that builds a client like OpenShift.__init__, with
+    the discovery file that the client uses by default.
+    """
+
+    def login():
+        c = DiscoveringClient(api_client, cache_file=str(tmp_path / "osrcp.json"))
+        del api_client.paths[:]
+        return c
+
+    return login
+
+
+def test_cached_client_reuses_the_discovery_file(api_client, login_client, cache_dir):
+    c = common.cached_client(login_client())
+    assert isinstance(c.resources, LazyDiscoverer)
+    c.resources.get(api_version="v1", kind="Namespace")
+    assert {"/apis", "/api/v1"} <= set(api_client.paths)
+    assert (cache_dir / "discovery-cluster-1.json").exists()
+    c = common.cached_client(login_client())
+    c.resources.get(api_version="v1", kind="Namespace")
+    assert not {"/version", "/apis", "/api/v1"} & set(api_client.paths)
+
+
+def test_invalidate_discovery_reads_the_api_groups_again(api_client, login_client):
+    c = common.cached_client(login_client())
+    del api_client.paths[:]
+    common.invalidate_discovery(c)
+    assert api_client.paths == ["/version", "/version/openshift", "/apis"]
+
+
+def test_delete_all_skips_missing_objects():
+    c = FakeClient()
+    cm = c.resource("v1", "ConfigMap")
+    cm.add("a", "ns")
+    cm.add("b", "ns")
+    common.delete_all(
+        c,
+        [
+            ("v1", "ConfigMap", "a", "ns"),
+            ("v1", "ConfigMap", "b", "ns"),
+            ("v1", "ConfigMap", "missing", "ns"),
+        ],
+    )
+    assert cm.objects == {}
+
+
+def test_delete_all_waits_for_the_finalizers():
+    c = FakeClient()
+    namespaces = c.resource("v1", "Namespace")
+    ns = namespaces.add("lab", metadata={"finalizers": ["kubernetes"]})
+    namespaces.watches.append([("DELETED", ns)])
+    common.delete_all(c, [("v1", "Namespace", "lab", "")])
+    assert namespaces.objects == {}
+
+
+def test_delete_all_reports_what_keeps_an_object():
+    c = FakeClient()
+    c.resource("v1", "Namespace").add("stuck", metadata={"finalizers": ["kubernetes"]})
+    c.resource("v1", "ConfigMap").add("gone", "ns")
+    with pytest.raises(Exception, match="Namespace stuck: finalizers kubernetes"):
+        common.delete_all(
+            c,
+            [("v1", "Namespace", "stuck", ""), ("v1", "ConfigMap", "gone", "ns")],
+            timeout=0,
+        )
+    assert c.kinds["ConfigMap"].objects == {}
+
+
+def test_apply_manifests():
+    c = FakeClient()
+    c.resource("project.openshift.io/v1", "Project").add("existing")
+    project = {
+        "apiVersion": "project.openshift.io/v1",
+        "kind": "Project",
+        "metadata": {"name": "new"},
+    }
+    existing = dict(project, metadata={"name": "existing"})
+    cm = {
+        "apiVersion": "v1",
+        "kind": "ConfigMap",
+        "metadata": {"name": "cm", "namespace": "new"},
+    }
+    common.apply_manifests(c, [(project, None), (existing, None), (cm, None)])
+    assert c.kinds["Project"].calls == [
+        ("get", "new", None),
+        ("create", "new"),
+        ("get", "existing", None),
+    ]
+    assert c.kinds["ConfigMap"].calls == [("apply", "cm", "new", "do316-lab")]
+
+
+PLAYBOOK = """
+- name: Create the resources
+  hosts: utility
+  gather_facts: false
+  vars:
+    project: lab
+    message: "hello {{ project }}"
+  tasks:
+  - name: Create the config map
+    kubernetes.core.k8s:
+      namespace: "{{ project }}"
+      wait: true
+      wait_condition:
+        type: Ready
+      definition:
+        apiVersion: v1
+        kind: ConfigMap
+        metadata:
+          name: cm
+        data:
+          message: "{{ message }}"
+"""
+
+SHELL_PLAYBOOK = """
+- name: Run a command
+  hosts: utility
+  tasks:
+  - name: Taint the nodes
+    shell: oc adm taint nodes worker01 key=value:NoSchedule
+"""
+
+
+@pytest.fixture
+def playbooks(tmp_path):
+    pytest.importorskip("jinja2")
+    (tmp_path / "create.yml").write_text(PLAYBOOK)
+    (tmp_path / "shell.yml").write_text(SHELL_PLAYBOOK)
+    return tmp_path
+
+
+def test_load_manifests_renders_the_variables(playbooks):
+    [(definition, wait)] = common.load_manifests(str(playbooks / "create.yml"))
+    assert definition["metadata"] == {"name": "cm", "namespace": "lab"}
+    assert definition["data"] == {"message": "hello lab"}
+    assert wait == {"condition": {"type": "Ready"}, "timeout": 120}
+
+
+def test_load_manifests_rejects_other_modules(playbooks):
+    with pytest.raises(common.UnsupportedPlaybook, match="Taint the nodes"):
+        common.load_manifests(str(playbooks / "shell.yml"))
+
+
+@pytest.fixture
+def ansible():
+    """
+    Return the fallback of the playbook tasks, and the list of the
+    playbooks that it ran.
+    """
+    ran = []
+
+    def run_playbook(item):
+        ran.append(os.path.basename(item["playbook"]))
+        item["failed"] = False
+        return item["failed"]
+
+    return run_playbook, ran
+
+
+def _wait_ready(c, name, namespace):
+    r = c.resource("v1", "ConfigMap")
+    obj = r.objects.get((namespace, name)) or r.add(name, namespace)
+    r.watches.append([("MODIFIED", _with_condition(obj, "Ready"))])
+
+
+def test_apply_playbook_applies_the_manifests(playbooks, ansible):
+    c = FakeClient()
+    _wait_ready(c, "cm", "lab")
+    fallback, ran = ansible
+    item = {
+        "playbook": str(playbooks / "create.yml"),
+        "oc_client": c,
+        "fallback": fallback,
+    }
+    assert not common.apply_playbook(item)
+    assert ("apply", "cm", "lab", "do316-lab") in c.kinds["ConfigMap"].calls
+    assert ran == []
+
+
+def test_apply_playbook_runs_other_playbooks_with_ansible(playbooks, ansible):
+    fallback, ran = ansible
+    item = {
+        "playbook": str(playbooks / "shell.yml"),
+        "oc_client": FakeClient(),
+        "fallback": fallback,
+    }
+    assert not common.apply_playbook(item)
+    assert ran == ["shell.yml"]
+
+
+def test_apply_playbooks_waits_for_all_of_them(playbooks, ansible):
+    c = FakeClient()
+    _wait_ready(c, "cm", "lab")
+    fallback, ran = ansible
+    item = {
+        "playbooks": [str(playbooks / "create.yml"), str(playbooks / "shell.yml")],
+        "oc_client": c,
+        "fallback": fallback,
+    }
+    assert not common.apply_playbooks(item)
+    assert ("apply", "cm", "lab", "do316-lab") in c.kinds["ConfigMap"].calls
+    assert ran == ["shell.yml"]
+
+
+def test_apply_playbooks_reports_the_failed_fallbacks(playbooks):
+    def fallback(item):
+        item["failed"] = True
+        item["msgs"] = [{"text": "Failed running %s" % item["playbook"]}]
+        return item["failed"]
+
+    playbook = str(playbooks / "shell.yml")
+    item = {"playbooks": [playbook], "oc_client": FakeClient(), "fallback": fallback}
+    assert common.apply_playbooks(item)
+    assert item["msgs"] == [{"text": "Failed running %s" % playbook}]
+
+
+def _virtctl_tarball(path, version="v1.1.0"):
+    script = ("#!/bin/sh\necho %s\n" % version).encode()
+    info = tarfile.TarInfo("virtctl")
+    info.size = len(script)
+    info.mode = 0o755
+    with tarfile.open(path, "w:gz") as tar:
+        tar.addfile(info, io.BytesIO(script))
+
+
+@pytest.fixture
+def downloads(monkeypatch, tmp_path):
+    """
+    Serve the virtctl tarball, and return the list of the downloads.
+    """
+    monkeypatch.setattr(common, "VIRTCTL", str(tmp_path / "bin" / "virtctl"))
+    (tmp_path / "bin").mkdir()
+    tarball = tmp_path / "served.tar.gz"
+    _virtctl_tarball(tarball)
+    urls = []
+
+    def get(url, **params):
+        urls.append(url)
+        return types.SimpleNamespace(
+            raw=io.BytesIO(tarball.read_bytes()), raise_for_status=lambda: None
+        )
+
+    monkeypatch.setattr(common.requests, "get", get)
+    return urls
+
+
+def test_ensure_virtctl_downloads_once(downloads):
+    assert not common.ensure_virtctl({})
+    assert os.access(common.VIRTCTL, os.X_OK)
+    assert common._virtctl_version() == "v1.1.0"
+    assert not common.ensure_virtctl({})
+    assert downloads == [common.VIRTCTL_URL]
+
+
+def test_ensure_virtctl_installs_the_cached_tarball(downloads):
+    common.ensure_virtctl({})
+    os.remove(common.VIRTCTL)
+    assert not common.ensure_virtctl({})
+    assert common._virtctl_version() == "v1.1.0"
+    assert len(downloads) == 1
+
+
+def test_ensure_virtctl_removes_a_damaged_tarball(downloads, cache_dir):
+    tarball = cache_dir / ("virtctl-%s.tar.gz" % common.CNV_VERSION)
+    tarball.write_text("not a tarball")
+    item = {}
+    assert common.ensure_virtctl(item)
+    assert item["msgs"][0]["text"].startswith("Failed installing virtctl")
+    assert not tarball.exists()
+    assert not common.ensure_virtctl({})
+    assert len(downloads) == 1
+
+
+def test_ensure_virtctl_keeps_an_existing_client(downloads, monkeypatch):
+    with open(common.VIRTCTL, "w") as f:
+        f.write("#!/bin/sh\necho v1.0.0\n")
+    os.chmod(common.VIRTCTL, 0o755)
+
+    def get(url, **params):
+        raise common.requests.exceptions.ConnectionError()
+
+    monkeypatch.setattr(common.requests, "get", get)
+    assert not common.ensure_virtctl({})
+    assert common._virtctl_version() == "v1.0.0"
+
+
+def _vm(c, name, running=True, datavolumes=()):
+    templates = [{"metadata": {"name": dv}} for dv in datavolumes]
+    return c.resource("kubevirt.io/v1", "VirtualMachine").add(
+        name, "lab", spec={"running": running, "dataVolumeTemplates": templates}
+    )
+
+
+def test_wait_vm_ready_follows_the_datavolumes_and_the_vm():
+    c = FakeClient()
+    vm = _vm(c, "web1", datavolumes=["web1-disk"])
+    dvs = c.resource("cdi.kubevirt.io/v1beta1", "DataVolume")
+    dv = dvs.add("web1-disk", "lab")
+    dvs.watches.append([("MODIFIED", _with_condition(dv, "Ready"))])
+    vmis = c.resource("kubevirt.io/v1", "VirtualMachineInstance")
+    vmi = vmis.add("web1", "lab")
+    vmis.watches.append([("MODIFIED", _with_condition(vmi, "Ready"))])
+    c.kinds["VirtualMachine"].watches.append(
+        [("MODIFIED", _with_condition(vm, "Ready"))]
+    )
+    common.wait_vm_ready(c, "web1", "lab")
+    for kind in ("DataVolume", "VirtualMachineInstance", "VirtualMachine"):
+        assert ("watch", "lab") in c.kinds[kind].calls
+
+
+def test_wait_vm_ready_only_waits_for_the_disks_of_a_stopped_vm():
+    c = FakeClient()
+    _vm(c, "web1", running=False, datavolumes=["web1-disk"])
+    # CDI removed the DataVolume once its PVC was populated
+    c.resource("v1", "PersistentVolumeClaim").add("web1-disk", "lab")
+    common.wait_vm_ready(c, "web1", "lab")
+    assert c.kinds["DataVolume"].calls == [("get", "web1-disk", "lab")]
+    assert "VirtualMachineInstance" not in c.kinds
+
+
+def test_wait_vms_ready_reports_every_vm_that_is_not_ready():
+    c = FakeClient()
+    _vm(c, "web1", running=False)
+    _vm(c, "web2", running=False)
+    _vm(c, "web3")
+    c.resource("kubevirt.io/v1", "VirtualMachineInstance").add("web3", "lab")
+    with pytest.raises(Exception) as e:
+        common.wait_vms_ready(
+            c, [("web1", "lab"), ("web2", "lab"), ("web3", "lab"), ("db", "lab")], 0
+        )
+    errors = str(e.value).split("; ")
+    assert len(errors) == 2
+    assert "VirtualMachineInstance web3 does not report Ready" in errors
+
+
+def _datavolume(url="http://utility.lab.example.com/mariadb-server.qcow2"):
+    return {
+        "apiVersion": "cdi.kubevirt.io/v1beta1",
+        "kind": "DataVolume",
+        "metadata": {"name": "mariadb", "namespace": "lab"},
+        "spec": {
+            "source": {"http": {"url": url}},
+            "pvc": {"resources": {"requests": {"storage": "10Gi"}}},
+        },
+    }
+
+
+def test_apply_manifests_clones_the_golden_image(monkeypatch):
+    golden = {"pvc": {"namespace": common.IMAGES_NAMESPACE, "name": "mariadb-server"}}
+    monkeypatch.setattr(common, "golden_image", lambda c, url, pvc: golden)
+    dv = _datavolume()
+    common.apply_manifests(FakeClient(), [(dv, None)])
+    assert dv["spec"]["source"] == golden
+
+
+def test_apply_manifests_imports_on_a_cache_miss(monkeypatch):
+    monkeypatch.setattr(common, "golden_image", lambda c, url, pvc: None)
+    dv = _datavolume()
+    common.apply_manifests(FakeClient(), [(dv, None)])
+    assert "http" in dv["spec"]["source"]
+
+
+IMAGE_URL = "http://utility.lab.example.com/mariadb-server.qcow2"
+
+
+@pytest.fixture
+def image_version(monkeypatch):
+    """
+    Return the list that _image_version reports for IMAGE_URL.
+    """
+    version = ["etag-1", "", "42"]
+    monkeypatch.setattr(common, "_image_version", lambda url: list(version))
+    return version
+
+
+def test_golden_image_miss_imports_in_background(image_version):
+    c = FakeClient()
+    pvc = {"storageClassName": "nfs"}
+    assert common.golden_image(c, IMAGE_URL, pvc) is None
+    assert ("create", common.IMAGES_NAMESPACE) in c.kinds["Project"].calls
+    [(namespace, name)] = c.kinds["DataVolume"].objects
+    assert namespace == common.IMAGES_NAMESPACE
+    assert name.startswith("mariadb-server-")
+    dv = c.kinds["DataVolume"].objects[(namespace, name)]
+    assert dv["spec"] == {"source": {"http": {"url": IMAGE_URL}}, "pvc": pvc}
+
+
+def test_golden_image_clones_once_ready(image_version):
+    c = FakeClient()
+    common.golden_image(c, IMAGE_URL, {})
+    [(namespace, name)] = c.kinds["DataVolume"].objects
+    assert common.golden_image(c, IMAGE_URL, {}) is None
+    c.kinds["DataVolume"].objects[(namespace, name)]["status"] = {"phase": "Succeeded"}
+    source = common.golden_image(c, IMAGE_URL, {})
+    assert source == {"pvc": {"namespace": namespace, "name": name}}
+
+
+def test_golden_image_replaces_the_copy_of_the_same_spec(image_version):
+    c = FakeClient()
+    nfs, lvms = {"storageClassName": "nfs"}, {"storageClassName": "lvms"}
+    common.golden_image(c, IMAGE_URL, nfs)
+    common.golden_image(c, IMAGE_URL, lvms)
+    [old_nfs, old_lvms] = c.kinds["DataVolume"].objects
+    image_version[0] = "etag-2"
+    common.golden_image(c, IMAGE_URL, nfs)
+    dvs = c.kinds["DataVolume"].objects
+    assert old_nfs not in dvs
+    assert old_lvms in dvs
+    assert len(dvs) == 2
+
+
+def _preflight_item(c, host="api.ocp4.example.com"):
+    return {"oc_client": c, "host": host, "port": "6443"}
+
+
+def test_preflight_needs_the_api_address():
+    item = _preflight_item(FakeClient(), host=None)
+    assert common.preflight(item)
+    assert item["msgs"] == [{"text": "OCP_HOST and OCP_PORT are not defined"}]
+
+
+def test_preflight_reports_every_failed_probe(monkeypatch):
+    monkeypatch.setattr(
+        common, "api", types.SimpleNamespace(isApiUp=lambda host, port: False)
+    )
+    c = FakeClient()
+
+    def no_nodes(**params):
+        raise ApiException(status=403, reason="Forbidden")
+
+    c.resource("v1", "Node").get = no_nodes
+    item = _preflight_item(c)
+    assert common.preflight(item)
+    texts = [m["text"] for m in item["msgs"]]
+    assert texts[0] == "API could not be reached: https://api.ocp4.example.com:6443/"
+    assert "Forbidden" in texts[1]
+    assert len(texts) == 2
+
+
+def test_preflight_remembers_a_success(cache_dir):
+    c = FakeClient()
+    assert not common.preflight(_preflight_item(c))
+    assert (cache_dir / "preflight-cluster-1").exists()
+    calls = len(c.kinds["Node"].calls)
+    assert not common.preflight(_preflight_item(c))
+    assert len(c.kinds["Node"].calls) == calls
+
+
+def test_preflight_probes_again_after_ttl(cache_dir):
+    c = FakeClient()
+    common.preflight(_preflight_item(c))
+    old = time.time() - common.PREFLIGHT_TTL - 1
+    os.utime(cache_dir / "preflight-cluster-1", (old, old))
+    common.preflight(_preflight_item(c))
+    assert len(c.kinds["Node"].calls) == 2
+
+
+OCP_API = {"user": "admin", "password": "redhatocp", "host": "api", "port": "6443"}
+
+
+class PasswordLogin:
+    """
+    OpenShift.__init__, that logs in with the password of OCP_API and sets
+    the attributes in 'attributes'.
+    """
+
+    logins = 0
+    attributes = {}
+
+    def __init__(self):
+        PasswordLogin.logins += 1
+        config = client.Configuration()
+        config.api_key = {"authorization": "Bearer sha256~password"}
+        self.oc_client = types.SimpleNamespace(client=client.ApiClient(config))
+        vars(self).update(PasswordLogin.attributes)
+
+
+class TokenClient:
+    """
+    DynamicClient, without the API discovery.
+    """
+
+    def __init__(self, api_client, cache_file=None):
+        self.client = api_client
+        self.cache_file = cache_file
+
+
+@pytest.fixture
+def lab(monkeypatch):
+    monkeypatch.setattr(common, "TOKENS_FILE", os.path.join(common.CACHE_DIR, "t"))
+    monkeypatch.setattr(common, "OpenShift", PasswordLogin)
+    monkeypatch.setattr(common, "DynamicClient", TokenClient)
+    monkeypatch.setattr(common, "cached_client", lambda c: c)
+    monkeypatch.setattr(PasswordLogin, "logins", 0)
+    return types.SimpleNamespace(OCP_API=OCP_API)
+
+
+@pytest.fixture
+def cluster(monkeypatch):
+    """
+    Answer the check of the cached token with the result in 'answers'.
+    """
+    answers = [{"spec": {"clusterID": "cluster-1"}}]
+
+    def call_api(self, *args, **params):
+        if isinstance(answers[0], Exception):
+            raise answers[0]
+        return answers[0]
+
+    monkeypatch.setattr(client.ApiClient, "call_api", call_api)
+    return answers
+
+
+def test_login_caches_the_token(lab, cache_dir):
+    common.login(lab)
+    with open(common.TOKENS_FILE) as f:
+        tokens = json.load(f)
+    assert tokens == {"attributes": ["oc_client"], "admin@api:6443": "sha256~password"}
+    assert os.stat(common.TOKENS_FILE).st_mode & 0o777 == 0o600
+    assert os.stat(cache_dir).st_mode & 0o777 == 0o700
+
+
+def test_login_reuses_the_cached_token(lab, cluster, cache_dir):
+    common.login(lab)
+    lab = types.SimpleNamespace(OCP_API=OCP_API)
+    common.login(lab)
+    assert PasswordLogin.logins == 1
+    assert isinstance(lab.oc_client, TokenClient)
+    api_key = lab.oc_client.client.configuration.api_key
+    assert api_key == {"authorization": "Bearer sha256~password"}
+    assert lab.oc_client.cache_file == str(cache_dir / "discovery-cluster-1.json")
+
+
+def test_login_forgets_a_rejected_token(lab, cluster):
+    common.login(lab)
+    cluster[0] = ApiException(status=401)
+    lab = types.SimpleNamespace(OCP_API=OCP_API)
+    common.login(lab)
+    assert PasswordLogin.logins == 2
+    assert not isinstance(lab.oc_client, TokenClient)
+
+
+def test_login_needs_the_password_for_other_attributes(lab, cluster, monkeypatch):
+    monkeypatch.setattr(PasswordLogin, "attributes", {"ocp_version": "4.14"})
+    common.login(lab)
+    common.login(types.SimpleNamespace(OCP_API=OCP_API))
+    assert PasswordLogin.logins == 2
+
+
+@pytest.fixture
+def operators(monkeypatch):
+    """
+    Replace OPERATORS with operators that record their steps. Their ready
+    steps wait for each other, so they only pass when they run together.
+    """
+    steps = []
+    together = threading.Barrier(2, timeout=5)
+
+    def operator(name, healthy=False, error=None):
+        def create(c):
+            steps.append(("create", name))
+            return healthy
+
+        def ready(c):
+            together.wait()
+            steps.append(("ready", name))
+            if error:
+                raise Exception(error)
+
+        return (name, create, ready)
+
+    monkeypatch.setattr(
+        common,
+        "OPERATORS",
+        {
+            "virt": operator("Virtualization"),
+            "nmstate": operator("NMState", error="no NMState CRD"),
+            "healthy": operator("Healthy", healthy=True),
+        },
+    )
+    return steps
+
+
+def test_install_operators_waits_for_them_together(operators):
+    item = {"oc_client": FakeClient(), "operators": ["virt", "nmstate", "healthy"]}
+    assert common.install_operators(item)
+    assert operators[:3] == [
+        ("create", "Virtualization"),
+        ("create", "NMState"),
+        ("create", "Healthy"),
+    ]
+    assert sorted(operators[3:]) == [("ready", "NMState"), ("ready", "Virtualization")]
+    assert item["msgs"] == [{"text": "Failed installing NMState: no NMState CRD"}]
+
+
+def test_install_operators_needs_a_client(operators):
+    item = {"operators": ["virt"]}
+    assert common.install_operators(item)
+    assert item["msgs"][0]["text"].startswith("Must define oc_client")
+    assert operators == []
+
+
+def _package(c, name, *channels):
+    c.resource("packages.operators.coreos.com/v1", "PackageManifest").add(
+        name,
+        "openshift-marketplace",
+        metadata={"labels": {"catalog": "do316-catalog-cs"}},
+        status={"channels": [{"name": ch, "currentCSV": csv} for ch, csv in channels]},
+    )
+
+
+def test_catalog_index_lists_the_packages_once():
+    c = FakeClient()
+    _package(
+        c, "kubevirt-hyperconverged", ("stable", "kubevirt-hyperconverged.v4.14.0")
+    )
+    index = common._catalog_index(c)
+    assert index == {
+        "kubevirt-hyperconverged": {"stable": "kubevirt-hyperconverged.v4.14.0"}
+    }
+    assert common._catalog_index(c) == index
+    assert len(c.kinds["PackageManifest"].calls) == 1
+
+
+def test_catalog_index_expires_after_ttl(cache_dir):
+    c = FakeClient()
+    common._catalog_index(c)
+    old = time.time() - common.CATALOG_TTL - 1
+    os.utime(cache_dir / "catalog-cluster-1.json", (old, old))
+    common._catalog_index(c)
+    assert len(c.kinds["PackageManifest"].calls) == 2
+
+
+def test_current_csv_refreshes_the_index_for_a_new_package():
+    c = FakeClient()
+    _package(
+        c, "kubevirt-hyperconverged", ("stable", "kubevirt-hyperconverged.v4.14.0")
+    )
+    common._catalog_index(c)
+    _package(
+        c, "mtv-operator", ("release-v2.5", "mtv-operator.v2.5.3"), ("stable", "x")
+    )
+    assert common._current_csv(c, "mtv-operator") == "mtv-operator.v2.5.3"
+    assert len(c.kinds["PackageManifest"].calls) == 2
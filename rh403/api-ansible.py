@@ -18,7 +18,6 @@ Api Ansible guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite"]
@@ -55,7 +54,7 @@ class ApiHammer(GuidedExercise):
 
             newcourselib.copy_file(_to_host, _ansibletar_loc, _dest),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -64,4 +63,4 @@ class ApiHammer(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -21,7 +21,6 @@ Api Overview Red Hat Content guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite"]
@@ -64,7 +63,7 @@ class ApiOverview(GuidedExercise):
 
             newcourselib.remove_org(_orgname_trng),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -74,4 +73,4 @@ class ApiOverview(GuidedExercise):
             newcourselib.verify_systems(_targets),
 
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -82,8 +82,6 @@ class ApiReview(GuidedExercise):
             newcourselib.verify_organization_cdn(_orgname),
 
             newcourselib.check_sync_product_repos(_orgname, _productname),
-            newcourselib.verify_repository(_orgname, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname, _repo_name_app, _productname),
 
             newcourselib.copy_file(_to_host, _ansibletar_loc, _dest),
             newcourselib.copy_file(_to_host, _ansiblecomm_tar, _dest),
@@ -95,6 +93,9 @@ class ApiReview(GuidedExercise):
             newcourselib.check_cv(_orgname, _cv_fin, _cv_fin_desc),
             newcourselib.check_repo_cv(_orgname, _cv_fin, _repo_name_base),
             newcourselib.check_repo_cv(_orgname, _cv_fin, _repo_name_app),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname, _repo_name_app, _productname),
             newcourselib.check_publish_cv(_orgname, _cv_fin, _cv_fin_desc, _lclib),
             newcourselib.check_promote_cv(_orgname, _cv_fin, _cv_fin_desc, _lcbuild),
 
@@ -112,7 +113,7 @@ class ApiReview(GuidedExercise):
                               shell=True,
                               ),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def grade(self):
         """Perform evaluation steps on the system."""
@@ -165,4 +166,4 @@ class ApiReview(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
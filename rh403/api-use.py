@@ -15,9 +15,9 @@ Integrate Red Hat Satellite Functionality in Applications guided exercise.
 """
 
 from . import courselib
+from . import newcourselib
 from labs.common import steps
 from labs.common import labtools
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite"]
@@ -83,7 +83,7 @@ class ApiUse(GuidedExercise):
                               shell=True
                               ),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -107,4 +107,4 @@ class ApiUse(GuidedExercise):
                               shell=True
                               ),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -26,7 +26,6 @@ Capsule Enable Red Hat Content guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite", "capsule"]
@@ -95,10 +94,6 @@ class CapsuleEnable(GuidedExercise):
             newcourselib.check_default_org_loc(_orgname_ops, _location),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
 
             newcourselib.check_repo_added(_repo_capsule_rhel8, _orgname_ops, _release_rhel8),
             newcourselib.check_repo_added(_repo_maintenance_rhel8, _orgname_ops, _release_rhel8),
@@ -114,6 +109,11 @@ class CapsuleEnable(GuidedExercise):
             newcourselib.check_key_override(_orgname_ops, _keyname, _keyoveroptions_maintenance),
             newcourselib.check_key_override(_orgname_ops, _keyname, _keyoveroptions_client),
 
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
             newcourselib.check_bootstrap_capsule(_orgname_ops, _keyname),
             newcourselib.check_ports(_satellite_host, _ports_satellite),
             newcourselib.check_ports(_capsule_host, _ports_capsule),
@@ -124,7 +124,7 @@ class CapsuleEnable(GuidedExercise):
             newcourselib.check_capsule_org_loc(_capsule_fqdn, _orgname_ops, _location),
             newcourselib.remove_capsule_ansible(),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -133,4 +133,4 @@ class CapsuleEnable(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -25,7 +25,6 @@ Install a Satellite Capsule Server guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite", "capsule"]
@@ -97,15 +96,16 @@ class CapsulInstall(GuidedExercise):
             newcourselib.check_default_org_loc(_orgname_ops, _location),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
 
             newcourselib.check_repo_added(_repo_tools, _orgname_ops, _release),
             newcourselib.check_sync_repo(_orgname_ops, _repo_name_tools, _productname),
 
             newcourselib.remove_activation_key(_orgname_ops, _keyname),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
             newcourselib.remove_capsule(_capsule_fqdn),
             newcourselib.remove_packages(_capsule_host, _packages),
             newcourselib.remove_file_directory(_targets, _cert_files),
@@ -128,7 +128,7 @@ class CapsulInstall(GuidedExercise):
             newcourselib.disable_repo(_orgname_ops, _repo_maintenance_rhel8, _release_rhel8),
             newcourselib.disable_repo(_orgname_ops, _repo_client_rhel8, _release_rhel8),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -137,4 +137,4 @@ class CapsulInstall(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
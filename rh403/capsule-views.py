@@ -26,7 +26,6 @@ Capsule Views Red Hat Content guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite", "capsule"]
@@ -102,10 +101,6 @@ class CapsuleViews(GuidedExercise):
             newcourselib.check_default_org_loc(_orgname_ops, _location),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
 
             newcourselib.check_repo_added(_repo_capsule_rhel8, _orgname_ops, _release_rhel8),
             newcourselib.check_repo_added(_repo_maintenance_rhel8, _orgname_ops, _release_rhel8),
@@ -124,6 +119,11 @@ class CapsuleViews(GuidedExercise):
             newcourselib.check_key_override(_orgname_ops, _keyname, _keyoveroptions_maintenance),
             newcourselib.check_key_override(_orgname_ops, _keyname, _keyoveroptions_client),
 
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
             newcourselib.check_bootstrap_capsule(_orgname_ops, _keyname),
             newcourselib.check_ports(_satellite_host, _ports_satellite),
             newcourselib.check_ports(_capsule_host, _ports_capsule),
@@ -138,7 +138,7 @@ class CapsuleViews(GuidedExercise):
             newcourselib.remove_lifecycle_cv(_orgname_ops, _cv_boston_project, _lclib),
             newcourselib.remove_cv(_orgname_ops, _cv_boston_project),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -147,4 +147,4 @@ class CapsuleViews(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -25,7 +25,6 @@ Automate Registration of Content Hosts guided exercise.
 
 from . import newcourselib
 from labs.common import steps
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite", "serverc"]
@@ -83,8 +82,6 @@ class ClientsAutomate(GuidedExercise):
             newcourselib.verify_organization_cdn(_orgname_ops),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
 
             newcourselib.check_location(_location, _orgname_ops),
             newcourselib.check_default_org_loc(_orgname_ops, _location),
@@ -97,6 +94,9 @@ class ClientsAutomate(GuidedExercise):
             newcourselib.check_lifecycle(_orgname_mkt, _devlc, _devdesc, _liblc),
 
             newcourselib.check_cv(_orgname_mkt, _mkt_cv, _mkt_cv_desc),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
             newcourselib.check_publish_cv(_orgname_mkt, _mkt_cv, _mkt_cv_desc, _liblc),
             newcourselib.check_promote_cv(_orgname_mkt, _mkt_cv, _mkt_cv_desc, _devlc),
 
@@ -129,7 +129,7 @@ class ClientsAutomate(GuidedExercise):
 
             newcourselib.remove_activation_key(_orgname_ops, _ops_activation_key),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -138,4 +138,4 @@ class ClientsAutomate(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
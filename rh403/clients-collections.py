@@ -29,7 +29,6 @@ Synchronize Red Hat Content guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite", "servera"]
@@ -84,8 +83,6 @@ class ClientsCollections(GuidedExercise):
             newcourselib.verify_organization_cdn(_orgname_ops),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
 
             newcourselib.check_location(_location, _orgname_ops),
             newcourselib.check_default_org_loc(_orgname_ops, _location),
@@ -101,6 +98,9 @@ class ClientsCollections(GuidedExercise):
             newcourselib.check_repo_cv(_orgname_ops, _ops_cv, _repo_name_base),
             newcourselib.check_repo_cv(_orgname_ops, _ops_cv, _repo_name_app),
             newcourselib.check_repo_cv(_orgname_ops, _ops_cv, _repo_name_tools),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
             newcourselib.check_publish_cv(_orgname_ops, _ops_cv, _ops_cv_desc, _liblc),
             newcourselib.check_promote_cv(_orgname_ops, _ops_cv, _ops_cv_desc, _devlc),
 
@@ -110,7 +110,7 @@ class ClientsCollections(GuidedExercise):
             newcourselib.remove_collection(_orgname_ops, _host_collection),
             newcourselib.remove_packages(_client, _packages),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -119,4 +119,4 @@ class ClientsCollections(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
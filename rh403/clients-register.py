@@ -26,7 +26,6 @@ Synchronize Red Hat Content guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 # Vars
@@ -87,8 +86,6 @@ class ClientsRegister(GuidedExercise):
             newcourselib.check_location(_location, _orgname_ops),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
 
             newcourselib.check_repo_added(_repo_tools, _orgname_ops, _release),
             newcourselib.check_sync_repo(_orgname_ops, _repo_name_tools, _productname),
@@ -101,6 +98,9 @@ class ClientsRegister(GuidedExercise):
             newcourselib.check_repo_cv(_orgname_ops, _cvbase_ops, _repo_name_base),
             newcourselib.check_repo_cv(_orgname_ops, _cvbase_ops, _repo_name_app),
             newcourselib.check_repo_cv(_orgname_ops, _cvbase_ops, _repo_name_tools),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
 
             newcourselib.check_publish_cv(_orgname_ops, _cvbase_ops, _cvbasedesc, _liblc),
             newcourselib.check_promote_cv(_orgname_ops, _cvbase_ops, _cvbasedesc, _devlc),
@@ -126,6 +126,7 @@ class ClientsRegister(GuidedExercise):
             newcourselib.check_repo_cv(_orgname_mkt, _cvbase_mkt, _repo_name_base),
             newcourselib.check_repo_cv(_orgname_mkt, _cvbase_mkt, _repo_name_app),
             newcourselib.check_repo_cv(_orgname_mkt, _cvbase_mkt, _repo_name_tools),
+            newcourselib.wait_sync_tasks(),
             newcourselib.check_publish_cv(_orgname_mkt, _cvbase_mkt, _cvbasedesc, _liblc),
             newcourselib.check_promote_cv(_orgname_mkt, _cvbase_mkt, _cvbasedesc, _devlc),
 
@@ -133,7 +134,7 @@ class ClientsRegister(GuidedExercise):
             newcourselib.remove_host(_orgname_mkt, _fqdn_serverc),
             newcourselib.unregister_host(_hosts),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -142,4 +143,4 @@ class ClientsRegister(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -84,8 +84,6 @@ class ClientsReview(GuidedExercise):
             newcourselib.verify_organization_cdn(_orgname_fin),
 
             newcourselib.check_sync_product_repos(_orgname_fin, _productname),
-            newcourselib.verify_repository(_orgname_fin, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_fin, _repo_name_app, _productname),
             newcourselib.check_repo_added(_repo_tools, _orgname_fin, _release),
             newcourselib.check_sync_repo(_orgname_fin, _repo_name_tools, _productname),
 
@@ -95,6 +93,9 @@ class ClientsReview(GuidedExercise):
 
             newcourselib.check_cv(_orgname_fin, _fin_cv, _fin_cv_desc),
             newcourselib.check_repo_cv(_orgname_fin, _fin_cv, _repo_name_base),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_fin, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_fin, _repo_name_app, _productname),
             newcourselib.check_publish_cv(_orgname_fin, _fin_cv, _fin_cv_desc, _lclib),
             newcourselib.check_promote_cv(_orgname_fin, _fin_cv, _fin_cv_desc, _lcbuild),
 
@@ -103,7 +104,7 @@ class ClientsReview(GuidedExercise):
             newcourselib.remove_host(_orgname_fin, _fqdn_serverb),
             newcourselib.unregister_host(_hosts),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def grade(self):
         """Perform evaluation steps on the system."""
@@ -171,4 +172,4 @@ class ClientsReview(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
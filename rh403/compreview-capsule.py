@@ -77,10 +77,11 @@ class ComprehensiveCapsule(GuidedExercise):
             newcourselib.check_location(_location_fin, _orgname_fin),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
 
             newcourselib.remove_activation_key(_orgname_ops, _keyname),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
             newcourselib.remove_capsule(_capsule_fqdn),
             newcourselib.remove_packages(_capsule_host, _packages),
             newcourselib.remove_file_directory(_capsule_hosts, _cert_files),
@@ -94,7 +95,7 @@ class ComprehensiveCapsule(GuidedExercise):
             newcourselib.disable_repo(_orgname_ops, _repo_capsule_rhel8, _release_rhel8),
             newcourselib.disable_repo(_orgname_ops, _repo_maintenance_rhel8, _release_rhel8),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def grade(self):
         """Perform evaluation steps on the system."""
@@ -142,4 +143,4 @@ class ComprehensiveCapsule(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
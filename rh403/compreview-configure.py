@@ -60,7 +60,7 @@ class CompreviewConfigure(GuidedExercise):
 
             newcourselib.remove_org(_orgname),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def grade(self):
         """Perform evaluation steps on the system."""
@@ -165,4 +165,4 @@ class CompreviewConfigure(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
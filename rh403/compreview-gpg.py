@@ -70,7 +70,7 @@ class CompreviewGpg(GuidedExercise):
             newcourselib.remove_file_directory(_workstation_host, _dir_rpmmacros),
             newcourselib.remove_file_directory(_workstation_host, _dir_gnupg),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def grade(self):
         """Perform evaluation steps on the system."""
@@ -104,4 +104,4 @@ class CompreviewGpg(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
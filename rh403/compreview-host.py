@@ -122,13 +122,6 @@ class CompreviewHost(GuidedExercise):
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
             newcourselib.check_sync_product_repos(_orgname_fin, _productname),
 
-            newcourselib.verify_repository(_orgname_fin, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_fin, _repo_name_app, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
-            newcourselib.verify_repository(_orgname_fin, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_fin, _repo_name_app, _productname),
-
             newcourselib.check_repo_added(_repo_capsule_rhel8, _orgname_ops, _release_rhel8),
             newcourselib.check_repo_added(_repo_maintenance_rhel8, _orgname_ops, _release_rhel8),
             newcourselib.check_repo_added(_repo_client_rhel8, _orgname_ops, _release_rhel8),
@@ -147,6 +140,13 @@ class CompreviewHost(GuidedExercise):
             newcourselib.check_key_override(_orgname_ops, _keyname, _keyoveroptions_maintenance),
             newcourselib.check_key_override(_orgname_ops, _keyname, _keyoveroptions_client),
 
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_fin, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_fin, _repo_name_app, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
+            newcourselib.verify_repository(_orgname_fin, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_fin, _repo_name_app, _productname),
             newcourselib.check_bootstrap_capsule(_orgname_ops, _keyname),
             newcourselib.check_ports(_satellite_host, _ports_satellite),
             newcourselib.check_ports(_capsule_host, _ports_capsule),
@@ -192,7 +192,7 @@ class CompreviewHost(GuidedExercise):
 
             newcourselib.remove_capsule_lc(_capsule_fqdn, _orgname_fin, _lcbuild),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def grade(self):
         """Perform evaluation steps on the system."""
@@ -310,4 +310,4 @@ class CompreviewHost(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -83,8 +83,6 @@ class CompreviewRemote(GuidedExercise):
             newcourselib.verify_organization_cdn(_orgname),
 
             newcourselib.check_sync_product_repos(_orgname, _productname),
-            newcourselib.verify_repository(_orgname, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname, _repo_name_app, _productname),
             newcourselib.check_repo_added(_repo_tools, _orgname, _release),
             newcourselib.check_sync_repo(_orgname, _repo_name_tools, _productname),
 
@@ -96,6 +94,9 @@ class CompreviewRemote(GuidedExercise):
             newcourselib.check_repo_cv(_orgname, _cvname, _repo_name_base),
             newcourselib.check_repo_cv(_orgname, _cvname, _repo_name_app),
             newcourselib.check_repo_cv(_orgname, _cvname, _repo_name_tools),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname, _repo_name_app, _productname),
             newcourselib.check_publish_cv(_orgname, _cvname, _cvdesc, _lclib),
             newcourselib.check_promote_cv(_orgname, _cvname, _cvdesc, _lcbuild),
 
@@ -110,7 +111,7 @@ class CompreviewRemote(GuidedExercise):
             newcourselib.remove_ssh_banner(_serverb_host),
             newcourselib.remove_foreman_key(_satellite_host, _serverb_host),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def grade(self):
         """Perform evaluation steps on the system."""
@@ -155,4 +156,4 @@ class CompreviewRemote(GuidedExercise):
             newcourselib.verify_systems(_targets),
             newcourselib.remove_root_ssh_login(_serverb_host),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -0,0 +1,45 @@
+"""
+The unit tests replace the DynoLabs tasks with fakes, so they also run
+where the labs package is not installed.
+"""
+
+import sys
+import types
+
+
+class Console:
+    """
+    Runs the tasks in list order, and stops after a failed fatal item,
+    like labs.common.userinterface.Console.
+    """
+
+    def __init__(self, items):
+        self.items = items
+
+    def run_items(self, action=None):
+        for item in self.items:
+            item["task"](item)
+            if item.get("fatal") and item.get("failed"):
+                break
+
+
+try:
+    from labs.common import tasks, labtools, userinterface  # noqa: F401
+except ImportError:
+    tasks = types.ModuleType("labs.common.tasks")
+    tasks.run_command = lambda item: False
+    labtools = types.ModuleType("labs.common.labtools")
+    labtools.check_host_reachable = lambda item: False
+    userinterface = types.ModuleType("labs.common.userinterface")
+    userinterface.Console = Console
+    common = types.ModuleType("labs.common")
+    common.tasks = tasks
+    common.labtools = labtools
+    common.userinterface = userinterface
+    labs = types.ModuleType("labs")
+    labs.common = common
+    sys.modules.update({"labs": labs,
+                        "labs.common": common,
+                        "labs.common.tasks": tasks,
+                        "labs.common.labtools": labtools,
+                        "labs.common.userinterface": userinterface})
@@ -30,7 +30,6 @@ Custom Admin Red Hat Content guided exercise.
 
 from . import newcourselib
 from labs.common import steps
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 # Vars
@@ -103,14 +102,15 @@ class CustomAdmin(GuidedExercise):
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
             newcourselib.check_sync_repo(_orgname_ops, _repo_name_base, _productname),
             newcourselib.check_sync_repo(_orgname_ops, _repo_name_app, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
             newcourselib.check_repo_added(_repo_tools, _orgname_ops, _release),
 
             newcourselib.check_sync_repo(_orgname_ops, _repo_name_tools, _productname),
             newcourselib.check_lifecycle(_orgname_ops, _devlc, _devdesc, _liblc),
             newcourselib.check_lifecycle(_orgname_ops, _qalc, _qadesc, _devlc),
             newcourselib.check_lifecycle(_orgname_ops, _prodlc, _proddesc, _qalc),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
 
             newcourselib.remove_content_credential(_orgname_ops, _credname),
 
@@ -230,7 +230,7 @@ class CustomAdmin(GuidedExercise):
 
             newcourselib.register_host(_host_clienta, _orgname_ops, _environment),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -239,4 +239,4 @@ class CustomAdmin(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
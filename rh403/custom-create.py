@@ -27,7 +27,6 @@ Creating Custom Products and Repositories guided exercise.
 
 from . import newcourselib
 from labs.common import steps
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite"]
@@ -72,10 +71,11 @@ class CustomCreate(GuidedExercise):
             newcourselib.check_default_org_loc(_orgname_ops, _location),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
             newcourselib.check_repo_added(_repo_tools, _orgname_ops, _release),
             newcourselib.check_sync_repo(_orgname_ops, _repo_name_tools, _productname),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
 
 
             steps.run_command(label=f"Removing product '{_custom_prodname}'",
@@ -101,7 +101,7 @@ class CustomCreate(GuidedExercise):
                               shell=True
                               ),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -110,4 +110,4 @@ class CustomCreate(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -103,8 +103,6 @@ class CustomReview(GuidedExercise):
             newcourselib.check_default_org_loc(_orgname_fin, _loct),
 
             newcourselib.check_sync_product_repos(_orgname_fin, _productname),
-            newcourselib.verify_repository(_orgname_fin, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_fin, _repo_name_app, _productname),
             newcourselib.check_repo_added(_repo_tools, _orgname_fin, _release),
             newcourselib.check_sync_repo(_orgname_fin, _repo_name_tools, _productname),
 
@@ -117,6 +115,9 @@ class CustomReview(GuidedExercise):
             newcourselib.check_file_in_satellite(_script_loc, _script),
             newcourselib.check_script(_host, _script),
 
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_fin, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_fin, _repo_name_app, _productname),
             newcourselib.remove_repository(_orgname_fin, _repo_name, _prod_name),
 
             steps.run_command(label=f"Removing product '{_prod_name}'",
@@ -198,7 +199,7 @@ class CustomReview(GuidedExercise):
 
             newcourselib.register_host(_host_clientb, _orgname_fin, _environment),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def grade(self):
         """Perform evaluation steps on the system."""
@@ -278,4 +279,4 @@ class CustomReview(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
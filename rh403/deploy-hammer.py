@@ -21,7 +21,6 @@ Deploy Hammer guided exercise.
 
 from . import newcourselib
 from labs.common import steps
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite", "capsule"]
@@ -61,6 +60,7 @@ class DeployHammer(GuidedExercise):
             newcourselib.verify_organization(_orgname_ops),
             newcourselib.verify_organization(_orgname_fin),
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
+            newcourselib.wait_sync_tasks(),
             newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
             newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
             newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
@@ -76,7 +76,7 @@ class DeployHammer(GuidedExercise):
                               shell=True
                               ),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -86,4 +86,4 @@ class DeployHammer(GuidedExercise):
             newcourselib.verify_systems(_targets),
             newcourselib.remove_org(_orgname),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -20,7 +20,6 @@ Verify a Red Hat Satellite Installation guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite"]
@@ -42,7 +41,7 @@ class DeployInstall(GuidedExercise):
             newcourselib.verify_systems(_targets),
             newcourselib.satellite_status(),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -51,4 +50,4 @@ class DeployInstall(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -23,7 +23,6 @@ Configure Organizations and Content Manifests guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite"]
@@ -61,7 +60,7 @@ class DeployManifest(GuidedExercise):
             newcourselib.remove_location(_location),
             newcourselib.remove_org(_orgname_mkt),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -70,4 +69,4 @@ class DeployManifest(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
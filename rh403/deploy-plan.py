@@ -20,7 +20,6 @@ Plan a Red Hat Satellite Deployment guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite", "capsule"]
@@ -44,7 +43,7 @@ class DeployPlan(GuidedExercise):
             newcourselib.verify_default_organization(),
             newcourselib.verify_cdn_listing(),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -53,4 +52,4 @@ class DeployPlan(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -60,7 +60,7 @@ class DeployReview(GuidedExercise):
             newcourselib.remove_location(_location_t),
             newcourselib.remove_location(_location_sf),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def grade(self):
         """Perform evaluation steps on the system."""
@@ -114,4 +114,4 @@ class DeployReview(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -0,0 +1,118 @@
+"""
+RH403 persistent hammer worker
+
+Keeps one hammer worker running in satellite for the whole lab action, so
+the hammer calls in the newcourselib commands do not reload the Ruby gem
+stack each time. The worker forks for every call, which keeps the real
+exit code and output of each hammer command.
+
+materials/labs/hammer_shell.py is copied to satellite and started over a
+single SSH channel. The items run their usual commands with 'hammer'
+defined as a shell function that sends each call to that process; when the
+process is not available, the function runs the hammer command directly.
+
+"""
+
+import os
+import atexit
+import threading
+import subprocess
+
+from . import sshmux
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      "materials", "labs", "hammer_shell.py")
+REMOTE_SCRIPT = "/root/.rh403_hammer_shell.py"
+SOCKET = "/root/.rh403_hammer_shell.sock"
+PYTHON = "/usr/libexec/platform-python"
+HOST = "satellite"
+
+_worker = None
+_failed = False
+_lock = threading.Lock()
+
+
+def alive():
+    """
+    Return True if the hammer worker is running.
+    """
+    return _worker is not None and _worker.poll() is None
+
+
+def start():
+    """
+    Copy the worker script to satellite and start it.
+    Returns True if the worker is ready.
+    """
+    global _worker
+    stop()
+    copy = subprocess.run(["scp"] + sshmux.options()
+                          + [SCRIPT, "root@" + HOST + ":" + REMOTE_SCRIPT],
+                          stdout=subprocess.DEVNULL,
+                          stderr=subprocess.DEVNULL)
+    if copy.returncode != 0:
+        return False
+    _worker = subprocess.Popen(["ssh"] + sshmux.options()
+                               + ["root@" + HOST,
+                                  PYTHON, REMOTE_SCRIPT, "serve", SOCKET],
+                               stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL,
+                               universal_newlines=True)
+    if _worker.stdout.readline().strip() != "ready":
+        stop()
+        return False
+    return True
+
+
+def stop():
+    """
+    Stop the hammer worker. Closing the channel stops the remote side.
+    """
+    global _worker
+    if _worker is not None:
+        _worker.stdin.close()
+        _worker.terminate()
+        _worker.wait()
+        _worker = None
+
+
+atexit.register(stop)
+
+
+def prelude(item):
+    """
+    Return the shell code that sends the hammer calls of an item to the
+    worker, starting it if needed. Returns "" for the items that do not
+    run in satellite, and after a failed start, so they run hammer
+    directly.
+    """
+    global _failed
+    if item["hosts"] != [HOST]:
+        return ""
+    with _lock:
+        if not alive() and not _failed:
+            _failed = not start()
+    if _failed:
+        return ""
+    return ("hammer() { if [[ -S " + SOCKET + " ]];"
+            + " then " + PYTHON + " " + REMOTE_SCRIPT
+            + " call " + SOCKET + " \"$@\";"
+            + " else command hammer \"$@\"; fi; };\n")
+
+
+def run_command(item):
+    """
+    Drop-in replacement for tasks.run_command that sends the hammer calls
+    of the satellite items to the worker, restarting it if it died.
+    """
+    command = item["command"]
+    item["command"] = prelude(item) + command
+    try:
+        return sshmux.run_command(item)
+    finally:
+        item["command"] = command
+
+
+# Fused items define 'hammer' once, at the top of their script
+sshmux.register(run_command, prelude)
@@ -23,7 +23,6 @@ Create Software Lifecycles guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite"]
@@ -79,10 +78,11 @@ class LifecyclesCreate(GuidedExercise):
             newcourselib.verify_organization_cdn(_orgname_mkt),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
             newcourselib.check_repo_added(_repo_tools, _orgname_ops, _release),
             newcourselib.check_sync_repo(_orgname_ops, _repo_name_tools, _productname),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
 
             newcourselib.remove_lifecycle_cv(_orgname_ops, _ops_cv, _lcprod),
             newcourselib.remove_lifecycle_cv(_orgname_ops, _ops_cv, _lcdev),
@@ -102,7 +102,7 @@ class LifecyclesCreate(GuidedExercise):
             newcourselib.remove_lifecycle(_orgname_mkt, _lcqa),
             newcourselib.remove_lifecycle(_orgname_mkt, _lcdev),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -111,4 +111,4 @@ class LifecyclesCreate(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
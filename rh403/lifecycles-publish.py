@@ -28,7 +28,6 @@ Publish and Promote Content Views guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite"]
@@ -80,8 +79,6 @@ class LifecyclesPublish(GuidedExercise):
             newcourselib.verify_organization_cdn(_orgname_ops),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
             newcourselib.check_repo_added(_repo_tools, _orgname_ops, _release),
             newcourselib.check_sync_repo(_orgname_ops, _repo_name_tools, _productname),
 
@@ -92,6 +89,9 @@ class LifecyclesPublish(GuidedExercise):
             newcourselib.check_manifest_in_workstation(_basedir, _manifest_mkt),
             newcourselib.check_manifest_in_satellite(_basedir, _manifest_mkt),
             newcourselib.check_organization(_orgname_mkt, _orgdesc_mkt),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
             newcourselib.check_manifest(_orgname_mkt, _manifest_mkt),
             newcourselib.verify_organization_cdn(_orgname_mkt),
 
@@ -102,7 +102,7 @@ class LifecyclesPublish(GuidedExercise):
             newcourselib.remove_cv(_orgname_ops, _ops_cv),
             newcourselib.remove_cv(_orgname_mkt, _mkt_cv),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -111,4 +111,4 @@ class LifecyclesPublish(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -67,6 +67,7 @@ class LifecyclesReview(GuidedExercise):
             newcourselib.verify_organization_cdn(_orgname_fin),
 
             newcourselib.check_sync_product_repos(_orgname_fin, _productname),
+            newcourselib.wait_sync_tasks(),
             newcourselib.verify_repository(_orgname_fin, _repo_name_base, _productname),
             newcourselib.verify_repository(_orgname_fin, _repo_name_app, _productname),
 
@@ -77,7 +78,7 @@ class LifecyclesReview(GuidedExercise):
             newcourselib.remove_lifecycle(_orgname_fin, _devlc),
             newcourselib.remove_cv(_orgname_fin, _fin_cv),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def grade(self):
         """Perform evaluation steps on the system."""
@@ -210,4 +211,4 @@ class LifecyclesReview(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -24,7 +24,6 @@ Synchronize Red Hat Content guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite"]
@@ -58,13 +57,14 @@ class LifecyclesSync(GuidedExercise):
             newcourselib.verify_organization_cdn(_orgname_ops),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
+            newcourselib.wait_sync_tasks(),
             newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
             newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
 
             newcourselib.remove_repository(_orgname_ops, _repo_name_tools, _productname),
             newcourselib.remove_sync_plan(_orgname_ops, _syncplan),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -73,4 +73,4 @@ class LifecyclesSync(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -18,7 +18,6 @@ Maintain backup.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite"]
@@ -56,14 +55,15 @@ class MaintainBackup(GuidedExercise):
             newcourselib.verify_organization_cdn(_orgname),
 
             newcourselib.check_sync_product_repos(_orgname, _productname),
-            newcourselib.verify_repository(_orgname, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname, _repo_name_app, _productname),
 
             newcourselib.check_user_description(_admin_user, _admin_description),
             newcourselib.remove_file_directory(_host, _backup),
             newcourselib.remove_user(_user01),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname, _repo_name_app, _productname),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -72,4 +72,4 @@ class MaintainBackup(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
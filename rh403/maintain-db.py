@@ -18,7 +18,6 @@ Maintain db.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite"]
@@ -50,10 +49,11 @@ class MaintainDb(GuidedExercise):
             newcourselib.verify_organization_cdn(_orgname),
 
             newcourselib.check_sync_product_repos(_orgname, _productname),
+            newcourselib.wait_sync_tasks(),
             newcourselib.verify_repository(_orgname, _repo_name_base, _productname),
             newcourselib.verify_repository(_orgname, _repo_name_app, _productname),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -62,4 +62,4 @@ class MaintainDb(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
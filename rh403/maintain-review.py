@@ -79,8 +79,6 @@ class MaintainReview(GuidedExercise):
             newcourselib.verify_organization_cdn(_orgname),
 
             newcourselib.check_sync_product_repos(_orgname, _productname),
-            newcourselib.verify_repository(_orgname, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname, _repo_name_app, _productname),
             newcourselib.check_repo_added(_repo_tools, _orgname, _release),
             newcourselib.check_sync_repo(_orgname, _repo_name_tools, _productname),
 
@@ -90,6 +88,9 @@ class MaintainReview(GuidedExercise):
 
             newcourselib.check_cv(_orgname, _cv, _cv_desc),
             newcourselib.check_repo_cv(_orgname, _cv, _repo_name_base),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname, _repo_name_app, _productname),
             newcourselib.check_publish_cv(_orgname, _cv, _cv_desc, _lclib),
             newcourselib.check_promote_cv(_orgname, _cv, _cv_desc, _lcbuild),
             newcourselib.check_file_in_satellite(_basedir, _script),
@@ -101,7 +102,7 @@ class MaintainReview(GuidedExercise):
             newcourselib.check_download_policy(_orgname, _repo_name_base, _download_policy),
             newcourselib.check_download_policy(_orgname, _repo_name_tools, _download_policy),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def grade(self):
         """Perform evaluation steps on the system."""
@@ -180,4 +181,4 @@ class MaintainReview(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -18,7 +18,6 @@ chapter 12 user section guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 
@@ -56,7 +55,7 @@ class RemoteConfigure(GuidedExercise):
             newcourselib.remove_user(_user02),
             newcourselib.remove_role(_role01),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -65,4 +64,4 @@ class RemoteConfigure(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
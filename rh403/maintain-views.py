@@ -18,7 +18,6 @@ Maintain views.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite"]
@@ -73,8 +72,6 @@ class MaintainViews(GuidedExercise):
             newcourselib.verify_organization_cdn(_orgname),
 
             newcourselib.check_sync_product_repos(_orgname, _productname),
-            newcourselib.verify_repository(_orgname, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname, _repo_name_app, _productname),
             newcourselib.check_repo_added(_repo_tools, _orgname, _release),
             newcourselib.check_sync_repo(_orgname, _repo_name_tools, _productname),
 
@@ -84,6 +81,9 @@ class MaintainViews(GuidedExercise):
 
             newcourselib.check_cv(_orgname, _ops_cv, _ops_cv_desc),
             newcourselib.check_repo_cv(_orgname, _ops_cv, _repo_name_base),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname, _repo_name_app, _productname),
             newcourselib.check_publish_cv(_orgname, _ops_cv, _ops_cv_desc, _lclib),
             newcourselib.check_promote_cv(_orgname, _ops_cv, _ops_cv_desc, _lcdev),
             newcourselib.check_file_in_satellite(_basedir, _script),
@@ -92,7 +92,7 @@ class MaintainViews(GuidedExercise):
             newcourselib.remove_file_directory(_host, _exports),
             newcourselib.check_download_policy(_orgname, _repo_name_base, _download_policy),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -101,4 +101,4 @@ class MaintainViews(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
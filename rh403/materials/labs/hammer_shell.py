@@ -0,0 +1,154 @@
+#!/usr/libexec/platform-python
+"""
+Persistent hammer worker for the RH403 lab scripts.
+
+Syntax:
+$ hammer_shell.py serve SOCKET
+    Loads the hammer gems and modules once in a Ruby process, and answers
+    the requests sent to the SOCKET Unix socket. Every request runs in a
+    fork of that process, so it returns the real exit code of hammer.
+    Exits when its standard input is closed.
+$ hammer_shell.py call SOCKET ARGS...
+    Runs 'hammer ARGS...' through the server, or runs hammer directly
+    when the server is not available.
+"""
+
+import os
+import sys
+import json
+import shutil
+import socket
+import threading
+import subprocess
+
+# Ruby side of the worker: preloads hammer, then forks one child per
+# request, which runs the hammer script with the request arguments.
+# Each response is one JSON line with the exit code and the output.
+WORKER = r"""
+require "json"
+require "tempfile"
+
+hammer = ARGV.shift
+proto = $stdout.dup
+proto.sync = true
+$stdout.reopen(File::NULL)
+$stderr.reopen(File::NULL)
+ARGV.replace(["--help"])
+begin
+  load hammer
+rescue SystemExit
+end
+proto.puts("ready")
+
+def read(file)
+  File.read(file.path, mode: "rb").force_encoding("UTF-8").scrub
+end
+
+while (line = STDIN.gets)
+  args = JSON.parse(line)["args"]
+  out = Tempfile.new("hammer-out")
+  err = Tempfile.new("hammer-err")
+  pid = fork do
+    $stdin.reopen(File::NULL)
+    $stdout.reopen(out)
+    $stderr.reopen(err)
+    ARGV.replace(args)
+    load hammer
+  end
+  Process.wait(pid)
+  proto.puts(JSON.generate("returncode" => $?.exitstatus || 1,
+                           "stdout" => read(out),
+                           "stderr" => read(err)))
+  out.close!
+  err.close!
+end
+"""
+
+
+def _ruby(hammer):
+    # Use the interpreter of the hammer script
+    with open(hammer) as f:
+        shebang = f.readline()
+    if shebang.startswith("#!"):
+        return shebang[2:].split()
+    return ["ruby"]
+
+
+class Worker:
+
+    def __init__(self):
+        hammer = shutil.which("hammer")
+        self.proc = subprocess.Popen(_ruby(hammer) + ["-e", WORKER, hammer],
+                                     stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE,
+                                     universal_newlines=True)
+        if self.proc.stdout.readline().strip() != "ready":
+            raise EOFError("the hammer worker did not start")
+
+    def run(self, args):
+        self.proc.stdin.write(json.dumps({"args": args}) + "\n")
+        self.proc.stdin.flush()
+        line = self.proc.stdout.readline()
+        if not line:
+            raise EOFError("the hammer worker stopped")
+        return json.loads(line)
+
+
+def serve(path):
+    if os.path.exists(path):
+        os.unlink(path)
+    worker = Worker()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    os.chmod(path, 0o600)
+    server.listen(16)
+
+    def watch_stdin():
+        # The lab script holds the other end: stop when it goes away
+        sys.stdin.read()
+        os.unlink(path)
+        worker.proc.kill()
+        os._exit(0)
+
+    threading.Thread(target=watch_stdin, daemon=True).start()
+    print("ready", flush=True)
+    while True:
+        conn, _ = server.accept()
+        with conn:
+            request = json.loads(conn.makefile().readline())
+            try:
+                response = worker.run(request["args"])
+            except EOFError:
+                # Let the caller run hammer directly, and stop serving
+                os.unlink(path)
+                conn.sendall(json.dumps({"returncode": None}).encode())
+                os._exit(1)
+            conn.sendall(json.dumps(response).encode())
+
+
+def call(path, args):
+    if not args or args[0].startswith("-"):
+        os.execvp("hammer", ["hammer"] + args)
+    try:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(path)
+    except OSError:
+        os.execvp("hammer", ["hammer"] + args)
+    with conn:
+        conn.sendall((json.dumps({"args": args}) + "\n").encode())
+        response = json.loads(conn.makefile().read())
+    if response["returncode"] is None:
+        os.execvp("hammer", ["hammer"] + args)
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    sys.exit(response["returncode"])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("serve", "call"):
+        print(__doc__)
+        sys.exit(2)
+    if sys.argv[1] == "serve":
+        serve(sys.argv[2])
+    else:
+        call(sys.argv[2], sys.argv[3:])
@@ -25,7 +25,6 @@ Network Configure Red Hat Content guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite", "capsule"]
@@ -115,6 +114,7 @@ class NetworkConfigure(GuidedExercise):
             newcourselib.check_file_in_satellite(_basedir, _script),
             newcourselib.check_script(_satellite_host, _script),
 
+            newcourselib.wait_sync_tasks(),
             newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
             newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
             newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
@@ -137,6 +137,7 @@ class NetworkConfigure(GuidedExercise):
             newcourselib.check_repo_cv(_orgname_ops, _ops_cv, _repo_name_base),
             newcourselib.check_repo_cv(_orgname_ops, _ops_cv, _repo_name_app),
             newcourselib.check_repo_cv(_orgname_ops, _ops_cv, _repo_name_tools),
+            newcourselib.wait_sync_tasks(),
             newcourselib.check_publish_cv(_orgname_ops, _ops_cv, _ops_cv_desc, _lclib),
             newcourselib.check_promote_cv(_orgname_ops, _ops_cv, _ops_cv_desc, _lcdev),
 
@@ -158,7 +159,7 @@ class NetworkConfigure(GuidedExercise):
 
             newcourselib.remove_capsule_lc(_capsule_fqdn, _orgname_ops, _lcdev),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -167,4 +168,4 @@ class NetworkConfigure(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
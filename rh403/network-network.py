@@ -26,7 +26,6 @@ Network Network Red Hat Content guided exercise.
 
 from . import newcourselib
 from labs.common import steps
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite", "capsule"]
@@ -118,11 +117,6 @@ class NetworkNetwork(GuidedExercise):
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
 
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
-
             newcourselib.check_repo_added(_repo_tools, _orgname_ops, _release_rhel9),
             newcourselib.check_repo_added(_repo_capsule_rhel8, _orgname_ops, _release_rhel8),
             newcourselib.check_repo_added(_repo_maintenance_rhel8, _orgname_ops, _release_rhel8),
@@ -140,6 +134,11 @@ class NetworkNetwork(GuidedExercise):
             newcourselib.check_repo_cv(_orgname_ops, _ops_cv, _repo_name_base),
             newcourselib.check_repo_cv(_orgname_ops, _ops_cv, _repo_name_app),
             newcourselib.check_repo_cv(_orgname_ops, _ops_cv, _repo_name_tools),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
             newcourselib.check_publish_cv(_orgname_ops, _ops_cv, _ops_cv_desc, _lclib),
             newcourselib.check_promote_cv(_orgname_ops, _ops_cv, _ops_cv_desc, _lcdev),
 
@@ -175,7 +174,7 @@ class NetworkNetwork(GuidedExercise):
             newcourselib.remove_domain(_domain),
             newcourselib.remove_capsule_lc(_capsule_fqdn, _orgname_ops, _lcdev),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -184,4 +183,4 @@ class NetworkNetwork(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
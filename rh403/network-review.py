@@ -127,6 +127,7 @@ class NetworkReview(GuidedExercise):
             newcourselib.check_file_in_satellite(_basedir, _script),
             newcourselib.check_script(_satellite_host, _script),
 
+            newcourselib.wait_sync_tasks(),
             newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
             newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
             newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
@@ -153,6 +154,7 @@ class NetworkReview(GuidedExercise):
             newcourselib.check_repo_cv(_orgname_fin, _fin_cv, _repo_name_base),
             newcourselib.check_repo_cv(_orgname_fin, _fin_cv, _repo_name_app),
             newcourselib.check_repo_cv(_orgname_fin, _fin_cv, _repo_name_tools),
+            newcourselib.wait_sync_tasks(),
             newcourselib.check_publish_cv(_orgname_fin, _fin_cv, _fin_cv_desc, _lclib),
             newcourselib.check_promote_cv(_orgname_fin, _fin_cv, _fin_cv_desc, _lcbuild),
 
@@ -187,7 +189,7 @@ class NetworkReview(GuidedExercise):
             newcourselib.remove_domain(_domain),
             newcourselib.remove_capsule_lc(_capsule_fqdn, _orgname_fin, _lcbuild),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def grade(self):
         """Perform evaluation steps on the system."""
@@ -370,4 +372,4 @@ class NetworkReview(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
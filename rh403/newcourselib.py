@@ -6,8 +6,87 @@ from . import newcourselib
 
 """
 
+import os
+import threading
+
 from labs.common import tasks
 from labs.common import labtools
+from labs.common.userinterface import Console
+
+from . import satelliteapi
+from . import hammershell
+from . import scheduler
+from . import sshmux
+
+# Backend for the Satellite checks: "api" answers them through the
+# Katello/Foreman REST API, "shell" sends the hammer calls to a persistent
+# 'hammer shell' in satellite, and "hammer" runs the hammer CLI each time.
+BACKEND = os.environ.get("RH403_BACKEND", "api")
+# Foreman task ids of the asynchronous synchronizations, in satellite
+SYNC_TASKS = "/root/.rh403_sync_tasks"
+# Repositories of the content view checked by check_cvs_in_place
+_REPO_BASE = "Red_Hat_Enterprise_Linux_9_for_x86_64_-_BaseOS_RPMs_9"
+_REPO_APPSTREAM = "Red_Hat_Enterprise_Linux_9_for_x86_64_-_AppStream_RPMs_9"
+_REPO_CLIENT = "Red_Hat_Satellite_Client_6_for_RHEL_9_x86_64_RPMs"
+# Extracts the task id from the output of 'hammer ... --async'
+_TASK_ID = " | grep -oE '[0-9a-f]{8}(-[0-9a-f]{4}){3}-[0-9a-f]{12}' >> " + SYNC_TASKS
+_sync_lock = threading.Lock()
+_sync_started = False
+
+
+def use_backend(backend):
+    """
+    Select the backend for the Satellite checks.
+    'backend' is a str: "api", "shell" or "hammer".
+    """
+    global BACKEND
+    BACKEND = backend
+
+
+def _satellite_task(api_task=None):
+    """
+    Return the task that runs a Satellite check with the selected backend.
+    'api_task' is the satelliteapi function used by the "api" backend.
+    """
+    if BACKEND == "api" and api_task is not None:
+        return api_task
+    if BACKEND == "shell":
+        return hammershell.run_command
+    return tasks.run_command
+
+
+def _sync_task(api_task):
+    """
+    Return the task of a synchronization item. The first one that runs
+    empties SYNC_TASKS, which keeps the task ids of a run that stopped
+    before its wait_sync_tasks item.
+    """
+    task = _satellite_task(api_task)
+
+    def run(item):
+        global _sync_started
+        with _sync_lock:
+            if not _sync_started:
+                _sync_started = True
+                item["command"] = ": > " + SYNC_TASKS + "; " + item["command"]
+                return task(item)
+        return task(item)
+    return run
+
+
+def run_items(items, hosts, action):
+    """
+    Run the items of a lab action, as Console(items).run_items does, over
+    one multiplexed SSH connection per host. Adjacent commands for the same
+    host run as one remote script. The items that declare 'resources' or
+    'depends_on' run concurrently with the items they do not depend on; the
+    other items run alone, in order.
+    'hosts' is the list of lab systems, such as _targets.
+    'action' is the str shown by Console, such as "Starting".
+    """
+    with sshmux.session(hosts):
+        items = sshmux.coalesce(sshmux.multiplex(items))
+        Console(scheduler.parallel(items)).run_items(action=action)
 
 
 def verify_systems(host):
@@ -28,7 +107,7 @@ def satellite_status():
     """
     return {
         "label": "Verify Satellite status",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -51,7 +130,7 @@ def check_default_org_loc(orgname, locname):
     """
     return {
         "label": f"Check login default to '{orgname}' and '{locname}'",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -65,7 +144,8 @@ def check_default_org_loc(orgname, locname):
         "fatal": False,
         "student_msg": "Cannot set the default organization and location.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "resources": ["org:" + orgname, "location:" + locname]
     }
 
 
@@ -97,7 +177,7 @@ def verify_organization_cdn(orgname):
     """
     return {
         "label": f"Verify '{orgname}' CDN",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -116,7 +196,8 @@ def verify_organization_cdn(orgname):
         "fatal": False,
         "student_msg": "CDN status is not OK",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "resources": ["org:" + orgname]
     }
 
 
@@ -127,7 +208,7 @@ def verify_organization(orgname):
     """
     return {
         "label": f"Verify '{orgname}' organization exists",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.verify_organization),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -139,7 +220,8 @@ def verify_organization(orgname):
         "fatal": True,
         "student_msg": "The organization is not created",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname
     }
 
 
@@ -151,7 +233,7 @@ def check_organization(orgname, orgdesc):
     """
     return {
         "label": f"Check the '{orgname}' organization exists",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.check_organization),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -168,7 +250,9 @@ def check_organization(orgname, orgdesc):
         "student_msg": "Cannot create organization. "
                        + "The organization might exist with incorrect parameters.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "orgdesc": orgdesc
     }
 
 
@@ -178,7 +262,7 @@ def verify_default_location():
     """
     return {
         "label": "Verify the 'Default Location' exists",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -199,7 +283,7 @@ def verify_default_organization():
     """
     return {
         "label": "Verify the 'Default Organization' exists",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -284,7 +368,7 @@ def check_manifest(orgname, manifest):
     """
     return {
         "label": f"Check manifest in '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -313,7 +397,7 @@ def delete_manifest(orgname):
     """
     return {
         "label": f"Remove manifest in '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -340,7 +424,7 @@ def verify_repository(orgname, reponame, productname):
     """
     return {
         "label": f"Verify '{reponame}' for '{orgname}' organization exists",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.verify_repository),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -354,7 +438,10 @@ def verify_repository(orgname, reponame, productname):
         "fatal": True,
         "student_msg": "Repository is not synced.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "reponame": reponame,
+        "productname": productname
     }
 
 
@@ -365,7 +452,7 @@ def remove_org(orgname):
     """
     return {
         "label": f"Remove '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.run_command),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -378,7 +465,8 @@ def remove_org(orgname):
         "fatal": False,
         "student_msg": "Cannot remove organization.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname
     }
 
 
@@ -390,7 +478,7 @@ def check_collection(orgname, collection):
     """
     return {
         "label": f"Check '{collection}' host collection",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -406,7 +494,8 @@ def check_collection(orgname, collection):
         "fatal": False,
         "student_msg": "Cannot create collection.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "resources": ["org:" + orgname]
     }
 
 
@@ -418,7 +507,7 @@ def remove_collection(orgname, collection):
     """
     return {
         "label": f"Remove '{collection}' host collection",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -445,7 +534,7 @@ def check_location(locname, orgname):
     """
     return {
         "label": f"Check '{locname}' location exists inside '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -462,7 +551,8 @@ def check_location(locname, orgname):
         "fatal": False,
         "student_msg": "Cannot create location.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "resources": ["org:" + orgname, "location:" + locname]
     }
 
 
@@ -473,7 +563,7 @@ def remove_location(locname):
     """
     return {
         "label": f"Remove '{locname}' location",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -500,7 +590,7 @@ def disable_repo(orgname, reponame, release):
     """
     return {
         "label": f"Check '{reponame}' repository is not in '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.run_command),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -519,7 +609,9 @@ def disable_repo(orgname, reponame, release):
         "fatal": False,
         "student_msg": "Cannot disable the repository.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "invalidates": ["repositories", "content_views"]
     }
 
 
@@ -533,7 +625,7 @@ def remove_repository(orgname, repository, product):
     """
     return {
         "label": f"Check '{repository}' repo is not in '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.run_command),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -550,7 +642,9 @@ def remove_repository(orgname, repository, product):
         "fatal": False,
         "student_msg": "Cannot remove repository.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "invalidates": ["repositories", "content_views"]
     }
 
 
@@ -562,7 +656,7 @@ def remove_sync_plan(orgname, syncplan):
     """
     return {
         "label": f"Check '{syncplan}' sync plan is not in '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -590,7 +684,7 @@ def check_cv(orgname, cvname, cvdesc, options=""):
     """
     return {
         "label": f"Check '{cvname}' content view for '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.check_cv),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -607,7 +701,12 @@ def check_cv(orgname, cvname, cvdesc, options=""):
         "fatal": False,
         "student_msg": "Cannot create the content view.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "cvname": cvname,
+        "cvdesc": cvdesc,
+        "cvoptions": options,
+        "resources": ["org:" + orgname]
     }
 
 
@@ -620,7 +719,7 @@ def check_repo_cv(orgname, cvname, reponame):
     """
     return {
         "label": f"Check '{reponame}' repository to the '{cvname}' content view",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.check_repo_cv),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -635,7 +734,11 @@ def check_repo_cv(orgname, cvname, reponame):
         "fatal": False,
         "student_msg": "Cannot add the repository.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "cvname": cvname,
+        "reponame": reponame,
+        "resources": ["org:" + orgname]
     }
 
 
@@ -648,7 +751,7 @@ def check_component_cv(orgname, cvname, component):
     """
     return {
         "label": f"Check '{component}' in '{cvname}' content view",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.run_command),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -667,7 +770,9 @@ def check_component_cv(orgname, cvname, component):
         "fatal": False,
         "student_msg": "Cannot add the repository.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "invalidates": ["content_views"]
     }
 
 
@@ -681,7 +786,7 @@ def check_publish_cv(orgname, cvname, cvdesc, lcname):
     """
     return {
         "label": f"Check publish '{cvname}' content view in '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.check_publish_cv),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -697,7 +802,12 @@ def check_publish_cv(orgname, cvname, cvdesc, lcname):
         "fatal": False,
         "student_msg": "Cannot publish the content view.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "cvname": cvname,
+        "cvdesc": cvdesc,
+        "lcname": lcname,
+        "resources": ["org:" + orgname]
     }
 
 
@@ -711,7 +821,7 @@ def check_promote_cv(orgname, cvname, cvdesc, lcname):
     """
     return {
         "label": f"Check content promotion in '{lcname}' lifecycle environment",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.check_promote_cv),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -731,7 +841,12 @@ def check_promote_cv(orgname, cvname, cvdesc, lcname):
         "fatal": False,
         "student_msg": "Cannot promote the content view.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "cvname": cvname,
+        "cvdesc": cvdesc,
+        "lcname": lcname,
+        "resources": ["org:" + orgname]
     }
 
 
@@ -744,7 +859,7 @@ def remove_filter_cv(orgname, cvname, filter):
     """
     return {
         "label": f"Remove '{filter}' filter in '{cvname}' content view from '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.run_command),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -764,7 +879,9 @@ def remove_filter_cv(orgname, cvname, filter):
         "fatal": False,
         "student_msg": "Cannot remove the content view.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "invalidates": ["content_views"]
     }
 
 
@@ -799,7 +916,7 @@ def remove_lifecycle_cv(orgname, cvname, lcname):
     """
     return {
         "label": f"Remove '{lcname}' lifecycle environment from '{cvname}' content view",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.run_command),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -815,7 +932,9 @@ def remove_lifecycle_cv(orgname, cvname, lcname):
         "fatal": False,
         "student_msg": "Cannot remove the lifecycle environment.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "invalidates": ["content_views"]
     }
 
 
@@ -827,7 +946,7 @@ def remove_cv(orgname, cvname):
     """
     return {
         "label": f"Remove '{cvname}' content view from '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.run_command),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -841,7 +960,9 @@ def remove_cv(orgname, cvname):
         "fatal": False,
         "student_msg": "Cannot remove the content view.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "invalidates": ["content_views"]
     }
 
 
@@ -854,7 +975,7 @@ def check_host_cv(orgname, cvname, lcname, fqdn):
     """
     return {
         "label": f"Check '{fqdn}' belongs to '{lcname}/{cvname}'",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.run_command),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -871,7 +992,9 @@ def check_host_cv(orgname, cvname, lcname, fqdn):
         "fatal": False,
         "student_msg": "Cannot update the host.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "invalidates": ["hosts"]
     }
 
 
@@ -885,7 +1008,7 @@ def check_repo_added(reponame, orgname, release):
     """
     return {
         "label": f"Check '{reponame}' repository in '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.check_repo_added),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -901,7 +1024,11 @@ def check_repo_added(reponame, orgname, release):
         "fatal": False,
         "student_msg": "Cannot enable the repository.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "reponame": reponame,
+        "release": release,
+        "resources": ["org:" + orgname]
     }
 
 
@@ -913,7 +1040,7 @@ def check_sync_repo(orgname, reponame, productname):
     """
     return {
         "label": f"Check the '{reponame}' for '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _sync_task(satelliteapi.check_sync_repo),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -921,9 +1048,9 @@ def check_sync_repo(orgname, reponame, productname):
                     + " --organization='" + orgname + "'"
                     + " --product='" + productname + "'"
                     + " | grep 'Status:.*Not Synced') ]];"
-                    + " then hammer repository synchronize --name='" + reponame + "'"
+                    + " then hammer repository synchronize --async --name='" + reponame + "'"
                     + " --organization='" + orgname + "'"
-                    + " --product='" + productname + "';"
+                    + " --product='" + productname + "'" + _TASK_ID + ";"
                     + " else exit 0; fi",
         "returns": 0,
         "prints": '',
@@ -931,7 +1058,11 @@ def check_sync_repo(orgname, reponame, productname):
         "fatal": False,
         "student_msg": "Cannot synchronize the repository.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "reponame": reponame,
+        "productname": productname,
+        "resources": ["org:" + orgname]
     }
 
 
@@ -943,19 +1074,49 @@ def check_sync_product_repos(orgname, productname):
     """
     return {
         "label": f"Check the '{productname}' product for '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _sync_task(satelliteapi.check_sync_product_repos),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
-        "command": "hammer product synchronize"
+        "command": "hammer product synchronize --async"
                     + " --name '" + productname + "'"
-                    + " --organization '" + orgname + "'",
+                    + " --organization '" + orgname + "'" + _TASK_ID,
         "returns": 0,
         "prints": '',
         "options": [],
         "fatal": False,
         "student_msg": "Cannot synchronize the product.",
         "sshkey": '',
+        "shell": True,
+        "orgname": orgname,
+        "productname": productname,
+        "resources": ["org:" + orgname]
+    }
+
+
+def wait_sync_tasks():
+    """
+    Waits for the synchronizations started by check_sync_repo and
+    check_sync_product_repos, which do not wait for them.
+    """
+    return {
+        "label": "Wait for the repository synchronizations",
+        "task": _satellite_task(satelliteapi.wait_sync_tasks),
+        "hosts": ["satellite"],
+        "username": "root",
+        "password": "redhat",
+        "command": "rc=0; if [[ -s " + SYNC_TASKS + " ]]; then"
+                    + " for id in $(sort -u " + SYNC_TASKS + "); do"
+                    + " hammer task progress --id $id > /dev/null;"
+                    + " hammer task info --id $id --fields Result"
+                    + " | grep -q success || rc=1; done; fi;"
+                    + " rm -f " + SYNC_TASKS + "; exit $rc",
+        "returns": 0,
+        "prints": '',
+        "options": [],
+        "fatal": False,
+        "student_msg": "Cannot synchronize the repositories.",
+        "sshkey": '',
         "shell": True
     }
 
@@ -970,7 +1131,7 @@ def check_lifecycle(orgname, lcname, lcdesc, lcprior):
     """
     return {
         "label": f"Check '{lcname}' lifecycle for '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.check_lifecycle),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -986,7 +1147,12 @@ def check_lifecycle(orgname, lcname, lcdesc, lcprior):
         "fatal": False,
         "student_msg": "Cannot create the lifecycle-environment.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "lcname": lcname,
+        "lcdesc": lcdesc,
+        "lcprior": lcprior,
+        "resources": ["org:" + orgname]
     }
 
 
@@ -998,7 +1164,7 @@ def remove_lifecycle(orgname, lcname):
     """
     return {
         "label": f"Remove '{lcname}' lifecycle for '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.remove_lifecycle),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1012,7 +1178,9 @@ def remove_lifecycle(orgname, lcname):
         "fatal": False,
         "student_msg": "Cannot remove the lifecycle-environment.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "lcname": lcname
     }
 
 
@@ -1068,7 +1236,8 @@ def check_packages(host, packages, options=""):
         "fatal": False,
         "student_msg": "Cannot install the package(s).",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "resources": ["host:" + h for h in host]
     }
 
 
@@ -1093,7 +1262,8 @@ def check_yum_module(host, modules, options=""):
         "fatal": False,
         "student_msg": "Cannot enable the module(s).",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "resources": ["host:" + h for h in host]
     }
 
 
@@ -1132,7 +1302,7 @@ def remove_host(orgname, hostfqdn):
     """
     return {
         "label": f"Remove '{hostfqdn}' from '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.run_command),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1148,7 +1318,9 @@ def remove_host(orgname, hostfqdn):
         "fatal": False,
         "student_msg": "Cannot remove the host.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "invalidates": ["hosts"]
     }
 
 
@@ -1188,7 +1360,7 @@ def check_activation_key(orgname, cvname, lcname, keyname, options=""):
     """
     return {
         "label": f"Check '{keyname}' activation key for '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.check_activation_key),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1207,7 +1379,13 @@ def check_activation_key(orgname, cvname, lcname, keyname, options=""):
         "fatal": False,
         "student_msg": "Cannot create the activation key.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "cvname": cvname,
+        "lcname": lcname,
+        "keyname": keyname,
+        "keyoptions": options,
+        "resources": ["org:" + orgname]
     }
 
 
@@ -1219,7 +1397,7 @@ def remove_activation_key(orgname, keyname):
     """
     return {
         "label": f"Remove '{keyname}' activation key for '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.remove_activation_key),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1234,7 +1412,9 @@ def remove_activation_key(orgname, keyname):
         "fatal": False,
         "student_msg": "Cannot remove the activation key.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "keyname": keyname
     }
 
 
@@ -1247,7 +1427,7 @@ def check_key_override(orgname, keyname, options=""):
     """
     return {
         "label": f"Override '{keyname}' activation key",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.check_key_override),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1259,7 +1439,11 @@ def check_key_override(orgname, keyname, options=""):
         "fatal": False,
         "student_msg": "Cannot override the activation key.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "keyname": keyname,
+        "keyoptions": options,
+        "resources": ["org:" + orgname]
     }
 
 
@@ -1347,7 +1531,7 @@ def check_capsule_certs(capsule_fqdn):
     """
     return {
         "label": "Check Capsule certificate files",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1375,7 +1559,7 @@ def remove_capsule(capsule_fqdn):
     """
     return {
         "label": f"Remove '{capsule_fqdn}' capsule server",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1427,7 +1611,7 @@ def remove_capsule_lc(capsule_fqdn, orgname, lcname):
     """
     return {
         "label": f"Remove the '{lcname}' lifecycle environment from the capsule.",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1464,7 +1648,7 @@ def verify_capsule(capsule_fqdn):
     """
     return {
         "label": f"Verify the '{capsule_fqdn}' capsule is installed.",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1489,7 +1673,7 @@ def check_capsule_org_loc(capsule, organizations, locations):
     """
     return {
         "label": f"Check '{capsule}' to '{organizations}' organization and '{locations}' location",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1514,7 +1698,7 @@ def remove_puppet_ca(hostfqdn):
     """
     return {
         "label": f"Revoke Puppet certificate in '{hostfqdn}'.",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1676,7 +1860,8 @@ def check_ports(host, ports):
         "fatal": False,
         "student_msg": "Cannot open ports on the host.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "resources": ["host:" + h for h in host]
     }
 
 
@@ -1716,7 +1901,7 @@ def remove_content_credential(orgname, credname):
     """
     return {
         "label": f"Remove '{credname}' content credential for '{orgname}' organization",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1820,7 +2005,7 @@ def remove_job_template(jobtemplate):
     """
     return {
         "label": f"Remove '{jobtemplate}' job template",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1871,7 +2056,7 @@ def remove_ansible_variable(orgname, variable):
     """
     return {
         "label": f"Remove '{variable}' Ansible variable",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1899,7 +2084,7 @@ def remove_ansible_role(orgname, role):
     """
     return {
         "label": f"Remove '{role}' Ansible role",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1926,7 +2111,7 @@ def remove_user(keyname):
     """
     return {
         "label": f"Remove '{keyname}' user",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1952,7 +2137,7 @@ def remove_role(keyname):
     """
     return {
         "label": f"Remove '{keyname}' role",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -1977,7 +2162,7 @@ def check_user_description(user, description):
     """
     return {
         "label": f"Check the description for the '{user}' user",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -2003,7 +2188,7 @@ def check_download_policy(orgname, repo, policy):
     """
     return {
         "label": f"Check Download policy for the '{repo}' repo",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.run_command),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -2019,7 +2204,9 @@ def check_download_policy(orgname, repo, policy):
         "fatal": False,
         "student_msg": "Cannot update the download policy.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "invalidates": ["repositories"]
     }
 
 
@@ -2034,7 +2221,7 @@ def check_all_hosts_cv(orgname, from_cv, to_cv, to_lc):
     """
     return {
         "label": f"Check all hosts in the '{from_cv}' CV",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.check_all_hosts_cv),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -2054,7 +2241,12 @@ def check_all_hosts_cv(orgname, from_cv, to_cv, to_lc):
         "fatal": False,
         "student_msg": "Cannot move the hosts to the CV.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "from_cv": from_cv,
+        "to_cv": to_cv,
+        "to_lc": to_lc,
+        "invalidates": ["hosts"]
     }
 
 
@@ -2066,7 +2258,7 @@ def remove_all_cvs(orgname):
     """
     return {
         "label": f"Remove Content Views in '{orgname}'",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.remove_all_cvs),
         "hosts": ["workstation"],
         "command": "scp /home/student/.venv/labs/lib/python3.9/site-packages/rh403/materials/labs/remove_cvs.sh"
                    + " root@satellite:/root/;"
@@ -2079,7 +2271,9 @@ def remove_all_cvs(orgname):
         "fatal": False,
         "student_msg": "Cannot remove CVs in the organization.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "invalidates": ["hosts", "content_views", "activation_keys"]
     }
 
 
@@ -2087,12 +2281,14 @@ def check_cvs_in_place(orgname, contentview):
     """
     Check the Content View and their content.
     if something is not in place, it publish and promote new versions.
+    The previous version has the BaseOS repository and is in QA, and the
+    latest one adds AppStream and the Satellite Client and is in Development.
     'orgname' is a str with the organization.
     'contentview' is a str with the content view.
     """
     return {
         "label": f"Check '{contentview}' content view in '{orgname}'",
-        "task": tasks.run_command,
+        "task": _satellite_task(satelliteapi.check_cvs_in_place),
         "hosts": ["workstation"],
         "command": "scp /home/student/.venv/labs/lib/python3.9/site-packages/rh403/materials/labs/check_cvs.sh"
                    + " root@satellite:/root/;"
@@ -2105,7 +2301,15 @@ def check_cvs_in_place(orgname, contentview):
         "fatal": False,
         "student_msg": "Cannot check CVs in the organization.",
         "sshkey": '',
-        "shell": True
+        "shell": True,
+        "orgname": orgname,
+        "cvname": contentview,
+        "cvstate": {"versions": [
+            {"repositories": [_REPO_BASE],
+             "environments": ["QA"]},
+            {"repositories": [_REPO_BASE, _REPO_APPSTREAM, _REPO_CLIENT],
+             "environments": ["Library", "Development"]}]},
+        "invalidates": ["content_views"]
     }
 
 
@@ -2118,7 +2322,7 @@ def create_domain(loc_domain, domain, orgname):
     """
     return {
         "label": f"Create '{loc_domain}' domain",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -2148,7 +2352,7 @@ def check_capsule_domain(loc_domain, domain, orgname, capsule):
     """
     return {
         "label": f"Configure '{loc_domain}' domain",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -2176,7 +2380,7 @@ def remove_hostgroup(hostgroup):
     """
     return {
         "label": f"Remove the '{hostgroup}' host group",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -2202,7 +2406,7 @@ def remove_subnet(domain, subnet):
     """
     return {
         "label": f"Remove the '{subnet}' subnet",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
@@ -2233,7 +2437,7 @@ def remove_domain(domain):
     """
     return {
         "label": f"Remove the '{domain}' domain",
-        "task": tasks.run_command,
+        "task": _satellite_task(),
         "hosts": ["satellite"],
         "username": "root",
         "password": "redhat",
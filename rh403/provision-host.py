@@ -22,7 +22,6 @@ Provision Host Red Hat Content guided exercise.
 
 from . import newcourselib
 from labs.common import steps
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite", "capsule"]
@@ -132,10 +131,6 @@ class ProvisionHost(GuidedExercise):
             newcourselib.check_default_org_loc(_orgname_ops, _location),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
 
             newcourselib.check_repo_added(_repo_tools, _orgname_ops, _release_rhel9),
             newcourselib.check_repo_added(_repo_capsule_rhel8, _orgname_ops, _release_rhel8),
@@ -160,6 +155,11 @@ class ProvisionHost(GuidedExercise):
             newcourselib.check_repo_cv(_orgname_ops, _ops_cv, _repo_name_tools),
             newcourselib.check_repo_cv(_orgname_ops, _ops_cv, _repo_name_kickstart_base),
             newcourselib.check_repo_cv(_orgname_ops, _ops_cv, _repo_name_kickstart_app),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
             newcourselib.check_publish_cv(_orgname_ops, _ops_cv, _ops_cv_desc, _lclib),
             newcourselib.check_promote_cv(_orgname_ops, _ops_cv, _ops_cv_desc, _lcdev),
 
@@ -289,7 +289,7 @@ class ProvisionHost(GuidedExercise):
                               shell=True
                               ),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -323,4 +323,4 @@ class ProvisionHost(GuidedExercise):
                               shell=True
                               ),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -134,13 +134,6 @@ class ProvisionReview(GuidedExercise):
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
             newcourselib.check_sync_product_repos(_orgname_fin, _productname),
 
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
-            newcourselib.verify_repository(_orgname_fin, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_fin, _repo_name_app, _productname),
-
             newcourselib.check_repo_added(_repo_capsule_rhel8, _orgname_ops, _release_rhel8),
             newcourselib.check_repo_added(_repo_maintenance_rhel8, _orgname_ops, _release_rhel8),
             newcourselib.check_repo_added(_repo_client_rhel8, _orgname_ops, _release_rhel8),
@@ -162,6 +155,13 @@ class ProvisionReview(GuidedExercise):
             newcourselib.check_key_override(_orgname_ops, _keyname, _keyoveroptions_maintenance),
             newcourselib.check_key_override(_orgname_ops, _keyname, _keyoveroptions_client),
 
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
+            newcourselib.verify_repository(_orgname_fin, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_fin, _repo_name_app, _productname),
             newcourselib.check_bootstrap_capsule(_orgname_ops, _keyname),
             newcourselib.check_ports(_satellite_host, _ports_satellite),
             newcourselib.check_ports(_capsule_host, _ports_capsule),
@@ -243,7 +243,7 @@ class ProvisionReview(GuidedExercise):
             newcourselib.remove_host(_orgname_fin, _servere_fqdn),
             newcourselib.remove_hostgroup(_hostgroup),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def grade(self):
         """Perform evaluation steps on the system."""
@@ -374,4 +374,4 @@ class ProvisionReview(GuidedExercise):
                               shell=True
                               ),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
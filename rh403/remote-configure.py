@@ -25,7 +25,6 @@ Publish and Promote Content Views guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 
@@ -124,10 +123,6 @@ class RemoteConfigure(GuidedExercise):
             newcourselib.check_default_org_loc(_orgname_ops, _location),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
 
             newcourselib.check_repo_added(_repo_tools, _orgname_ops, _release),
             newcourselib.check_repo_added(_repo_capsule_rhel8, _orgname_ops, _release_rhel8),
@@ -145,6 +140,11 @@ class RemoteConfigure(GuidedExercise):
             newcourselib.check_key_override(_orgname_ops, _keyname, _keyoveroptions_maintenance),
             newcourselib.check_key_override(_orgname_ops, _keyname, _keyoveroptions_client),
 
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
             newcourselib.check_bootstrap_capsule(_orgname_ops, _keyname),
             newcourselib.check_ports(_host_satellite, _ports_satellite),
             newcourselib.check_ports(_host_capsule, _ports_capsule),
@@ -173,7 +173,7 @@ class RemoteConfigure(GuidedExercise):
             newcourselib.remove_file_directory(_host_satellite, _role_folder),
             newcourselib.remove_file_directory(_host_servera, _motd_file),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -183,4 +183,4 @@ class RemoteConfigure(GuidedExercise):
             newcourselib.verify_systems(_targets),
             newcourselib.remove_root_ssh_login(_host_servera),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
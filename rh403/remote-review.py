@@ -131,10 +131,6 @@ class RemoteReview(GuidedExercise):
             newcourselib.check_location(_capsule_location, _orgname_ops),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
             newcourselib.check_repo_added(_repo_tools, _orgname_ops, _release),
             newcourselib.check_repo_added(_repo_capsule_rhel8, _orgname_ops, _release_rhel8),
             newcourselib.check_repo_added(_repo_maintenance_rhel8, _orgname_ops, _release_rhel8),
@@ -145,8 +141,6 @@ class RemoteReview(GuidedExercise):
             newcourselib.check_sync_repo(_orgname_ops, _repo_name_client_rhel8, _productname),
 
             newcourselib.check_sync_product_repos(_orgname, _productname),
-            newcourselib.verify_repository(_orgname, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname, _repo_name_app, _productname),
             newcourselib.check_repo_added(_repo_tools, _orgname, _release),
             newcourselib.check_sync_repo(_orgname, _repo_name_tools, _productname),
 
@@ -158,6 +152,13 @@ class RemoteReview(GuidedExercise):
             newcourselib.check_repo_cv(_orgname, _fin_cv, _repo_name_base),
             newcourselib.check_repo_cv(_orgname, _fin_cv, _repo_name_app),
             newcourselib.check_repo_cv(_orgname, _fin_cv, _repo_name_tools),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base_rhel8, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app_rhel8, _productname),
+            newcourselib.verify_repository(_orgname, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname, _repo_name_app, _productname),
 
             newcourselib.check_publish_cv(_orgname, _fin_cv, _fin_cv_desc, _lclib),
             newcourselib.check_promote_cv(_orgname, _fin_cv, _fin_cv_desc, _lcbuild),
@@ -205,7 +206,7 @@ class RemoteReview(GuidedExercise):
 
             newcourselib.copy_file(_to_host, _role_loc, _dest),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def grade(self):
         """Perform evaluation steps on the system."""
@@ -273,4 +274,4 @@ class RemoteReview(GuidedExercise):
             newcourselib.remove_root_ssh_login(_host_serverb),
             newcourselib.remove_root_ssh_login(_host_serverd),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -0,0 +1,844 @@
+"""
+RH403 Satellite API backend
+
+Task functions that answer the newcourselib factories through the
+Katello/Foreman REST API instead of cold-starting hammer on the satellite
+host. Every task of a lab action shares one pooled, keep-alive session.
+
+The items keep their hammer 'command', so when the API cannot be reached
+the task falls back to running it through the hammer shell worker.
+
+"""
+
+import shlex
+import time
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import disable_warnings
+from urllib3.exceptions import InsecureRequestWarning
+
+from . import sshmux
+from . import hammershell
+
+# URL to the Satellite server
+URL = "https://satellite.lab.example.com"
+# Foreman API
+FOREMAN_API = "%s/api/" % URL
+# Katello-specific API
+KATELLO_API = "%s/katello/api/" % URL
+# Foreman tasks API
+TASKS_API = "%s/foreman_tasks/api/" % URL
+# Credentials used by the lab scripts
+USERNAME = "admin"
+PASSWORD = "redhat"
+# The classroom satellite uses a self-signed certificate
+SSL_VERIFY = False
+# Maximum number of concurrent connections kept alive to the satellite
+POOL_SIZE = 10
+# Seconds to wait for a foreman task (publish, promote, sync...)
+TASK_TIMEOUT = 1800
+# Maximum seconds between two polls of the pending synchronizations
+POLL_INTERVAL = 10
+# Results asked for in each page of the Foreman index calls
+PER_PAGE = 1000
+# Concurrent API calls made when removing the content views
+TEARDOWN_WORKERS = 8
+# Hosts updated together when the bulk host action is not available
+HOSTS_PER_CHUNK = 20
+
+disable_warnings(InsecureRequestWarning)
+
+_session = None
+_org_ids = {}
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+_sync_tasks = []
+_sync_lock = threading.Lock()
+
+
+def session():
+    """
+    Return the shared keep-alive session to the satellite.
+    """
+    global _session
+    if _session is None:
+        s = requests.Session()
+        s.auth = (USERNAME, PASSWORD)
+        s.verify = SSL_VERIFY
+        s.headers.update({"content-type": "application/json",
+                          "accept": "application/json"})
+        s.mount("https://", HTTPAdapter(pool_connections=1,
+                                        pool_maxsize=POOL_SIZE))
+        _session = s
+    return _session
+
+
+def close():
+    """
+    Close the shared session and forget the cached organizations.
+    """
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+    _org_ids.clear()
+    _snapshots.clear()
+
+
+def get_json(location, **params):
+    """
+    Performs a GET using the passed URL location
+    """
+    r = session().get(location, params=params)
+    r.raise_for_status()
+    return r.json()
+
+
+def post_json(location, json_data=None):
+    """
+    Performs a POST and passes the data to the URL location
+    """
+    r = session().post(location, json=json_data or {})
+    r.raise_for_status()
+    return r.json()
+
+
+def put_json(location, json_data=None):
+    """
+    Performs a PUT and passes the data to the URL location
+    """
+    r = session().put(location, json=json_data or {})
+    r.raise_for_status()
+    return r.json()
+
+
+def delete_json(location, json_data=None):
+    """
+    Performs a DELETE using the passed URL location
+    """
+    r = session().delete(location, json=json_data or {})
+    r.raise_for_status()
+    return r.json() if r.content else {}
+
+
+def search(location, **params):
+    """
+    Return every result of an index call. Katello answers with all of them
+    at once (full_result); the Foreman and foreman-tasks endpoints ignore
+    that flag, so their pages are read until 'subtotal' results are in.
+    """
+    params.setdefault("full_result", True)
+    params.setdefault("per_page", PER_PAGE)
+    results = []
+    page = 1
+    while True:
+        data = get_json(location, page=page, **params)
+        results += data["results"]
+        if not data["results"] or len(results) >= int(data.get("subtotal") or 0):
+            return results
+        page += 1
+
+
+def organization_id(orgname):
+    """
+    Return the id of the given organization, or None if it does not exist.
+    """
+    if orgname not in _org_ids:
+        for org in search(KATELLO_API + "organizations",
+                          search='name="%s"' % orgname):
+            if org["name"] == orgname:
+                _org_ids[orgname] = org["id"]
+                break
+        else:
+            return None
+    return _org_ids[orgname]
+
+
+# Collections kept in the snapshots, with the API location that lists them
+COLLECTIONS = {
+    "products": KATELLO_API + "products",
+    "repositories": KATELLO_API + "repositories",
+    "content_views": KATELLO_API + "content_views",
+    "lifecycles": KATELLO_API + "environments",
+    "activation_keys": KATELLO_API + "activation_keys",
+    "hosts": FOREMAN_API + "hosts",
+}
+
+
+class Snapshot:
+    """
+    State of one organization in the satellite.
+    Each collection is listed once, indexed by name, and kept in memory
+    until a task that changes it invalidates it.
+    """
+
+    def __init__(self, orgname):
+        self.orgname = orgname
+        self._collections = {}
+        self._lock = threading.Lock()
+
+    def collection(self, name):
+        """
+        Return the 'name' collection indexed by object name.
+        """
+        with self._lock:
+            if name not in self._collections:
+                index = {}
+                org_id = organization_id(self.orgname)
+                if org_id is not None:
+                    for result in search(COLLECTIONS[name],
+                                         organization_id=org_id):
+                        index.setdefault(result["name"], []).append(result)
+                self._collections[name] = index
+            return self._collections[name]
+
+    def get(self, name, objname, product=None):
+        """
+        Return the 'objname' object of the 'name' collection, or None.
+        'product' restricts the match to the repositories of a product.
+        """
+        for result in self.collection(name).get(objname, []):
+            if product is None or result["product"]["name"] == product:
+                return result
+        return None
+
+    def invalidate(self, *names):
+        """
+        Drop the given collections, or all of them, from the snapshot.
+        """
+        with self._lock:
+            for name in names or list(self._collections):
+                self._collections.pop(name, None)
+
+
+def snapshot(orgname):
+    """
+    Return the snapshot of the given organization for this lab action.
+    """
+    with _snapshots_lock:
+        if orgname not in _snapshots:
+            _snapshots[orgname] = Snapshot(orgname)
+        return _snapshots[orgname]
+
+
+def invalidate(orgname=None, *names):
+    """
+    Drop the given collections from the snapshot of 'orgname', or from
+    every snapshot when 'orgname' is None. Dropping every collection also
+    forgets the id of the organization, which may have been removed.
+    """
+    if not names:
+        if orgname is None:
+            _org_ids.clear()
+        else:
+            _org_ids.pop(orgname, None)
+    with _snapshots_lock:
+        if orgname is None:
+            snapshots = list(_snapshots.values())
+        else:
+            snapshots = [_snapshots[orgname]] if orgname in _snapshots else []
+    for snap in snapshots:
+        snap.invalidate(*names)
+
+
+def find_product(orgname, productname):
+    return snapshot(orgname).get("products", productname)
+
+
+def find_repository(orgname, reponame, productname=None):
+    return snapshot(orgname).get("repositories", reponame, productname)
+
+
+def find_content_view(orgname, cvname):
+    return snapshot(orgname).get("content_views", cvname)
+
+
+def find_lifecycle(orgname, lcname):
+    return snapshot(orgname).get("lifecycles", lcname)
+
+
+def find_activation_key(orgname, keyname):
+    return snapshot(orgname).get("activation_keys", keyname)
+
+
+def find(location, name, **params):
+    """
+    Return the first object named 'name' in an index call, or None.
+    """
+    for result in search(location, name=name, **params):
+        if result["name"] == name:
+            return result
+    return None
+
+
+def wait_task(task, timeout=TASK_TIMEOUT):
+    """
+    Wait for a foreman task to stop and raise if it did not succeed.
+    """
+    delay = 1
+    deadline = time.time() + timeout
+    while task["state"] not in ("stopped", "paused"):
+        if time.time() > deadline:
+            raise TimeoutError("Task %s did not finish" % task["id"])
+        time.sleep(delay)
+        delay = min(delay * 2, 10)
+        task = get_json(TASKS_API + "tasks/" + task["id"])
+    if task["result"] != "success":
+        raise Exception("Task %s finished with result '%s'"
+                        % (task["id"], task["result"]))
+    return task
+
+
+def add_sync_task(task):
+    """
+    Record a synchronization task for the next wait_sync_tasks item.
+    """
+    with _sync_lock:
+        if task["id"] not in _sync_tasks:
+            _sync_tasks.append(task["id"])
+
+
+def _progress(tasks, finished):
+    if not tasks:
+        return "No synchronizations to wait for"
+    progress = sum(t.get("progress") or 0 for t in tasks) / len(tasks)
+    return ("%d/%d synchronizations finished (%d%%)"
+            % (finished, len(tasks), progress * 100))
+
+
+def wait_tasks(ids, item=None, timeout=TASK_TIMEOUT):
+    """
+    Wait for the given foreman tasks to stop, listing all of them in one
+    call per poll, and return them. The progress is shown in the msgs of
+    'item', when given.
+    """
+    delay = 1
+    deadline = time.time() + timeout
+    while True:
+        tasks = search(TASKS_API + "tasks",
+                       search="id ^ (%s)" % ", ".join(ids))
+        finished = len([t for t in tasks
+                        if t["state"] in ("stopped", "paused")])
+        if item is not None:
+            item["msgs"] = [{"text": _progress(tasks, finished)}]
+        if finished == len(tasks):
+            break
+        if time.time() > deadline:
+            raise TimeoutError("%d tasks did not finish"
+                               % (len(tasks) - finished))
+        time.sleep(delay)
+        delay = min(delay * 2, POLL_INTERVAL)
+    return tasks
+
+
+def options(opts):
+    """
+    Convert a hammer option string such as
+    "--unlimited-hosts --release-version 8" into API parameters.
+    """
+    params = {}
+    args = shlex.split(opts or "")
+    while args:
+        key = args.pop(0).lstrip("-").replace("-", "_")
+        if not args or args[0].startswith("--"):
+            params[key] = True
+            continue
+        value = args.pop(0)
+        params[key] = {"yes": True, "true": True,
+                       "no": False, "false": False}.get(value.lower(), value)
+    return params
+
+
+def run_command(item):
+    """
+    Run the hammer command of an item that changes the satellite, and drop
+    the snapshot collections listed in its 'invalidates' key.
+    """
+    try:
+        return sshmux.run_command(item)
+    finally:
+        invalidate(item.get("orgname"), *item.get("invalidates", []))
+
+
+def _task(function):
+    """
+    Decorator for the task functions: sets the result keys in the item and
+    falls back to the hammer command when the API is not reachable.
+    """
+    @functools.wraps(function)
+    def wrapper(item):
+        item["failed"] = False
+        try:
+            if not function(item):
+                item["failed"] = True
+                item["msgs"] = [{"text": item["student_msg"]}]
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout):
+            close()
+            return hammershell.run_command(item)
+        except Exception as e:
+            item["failed"] = True
+            item["msgs"] = [{"text": "%s %s" % (item["student_msg"], e)}]
+        return item["failed"]
+    return wrapper
+
+
+@_task
+def verify_organization(item):
+    return organization_id(item["orgname"]) is not None
+
+
+@_task
+def check_organization(item):
+    if organization_id(item["orgname"]) is None:
+        post_json(KATELLO_API + "organizations",
+                  {"organization": {"name": item["orgname"],
+                                    "description": item["orgdesc"]}})
+    return True
+
+
+@_task
+def verify_repository(item):
+    repo = find_repository(item["orgname"], item["reponame"],
+                           item["productname"])
+    if repo is None:
+        return False
+    return (repo.get("last_sync") or {}).get("result") == "success"
+
+
+@_task
+def check_repo_added(item):
+    org_id = organization_id(item["orgname"])
+    if find(KATELLO_API + "repository_sets", item["reponame"],
+            organization_id=org_id, enabled=True):
+        return True
+    repo_set = find(KATELLO_API + "repository_sets", item["reponame"],
+                    organization_id=org_id)
+    if repo_set is None:
+        return False
+    put_json(KATELLO_API + "repository_sets/%s/enable" % repo_set["id"],
+             {"organization_id": org_id,
+              "basearch": "x86_64",
+              "releasever": item["release"]})
+    invalidate(item["orgname"], "repositories")
+    return True
+
+
+@_task
+def check_sync_repo(item):
+    repo = find_repository(item["orgname"], item["reponame"],
+                           item["productname"])
+    if repo is None:
+        return False
+    last_sync = repo.get("last_sync")
+    if last_sync is None:
+        add_sync_task(post_json(KATELLO_API + "repositories/%s/sync"
+                                % repo["id"]))
+        invalidate(item["orgname"], "repositories")
+    elif last_sync["state"] not in ("stopped", "paused"):
+        add_sync_task(last_sync)
+    return True
+
+
+@_task
+def check_sync_product_repos(item):
+    product = find_product(item["orgname"], item["productname"])
+    if product is None:
+        return False
+    add_sync_task(post_json(KATELLO_API + "products/%s/sync" % product["id"]))
+    invalidate(item["orgname"], "repositories")
+    return True
+
+
+@_task
+def wait_sync_tasks(item):
+    with _sync_lock:
+        ids = list(_sync_tasks)
+        _sync_tasks.clear()
+    if not ids:
+        return True
+    failed = [t for t in wait_tasks(ids, item) if t["result"] != "success"]
+    invalidate(None, "repositories")
+    if failed:
+        raise Exception("Tasks finished without success: "
+                        + ", ".join(t["id"] for t in failed))
+    return True
+
+
+@_task
+def check_cv(item):
+    if find_content_view(item["orgname"], item["cvname"]) is None:
+        body = {"organization_id": organization_id(item["orgname"]),
+                "name": item["cvname"],
+                "label": item["cvname"],
+                "description": item["cvdesc"]}
+        body.update(options(item["cvoptions"]))
+        post_json(KATELLO_API + "content_views", body)
+        invalidate(item["orgname"], "content_views")
+    return True
+
+
+@_task
+def check_repo_cv(item):
+    cv = find_content_view(item["orgname"], item["cvname"])
+    repo = find_repository(item["orgname"], item["reponame"])
+    if cv is None or repo is None:
+        return False
+    if repo["id"] not in cv["repository_ids"]:
+        put_json(KATELLO_API + "content_views/%s" % cv["id"],
+                 {"repository_ids": cv["repository_ids"] + [repo["id"]]})
+        invalidate(item["orgname"], "content_views")
+    return True
+
+
+@_task
+def check_publish_cv(item):
+    cv = find_content_view(item["orgname"], item["cvname"])
+    if cv is None:
+        return False
+    if item["lcname"] not in [e["name"] for e in cv["environments"]]:
+        wait_task(post_json(KATELLO_API + "content_views/%s/publish" % cv["id"],
+                            {"description": item["cvdesc"]}))
+        invalidate(item["orgname"], "content_views")
+    return True
+
+
+@_task
+def check_promote_cv(item):
+    cv = find_content_view(item["orgname"], item["cvname"])
+    lc = find_lifecycle(item["orgname"], item["lcname"])
+    if cv is None or lc is None:
+        return False
+    if lc["name"] not in [e["name"] for e in cv["environments"]]:
+        if not cv["versions"]:
+            return False
+        latest = max(cv["versions"], key=lambda v: float(v["version"]))
+        wait_task(post_json(
+            KATELLO_API + "content_view_versions/%s/promote" % latest["id"],
+            {"environment_ids": [lc["id"]],
+             "description": item["cvdesc"]}))
+        invalidate(item["orgname"], "content_views")
+    return True
+
+
+@_task
+def check_lifecycle(item):
+    if find_lifecycle(item["orgname"], item["lcname"]) is None:
+        prior = find_lifecycle(item["orgname"], item["lcprior"])
+        if prior is None:
+            return False
+        post_json(KATELLO_API + "environments",
+                  {"organization_id": organization_id(item["orgname"]),
+                   "name": item["lcname"],
+                   "description": item["lcdesc"],
+                   "prior_id": prior["id"]})
+        invalidate(item["orgname"], "lifecycles")
+    return True
+
+
+@_task
+def remove_lifecycle(item):
+    lc = find_lifecycle(item["orgname"], item["lcname"])
+    if lc is not None:
+        delete_json(KATELLO_API + "environments/%s" % lc["id"])
+        invalidate(item["orgname"], "lifecycles")
+    return True
+
+
+@_task
+def check_activation_key(item):
+    if find_activation_key(item["orgname"], item["keyname"]) is None:
+        cv = find_content_view(item["orgname"], item["cvname"])
+        lc = find_lifecycle(item["orgname"], item["lcname"])
+        if cv is None or lc is None:
+            return False
+        body = {"organization_id": organization_id(item["orgname"]),
+                "name": item["keyname"],
+                "content_view_id": cv["id"],
+                "environment_id": lc["id"]}
+        body.update(options(item["keyoptions"]))
+        post_json(KATELLO_API + "activation_keys", body)
+        invalidate(item["orgname"], "activation_keys")
+    return True
+
+
+@_task
+def remove_activation_key(item):
+    key = find_activation_key(item["orgname"], item["keyname"])
+    if key is not None:
+        delete_json(KATELLO_API + "activation_keys/%s" % key["id"])
+        invalidate(item["orgname"], "activation_keys")
+    return True
+
+
+@_task
+def check_key_override(item):
+    key = find_activation_key(item["orgname"], item["keyname"])
+    if key is None:
+        return False
+    override = options(item["keyoptions"])
+    put_json(KATELLO_API + "activation_keys/%s/content_override" % key["id"],
+             {"content_overrides": [{"content_label": override["content_label"],
+                                     "value": override["value"]}]})
+    return True
+
+
+def _concurrently(function, objects):
+    """
+    Call 'function' for each object on a thread pool.
+    Raises the first error once every call has finished.
+    """
+    objects = list(objects)
+    if not objects:
+        return []
+    with ThreadPoolExecutor(max_workers=TEARDOWN_WORKERS) as executor:
+        futures = [executor.submit(function, o) for o in objects]
+    return [f.result() for f in futures]
+
+
+def _all(orgname, name):
+    return [o for objs in snapshot(orgname).collection(name).values()
+            for o in objs]
+
+
+def _host_content_view(host):
+    facet = host.get("content_facet_attributes") or {}
+    return facet.get("content_view_id", host.get("content_view_id"))
+
+
+def _move_host(host, cv, lc):
+    put_json(FOREMAN_API + "hosts/%s" % host["id"],
+             {"host": {"content_facet_attributes": {
+                 "content_view_id": cv["id"],
+                 "lifecycle_environment_id": lc["id"]}}})
+
+
+def move_hosts(orgname, hosts, cv, lc):
+    """
+    Move the hosts to a content view and lifecycle environment with one bulk
+    action. When the bulk action fails, the hosts are updated concurrently,
+    a chunk at a time.
+    """
+    if not hosts:
+        return
+    try:
+        task = put_json(KATELLO_API + "hosts/bulk/environment_content_view",
+                        {"organization_id": organization_id(orgname),
+                         "included": {"ids": [h["id"] for h in hosts]},
+                         "environment_id": lc["id"],
+                         "content_view_id": cv["id"]})
+    except requests.exceptions.HTTPError:
+        for i in range(0, len(hosts), HOSTS_PER_CHUNK):
+            _concurrently(lambda h: _move_host(h, cv, lc),
+                          hosts[i:i + HOSTS_PER_CHUNK])
+    else:
+        if "state" in task:
+            wait_task(task)
+    invalidate(orgname, "hosts")
+
+
+def _remove_content_view(cv):
+    _concurrently(
+        lambda f: delete_json(KATELLO_API + "content_view_filters/%s" % f["id"]),
+        search(KATELLO_API + "content_view_filters", content_view_id=cv["id"]))
+    if cv["environments"] or cv.get("versions"):
+        wait_task(put_json(
+            KATELLO_API + "content_views/%s/remove" % cv["id"],
+            {"environment_ids": [e["id"] for e in cv["environments"]],
+             "content_view_version_ids": [v["id"] for v in cv["versions"]]}))
+    task = delete_json(KATELLO_API + "content_views/%s" % cv["id"])
+    if "state" in task:
+        wait_task(task)
+
+
+def remove_content_views(orgname):
+    """
+    Remove every content view of the organization but the default one, as
+    materials/labs/remove_cvs.sh does. Hosts move to the default view in
+    Library and the activation keys of the removed views are deleted.
+    Objects that do not depend on each other are removed concurrently.
+    """
+    invalidate(orgname)
+    views = [cv for cv in _all(orgname, "content_views")
+             if not cv.get("default")]
+    ids = set(cv["id"] for cv in views)
+    default = find_content_view(orgname, "Default Organization View")
+    library = find_lifecycle(orgname, "Library")
+
+    # The hosts and keys that use the content views go first
+    move_hosts(orgname, [h for h in _all(orgname, "hosts")
+                         if _host_content_view(h) in ids],
+               default, library)
+    _concurrently(
+        lambda k: delete_json(KATELLO_API + "activation_keys/%s" % k["id"]),
+        [k for k in _all(orgname, "activation_keys")
+         if k.get("content_view_id") in ids])
+
+    # A content view goes after the composite views that include it
+    used_by = dict((cv["id"], set(c["id"] for c in views
+                                  if cv["id"] in c.get("component_ids", [])))
+                   for cv in views)
+    removed = set()
+    while len(removed) < len(views):
+        ready = [cv for cv in views
+                 if cv["id"] not in removed and used_by[cv["id"]] <= removed]
+        _concurrently(_remove_content_view, ready)
+        removed.update(cv["id"] for cv in ready)
+    invalidate(orgname)
+
+
+@_task
+def check_all_hosts_cv(item):
+    from_cv = find_content_view(item["orgname"], item["from_cv"])
+    to_cv = find_content_view(item["orgname"], item["to_cv"])
+    to_lc = find_lifecycle(item["orgname"], item["to_lc"])
+    if to_cv is None or to_lc is None:
+        return False
+    if from_cv is not None:
+        move_hosts(item["orgname"],
+                   [h for h in _all(item["orgname"], "hosts")
+                    if _host_content_view(h) == from_cv["id"]],
+                   to_cv, to_lc)
+    return True
+
+
+@_task
+def remove_all_cvs(item):
+    remove_content_views(item["orgname"])
+    return True
+
+
+def _versions(cv):
+    """
+    Return the versions of a content view, oldest first.
+    """
+    if cv is None:
+        return []
+    return sorted(search(KATELLO_API + "content_view_versions",
+                         content_view_id=cv["id"]),
+                  key=lambda v: float(v["version"]))
+
+
+def _labels(obj):
+    return set(r["label"] for r in obj.get("repositories", []))
+
+
+def plan_content_view(orgname, cvname, state):
+    """
+    Compare a content view with its desired state and return the list of
+    operations that reach it, and the existing version that matches each
+    desired version (None for the versions to publish).
+    'state' is a dict: "versions" is a list, oldest first, of dicts with the
+    "repositories" labels and the "environments" names of each version, and
+    the optional "filters" is a list with the bodies of the filters to create.
+    Raises an exception when a repository label or a lifecycle environment
+    of the desired state is not in the organization.
+    """
+    desired = state["versions"]
+    labels = set(r["label"] for r in _all(orgname, "repositories"))
+    for version in desired:
+        missing = sorted(set(version["repositories"]) - labels)
+        if missing:
+            raise Exception("Repositories not found in organization '%s': %s"
+                            % (orgname, ", ".join(missing)))
+        for env in version["environments"]:
+            if find_lifecycle(orgname, env) is None:
+                raise Exception("Lifecycle environment '%s' not found in "
+                                "organization '%s'" % (env, orgname))
+    cv = find_content_view(orgname, cvname)
+    existing = _versions(cv)
+    ops = []
+    if cv is None:
+        ops.append(("create",))
+
+    # Match the desired versions, newest first. The newest one must be the
+    # latest version, because every publish goes to Library.
+    matches = [None] * len(desired)
+    newest = None
+    older = existing
+    for k in reversed(range(len(desired))):
+        pool = older[-1:] if k == len(desired) - 1 else older
+        found = [v for v in pool
+                 if _labels(v) == set(desired[k]["repositories"])]
+        if found:
+            matches[k] = found[-1]
+            older = older[:older.index(found[-1])]
+        elif newest is None:
+            newest = k
+    # Publishing a version makes the later ones stale
+    if newest is not None:
+        for k in range(newest, len(desired)):
+            matches[k] = None
+
+    if state.get("filters"):
+        names = []
+        if cv is not None:
+            names = [f["name"] for f in search(
+                KATELLO_API + "content_view_filters", content_view_id=cv["id"])]
+        ops += [("filter", f) for f in state["filters"] if f["name"] not in names]
+
+    for k, version in enumerate(matches):
+        if version is not None:
+            envs = [e["name"] for e in version["environments"]]
+            ops += [("promote", k, e) for e in desired[k]["environments"]
+                    if e not in envs]
+
+    current = _labels(cv or {})
+    for k, version in enumerate(matches):
+        if version is None:
+            if set(desired[k]["repositories"]) != current:
+                current = set(desired[k]["repositories"])
+                ops.append(("repositories", desired[k]["repositories"]))
+            ops.append(("publish", k))
+            ops += [("promote", k, e) for e in desired[k]["environments"]
+                    if e != "Library"]
+    if desired and set(desired[-1]["repositories"]) != current:
+        ops.append(("repositories", desired[-1]["repositories"]))
+    return ops, matches
+
+
+def reconcile_content_view(orgname, cvname, state):
+    """
+    Bring a content view to its desired state with the operations returned
+    by plan_content_view, and return them.
+    """
+    ops, matches = plan_content_view(orgname, cvname, state)
+    versions = dict((k, v["id"]) for k, v in enumerate(matches) if v)
+    cv = find_content_view(orgname, cvname)
+    for op in ops:
+        if op[0] == "create":
+            cv = post_json(KATELLO_API + "content_views",
+                           {"organization_id": organization_id(orgname),
+                            "name": cvname,
+                            "label": cvname})
+        elif op[0] == "filter":
+            post_json(KATELLO_API + "content_view_filters",
+                      dict(op[1], content_view_id=cv["id"]))
+        elif op[0] == "repositories":
+            repos = dict((r["label"], r["id"])
+                         for r in _all(orgname, "repositories"))
+            put_json(KATELLO_API + "content_views/%s" % cv["id"],
+                     {"repository_ids": [repos[label] for label in op[1]]})
+        elif op[0] == "publish":
+            wait_task(post_json(KATELLO_API + "content_views/%s/publish"
+                                % cv["id"]))
+            versions[op[1]] = _versions(cv)[-1]["id"]
+        elif op[0] == "promote":
+            wait_task(post_json(
+                KATELLO_API + "content_view_versions/%s/promote"
+                % versions[op[1]],
+                {"environment_ids": [find_lifecycle(orgname, op[2])["id"]],
+                 "force": True}))
+    if ops:
+        invalidate(orgname, "content_views")
+    return ops
+
+
+@_task
+def check_cvs_in_place(item):
+    reconcile_content_view(item["orgname"], item["cvname"], item["cvstate"])
+    return True
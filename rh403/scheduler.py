@@ -0,0 +1,143 @@
+"""
+RH403 parallel item scheduler
+
+Runs the items of a lab action concurrently on a bounded thread pool while
+Console keeps printing them in order. The pool starts when Console runs
+the first item:
+
+    Console(scheduler.parallel(items)).run_items(action="Starting")
+
+The order between items is taken from two optional keys:
+'depends_on' is a list with the labels of earlier items that must finish
+first, and 'resources' is a list of keys (such as "org:Finance" or
+"host:capsule") shared by items that must run in list order.
+Items without these keys, and 'fatal' items, are barriers: they wait for
+every earlier item, and every later item waits for them.
+
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Maximum number of items running at the same time
+WORKERS = 4
+
+
+class _Scheduler:
+
+    def __init__(self, items, workers):
+        self.items = items
+        self.tasks = [item["task"] for item in items]
+        self.results = [None] * len(items)
+        self.errors = [None] * len(items)
+        self.done = [threading.Event() for item in items]
+        self.dependents = [set() for item in items]
+        self.pending = [0] * len(items)
+        self.cancelled = False
+        self.started = False
+        self.remaining = len(items)
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self._build()
+
+    def _barrier(self, item):
+        if item.get("fatal"):
+            return True
+        return "depends_on" not in item and "resources" not in item
+
+    def _build(self):
+        labels = {}
+        owners = {}
+        barrier = None
+        since_barrier = []
+        for i, item in enumerate(self.items):
+            deps = set()
+            if self._barrier(item):
+                deps.update(since_barrier)
+                since_barrier = []
+            if barrier is not None:
+                deps.add(barrier)
+            for label in item.get("depends_on", []):
+                if label in labels:
+                    deps.add(labels[label])
+            for key in item.get("resources", []):
+                if key in owners:
+                    deps.add(owners[key])
+                owners[key] = i
+            if self._barrier(item):
+                barrier = i
+                owners = {}
+            else:
+                since_barrier.append(i)
+            labels[item["label"]] = i
+            for d in deps:
+                self.dependents[d].add(i)
+            self.pending[i] = len(deps)
+
+    def start(self):
+        with self.lock:
+            if self.started:
+                return
+            self.started = True
+        for i in range(len(self.items)):
+            if self.pending[i] == 0:
+                self._submit(i)
+
+    def _submit(self, i):
+        self.executor.submit(self._run, i)
+
+    def _run(self, i):
+        work = dict(self.items[i], task=self.tasks[i])
+        try:
+            self.results[i] = self.tasks[i](work)
+        except Exception as e:
+            self.errors[i] = e
+        work.pop("task")
+        self.items[i].update(work)
+        self._finish(i)
+
+    def _finish(self, i):
+        failed = self.errors[i] is not None or self.items[i].get("failed")
+        ready = []
+        with self.lock:
+            self.done[i].set()
+            self.remaining -= 1
+            if self.remaining == 0:
+                self.executor.shutdown(wait=False)
+            if failed and self.items[i].get("fatal"):
+                self.cancelled = True
+            for d in self.dependents[i]:
+                self.pending[d] -= 1
+                if self.pending[d] == 0:
+                    ready.append(d)
+        for d in sorted(ready):
+            if self.cancelled:
+                self._finish(d)
+            else:
+                self._submit(d)
+
+    def wait(self, i):
+        """
+        Task given to Console: starts the pool on the first call, and waits
+        for the item to run in it.
+        """
+        self.start()
+        self.done[i].wait()
+        if self.errors[i] is not None:
+            raise self.errors[i]
+        return self.results[i]
+
+
+def parallel(items, workers=WORKERS):
+    """
+    Prepare the items to run on a thread pool.
+    Returns the list of items to pass to Console, whose tasks start the
+    pool and wait for its results in list order.
+    'workers' is an int with the maximum number of concurrent items.
+    """
+    scheduler = _Scheduler(items, workers)
+    scheduled = []
+    for i, item in enumerate(items):
+        item["task"] = (lambda item, i=i: scheduler.wait(i))
+        scheduled.append(item)
+    return scheduled
@@ -24,7 +24,6 @@ Control Software with Content Views guided exercise.
 """
 
 from . import newcourselib
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite", "servera", "serverc"]
@@ -82,8 +81,6 @@ class SoftwareControl(GuidedExercise):
             newcourselib.check_default_org_loc(_orgname_ops, _location),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
 
             newcourselib.check_repo_added(_repo_tools, _orgname_ops, _release),
             newcourselib.check_sync_repo(_orgname_ops, _repo_name_tools, _productname),
@@ -91,6 +88,9 @@ class SoftwareControl(GuidedExercise):
             newcourselib.check_lifecycle(_orgname_ops, _lcdev, _lcdevdesc, _lclib),
             newcourselib.check_lifecycle(_orgname_ops, _lcqa, _lcqadesc, _lcdev),
             newcourselib.check_lifecycle(_orgname_ops, _lcprod, _lcproddesc, _lcqa),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
 
             newcourselib.check_cvs_in_place(_orgname_ops, _ops_cv),
 
@@ -101,7 +101,7 @@ class SoftwareControl(GuidedExercise):
             newcourselib.remove_packages(_host_clienta, _packages),
             newcourselib.remove_packages(_host_clientc, _packages),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -110,4 +110,4 @@ class SoftwareControl(GuidedExercise):
         items = [
             newcourselib.verify_systems(_targets),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -27,7 +27,6 @@ Manage and Apply Errata to Hosts guided exercise.
 
 from . import newcourselib
 from labs.common import steps
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 _targets = ["satellite", "servera"]
@@ -103,8 +102,6 @@ class SoftwareErrata(GuidedExercise):
             newcourselib.check_default_org_loc(_orgname_ops, _location),
 
             newcourselib.check_sync_product_repos(_orgname_ops, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
             newcourselib.check_repo_added(_repo_tools, _orgname_ops, _release),
             newcourselib.check_sync_repo(_orgname_ops, _repo_name_tools, _productname),
 
@@ -114,6 +111,9 @@ class SoftwareErrata(GuidedExercise):
             newcourselib.check_lifecycle(_orgname_ops, _lcdev, _lcdevdesc, _lclib),
             newcourselib.check_lifecycle(_orgname_ops, _lcqa, _lcqadesc, _lcdev),
             newcourselib.check_lifecycle(_orgname_ops, _lcprod, _lcproddesc, _lcqa),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_ops, _repo_name_app, _productname),
 
             newcourselib.check_cvs_in_place(_orgname_ops, _ops_cv),
 
@@ -149,7 +149,7 @@ class SoftwareErrata(GuidedExercise):
                               shell=True
                               ),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -161,4 +161,4 @@ class SoftwareErrata(GuidedExercise):
             newcourselib.remove_filter_cv(_orgname_ops, _ops_cv, _filter_osb),
             newcourselib.check_cvs_in_place(_orgname_ops, _ops_cv),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -19,9 +19,9 @@ Synchronize Red Hat Content guided exercise.
 """
 
 from . import courselib
+from . import newcourselib
 from labs.common import steps
 from labs.common import labtools
-from labs.common.userinterface import Console
 from labs.grading import Default as GuidedExercise
 
 # Vars
@@ -119,7 +119,7 @@ class SoftwareModules(GuidedExercise):
             courselib.register_host(["serverd"], _orgname, _environment, "--username='admin' --password='redhat'"),
 
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def finish(self):
         """
@@ -141,4 +141,4 @@ class SoftwareModules(GuidedExercise):
             courselib.remove_lifecycle_env(_targets, _orgname, _cvbase, "Library"),
             courselib.remove_cv(_targets, _orgname, _cvbase),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
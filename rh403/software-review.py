@@ -88,8 +88,6 @@ class SoftwareReview(GuidedExercise):
             newcourselib.verify_organization_cdn(_orgname_fin),
 
             newcourselib.check_sync_product_repos(_orgname_fin, _productname),
-            newcourselib.verify_repository(_orgname_fin, _repo_name_base, _productname),
-            newcourselib.verify_repository(_orgname_fin, _repo_name_app, _productname),
             newcourselib.check_repo_added(_repo_tools, _orgname_fin, _release),
             newcourselib.check_sync_repo(_orgname_fin, _repo_name_tools, _productname),
 
@@ -99,6 +97,9 @@ class SoftwareReview(GuidedExercise):
 
             newcourselib.check_cv(_orgname_fin, _fin_cv, _fin_cv_desc),
             newcourselib.check_repo_cv(_orgname_fin, _fin_cv, _repo_name_base),
+            newcourselib.wait_sync_tasks(),
+            newcourselib.verify_repository(_orgname_fin, _repo_name_base, _productname),
+            newcourselib.verify_repository(_orgname_fin, _repo_name_app, _productname),
             newcourselib.check_publish_cv(_orgname_fin, _fin_cv, _fin_cv_desc, _lclib),
             newcourselib.check_promote_cv(_orgname_fin, _fin_cv, _fin_cv_desc, _lcbuild),
 
@@ -108,7 +109,7 @@ class SoftwareReview(GuidedExercise):
             newcourselib.remove_packages(_host_clientb, _packages),
             newcourselib.disable_repo(_orgname_fin, _repo_name_ha, _release),
         ]
-        Console(items).run_items(action="Starting")
+        newcourselib.run_items(items, _targets, action="Starting")
 
     def grade(self):
         """Perform evaluation steps on the system."""
@@ -301,4 +302,4 @@ class SoftwareReview(GuidedExercise):
             #                   shell=True
             #                   ),
         ]
-        Console(items).run_items(action="Finishing")
+        newcourselib.run_items(items, _targets, action="Finishing")
@@ -0,0 +1,259 @@
+"""
+RH403 SSH connection multiplexing
+
+Keeps one authenticated OpenSSH master connection per host for the whole
+lab action and runs every command and file copy through it. The labs use
+it through newcourselib.run_items:
+
+    with sshmux.session(_targets):
+        Console(sshmux.multiplex(items)).run_items(action="Starting")
+
+Commands that run in workstation get 'ssh' and 'scp' wrappers, so the
+'ssh root@satellite ...' and 'scp ... root@capsule:' hops inside the
+newcourselib commands reuse the same connections.
+
+coalesce() fuses runs of adjacent items for the same host into a single
+remote script, so a run of checks costs one round trip.
+
+"""
+
+import os
+import glob
+import uuid
+import shlex
+import shutil
+import tempfile
+import threading
+import subprocess
+import contextlib
+
+from labs.common import tasks
+
+# Hosts where the commands run locally
+LOCAL_HOSTS = ("localhost", "workstation")
+# Seconds an idle master connection stays open
+PERSIST = 600
+# Seconds to wait for a host when opening its master connection
+CONNECT_TIMEOUT = 10
+
+_control_dir = None
+# Other tasks whose items coalesce() can fuse, with the function that
+# returns the shell code their commands need
+_preludes = {}
+
+
+def options():
+    """
+    Return the ssh options that reuse the master connections.
+    """
+    if _control_dir is None:
+        return []
+    return ["-o", "ControlMaster=auto",
+            "-o", "ControlPath=" + os.path.join(_control_dir, "%C"),
+            "-o", "ControlPersist=%d" % PERSIST]
+
+
+def _wrappers():
+    """
+    Return the bash functions that make 'ssh' and 'scp' use the masters.
+    """
+    opts = " ".join(shlex.quote(o) for o in options())
+    return ("ssh() { command ssh " + opts + " \"$@\"; };"
+            + " scp() { command scp " + opts + " \"$@\"; };\n")
+
+
+def connect(hosts, username="root"):
+    """
+    Open the master connections to the given hosts.
+    'hosts' should be passed in as a list.
+    """
+    global _control_dir
+    if _control_dir is None:
+        _control_dir = tempfile.mkdtemp(prefix="rh403-ssh-")
+    for host in hosts:
+        if host not in LOCAL_HOSTS:
+            # A host that is down must not hold the lab action here;
+            # verify_systems reports it
+            subprocess.run(["ssh", "-o", "ConnectTimeout=%d" % CONNECT_TIMEOUT]
+                           + options() + [username + "@" + host, "true"],
+                           stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL)
+
+
+def disconnect():
+    """
+    Close every master connection opened during the lab action.
+    """
+    global _control_dir
+    if _control_dir is None:
+        return
+    for socket in glob.glob(os.path.join(_control_dir, "*")):
+        subprocess.run(["ssh", "-S", socket, "-O", "exit", "localhost"],
+                       stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL)
+    shutil.rmtree(_control_dir, ignore_errors=True)
+    _control_dir = None
+
+
+@contextlib.contextmanager
+def session(hosts):
+    """
+    Context manager that keeps the master connections open.
+    'hosts' should be passed in as a list.
+    """
+    connect(hosts)
+    try:
+        yield
+    finally:
+        disconnect()
+
+
+def _run(host, item, command=None):
+    command = command or item["command"]
+    if host in LOCAL_HOSTS:
+        return subprocess.run(["bash", "-c", _wrappers() + command],
+                              stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE,
+                              universal_newlines=True)
+    user = item.get("username") or "root"
+    return subprocess.run(["ssh"] + options() + [user + "@" + host, "bash -s"],
+                          input=command,
+                          stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE,
+                          universal_newlines=True)
+
+
+def check_result(item, returncode, output):
+    """
+    Set the result keys of an item from a command exit code and standard
+    output, comparing them with the 'returns' and 'prints' keys.
+    """
+    item["failed"] = False
+    if str(returncode) != str(item.get("returns", 0)):
+        item["failed"] = True
+    elif item.get("prints") and item["prints"] not in output:
+        item["failed"] = True
+    if item["failed"]:
+        item["msgs"] = [{"text": item.get("student_msg", "")}]
+    return item["failed"]
+
+
+def run_command(item):
+    """
+    Drop-in replacement for tasks.run_command that runs the command through
+    the master connections. Without an open session it uses tasks.run_command.
+    """
+    if _control_dir is None:
+        return tasks.run_command(item)
+    for host in item["hosts"]:
+        result = _run(host, item)
+        if check_result(item, result.returncode, result.stdout):
+            break
+    return item["failed"]
+
+
+def multiplex(items):
+    """
+    Make the run_command items of a lab action use the master connections.
+    """
+    for item in items:
+        if item.get("task") is tasks.run_command:
+            item["task"] = run_command
+    return items
+
+
+class _Batch:
+    """
+    Items fused into one remote script. The first item that runs executes
+    the script; every item then reads its own exit code and output.
+    """
+
+    def __init__(self, host, items):
+        self.host = host
+        self.items = items
+        self.prelude = _preludes.get(items[0]["task"])
+        self.results = None
+        self.lock = threading.Lock()
+
+    def _script(self, marker):
+        script = ""
+        if self.prelude is not None:
+            script = self.prelude(self.items[0])
+        for i, item in enumerate(self.items):
+            # The end marker starts with a newline, in case the output
+            # of the command does not end with one
+            script += ("echo '%s begin %d'\n" % (marker, i)
+                       + "(\n" + item["command"] + "\n) </dev/null\n"
+                       + "printf '\\n%s end %d %%d\\n' $?\n" % (marker, i))
+        return script
+
+    def _execute(self):
+        marker = "@@rh403-" + uuid.uuid4().hex
+        result = _run(self.host, self.items[0], self._script(marker))
+        self.results = [(result.returncode, result.stdout)] * len(self.items)
+        current, output = None, ""
+        for line in result.stdout.splitlines(keepends=True):
+            if line.startswith(marker + " begin "):
+                current, output = int(line.split()[2]), ""
+            elif line.startswith(marker + " end ") and current is not None:
+                self.results[current] = (int(line.split()[3]), output[:-1])
+                current = None
+            else:
+                output += line
+
+    def task(self, item, index):
+        with self.lock:
+            if self.results is None:
+                self._execute()
+        returncode, output = self.results[index]
+        return check_result(item, returncode, output)
+
+
+def register(task, prelude):
+    """
+    Let coalesce() fuse the items of another run_command-like task.
+    'prelude' is called with the first item of a batch when it runs, and
+    returns the shell code that goes before the fused commands.
+    """
+    _preludes[task] = prelude
+
+
+def _fusable(item):
+    return ((item.get("task") in (tasks.run_command, run_command)
+             or item.get("task") in _preludes)
+            and not item.get("fatal")
+            and len(item.get("hosts", [])) == 1
+            and item["hosts"][0] not in LOCAL_HOSTS)
+
+
+def _same_batch(first, item):
+    # The scheduler must be able to run both items at the same point:
+    # same task, host and user, and the same 'depends_on' and 'resources' keys
+    # (items without them are barriers that run alone, one after the other)
+    return (first["task"] == item["task"]
+            and first["hosts"] == item["hosts"]
+            and first.get("username") == item.get("username")
+            and first.get("depends_on") == item.get("depends_on")
+            and first.get("resources") == item.get("resources"))
+
+
+def coalesce(items):
+    """
+    Fuse runs of adjacent, non-fatal run_command items that target the same
+    remote host, and that have the same scheduler keys, into one script that
+    reports the exit code of each item. Console still shows every label
+    with its own result.
+    """
+    groups = []
+    for item in items:
+        if (_fusable(item) and groups and _fusable(groups[-1][0])
+                and _same_batch(groups[-1][0], item)):
+            groups[-1].append(item)
+        else:
+            groups.append([item])
+    for group in groups:
+        if len(group) > 1:
+            batch = _Batch(group[0]["hosts"][0], group)
+            for i, item in enumerate(group):
+                item["task"] = (lambda item, i=i, batch=batch: batch.task(item, i))
+    return items
@@ -0,0 +1,130 @@
+import os
+import shutil
+import threading
+import subprocess
+import importlib.util
+
+import pytest
+
+from rh403 import hammershell
+from rh403 import sshmux
+
+WORKER = os.path.join(os.path.dirname(__file__),
+                      "materials", "labs", "hammer_shell.py")
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """
+    Return the list of the commands that reach sshmux.
+    """
+    commands = []
+
+    def run_command(item):
+        commands.append(item["command"])
+        item["failed"] = False
+        return False
+    monkeypatch.setattr(sshmux, "run_command", run_command)
+    monkeypatch.setattr(hammershell, "alive", lambda: False)
+    monkeypatch.setattr(hammershell, "_failed", False)
+    return commands
+
+
+def _starts(monkeypatch, ok):
+    starts = []
+
+    def start():
+        starts.append(ok)
+        return ok
+    monkeypatch.setattr(hammershell, "start", start)
+    return starts
+
+
+def _item(command, host="satellite"):
+    return {"command": command, "hosts": [host]}
+
+
+def test_satellite_commands_call_the_worker(sent, monkeypatch):
+    _starts(monkeypatch, True)
+    item = _item("hammer organization list")
+    hammershell.run_command(item)
+    [command] = sent
+    assert command.startswith("hammer() {")
+    assert command.endswith("\nhammer organization list")
+    assert item["command"] == "hammer organization list"
+
+
+def test_other_hosts_run_their_command(sent, monkeypatch):
+    starts = _starts(monkeypatch, True)
+    hammershell.run_command(_item("dnf install -y foo", host="capsule"))
+    assert sent == ["dnf install -y foo"]
+    assert starts == []
+
+
+def test_failed_start_is_not_retried(sent, monkeypatch):
+    starts = _starts(monkeypatch, False)
+    for i in range(3):
+        hammershell.run_command(_item("hammer host list"))
+    assert sent == ["hammer host list"] * 3
+    assert starts == [False]
+
+
+# A hammer command that exits with the code of its first argument, and
+# writes to stdout and stderr
+FAKE_HAMMER = """#!%s
+$stdout.puts("out " + ARGV.join(" "))
+$stderr.puts("err")
+exit(ARGV[0].to_i)
+"""
+
+
+@pytest.fixture
+def worker(monkeypatch, tmp_path):
+    ruby = shutil.which("ruby")
+    if ruby is None:
+        pytest.skip("ruby is not installed")
+    hammer = tmp_path / "hammer"
+    hammer.write_text(FAKE_HAMMER % ruby)
+    hammer.chmod(0o755)
+    monkeypatch.setenv("PATH", "%s:%s" % (tmp_path, os.environ["PATH"]))
+    spec = importlib.util.spec_from_file_location("hammer_shell", WORKER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_worker_keeps_the_exit_code_and_streams(worker):
+    w = worker.Worker()
+    try:
+        assert w.run(["0"]) == {"returncode": 0, "stdout": "out 0\n",
+                                "stderr": "err\n"}
+        assert w.run(["65", "x"])["returncode"] == 65
+    finally:
+        w.proc.kill()
+
+
+def test_call_goes_through_the_server(worker, tmp_path):
+    socket = str(tmp_path / "socket")
+    server = subprocess.Popen(["python3", WORKER, "serve", socket],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                              universal_newlines=True)
+    try:
+        assert server.stdout.readline().strip() == "ready"
+        results = []
+
+        def call(code):
+            results.append(subprocess.run(
+                ["python3", WORKER, "call", socket, code],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                universal_newlines=True))
+        threads = [threading.Thread(target=call, args=(c,))
+                   for c in ("0", "3")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sorted(r.returncode for r in results) == [0, 3]
+        assert all(r.stderr == "err\n" for r in results)
+    finally:
+        server.stdin.close()
+        server.wait(timeout=10)
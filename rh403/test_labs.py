@@ -0,0 +1,58 @@
+import ast
+import glob
+import os
+
+import pytest
+
+LABS = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "*-*.py")))
+
+# Items that start the asynchronous synchronizations
+SYNC = {"check_sync_repo", "check_sync_product_repos"}
+# Items that do not need the synchronized content, so they can run while
+# the synchronizations finish
+SYNC_SAFE = SYNC | {
+    "check_activation_key", "check_cv", "check_collection",
+    "check_component_cv", "check_default_org_loc", "check_directory",
+    "check_file_in_satellite", "check_foreman_key", "check_key_override",
+    "check_lifecycle", "check_location", "check_manifest_in_satellite",
+    "check_manifest_in_workstation", "check_organization", "check_repo_added",
+    "check_repo_cv", "check_root_ssh_login", "check_script",
+    "check_user_description", "copy_file", "remove_activation_key",
+    "remove_file_directory", "remove_user", "satellite_status",
+    "verify_default_location", "verify_default_organization",
+    "verify_organization", "verify_organization_cdn", "verify_systems",
+}
+
+
+def _factory(node):
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+            and getattr(node.func.value, "id", None) == "newcourselib"):
+        return node.func.attr
+    return None
+
+
+def _item_lists(path):
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    for node in ast.walk(tree):
+        if isinstance(node, ast.List):
+            factories = [(e.lineno, _factory(e)) for e in node.elts]
+            if any(f in SYNC for _, f in factories):
+                yield factories
+
+
+@pytest.mark.parametrize("path", LABS, ids=os.path.basename)
+def test_sync_dependent_items_wait_for_the_syncs(path):
+    for factories in _item_lists(path):
+        pending = None
+        for line, factory in factories:
+            if factory in SYNC:
+                pending = pending or line
+            elif factory == "wait_sync_tasks":
+                pending = None
+            elif pending:
+                assert factory in SYNC_SAFE, (
+                    "line %d: %s runs before the wait for the "
+                    "synchronization at line %d" % (line, factory, pending))
+        assert pending is None, (
+            "the synchronization at line %d is never waited for" % pending)
@@ -0,0 +1,217 @@
+import pytest
+import requests
+
+from rh403 import hammershell
+from rh403 import newcourselib
+from rh403 import satelliteapi
+from rh403 import sshmux
+
+API = satelliteapi.KATELLO_API
+
+
+class FakeSatellite:
+    """
+    Answers the API calls of satelliteapi from in-memory collections, and
+    records the calls that change the satellite, in order.
+    """
+
+    def __init__(self, **collections):
+        self.collections = dict(organizations=[{"id": 1, "name": "Org"}],
+                                content_view_filters=[],
+                                content_view_versions=[])
+        self.collections.update(collections)
+        # Largest page that the Foreman endpoints return
+        self.page_size = 20
+        self.searches = []
+        self.calls = []
+
+    def get_json(self, location, **params):
+        self.searches.append(location)
+        for name, url in satelliteapi.COLLECTIONS.items():
+            if location == url:
+                results = self.collections.get(name, [])
+                break
+        else:
+            results = self.collections[location.rsplit("/", 1)[-1]]
+        if location.startswith(API) and params.get("full_result"):
+            return {"subtotal": len(results), "results": results}
+        # Foreman ignores full_result, and pages the results
+        per_page = min(int(params.get("per_page", 20)), self.page_size)
+        start = (int(params.get("page", 1)) - 1) * per_page
+        return {"subtotal": len(results),
+                "results": results[start:start + per_page]}
+
+    def change(self, method):
+        def call(location, json_data=None):
+            self.calls.append((method, location[len(API):]))
+            return {}
+        return call
+
+
+@pytest.fixture
+def satellite(monkeypatch):
+    fake = FakeSatellite()
+    monkeypatch.setattr(satelliteapi, "get_json", fake.get_json)
+    for method in ("post", "put", "delete"):
+        monkeypatch.setattr(satelliteapi, method + "_json", fake.change(method))
+    monkeypatch.setattr(satelliteapi, "wait_task", lambda task: task)
+    satelliteapi.close()
+    yield fake
+    satelliteapi.close()
+
+
+def test_snapshot_lists_each_collection_once(satellite):
+    satellite.collections["products"] = [{"id": 7, "name": "Prod"}]
+    assert satelliteapi.find_product("Org", "Prod")["id"] == 7
+    assert satelliteapi.find_product("Org", "Other") is None
+    assert satellite.searches.count(satelliteapi.COLLECTIONS["products"]) == 1
+
+
+def test_invalidate_drops_only_the_given_collections(satellite):
+    satellite.collections["products"] = [{"id": 7, "name": "Prod"}]
+    satellite.collections["lifecycles"] = [{"id": 2, "name": "Library"}]
+    satelliteapi.find_product("Org", "Prod")
+    satelliteapi.find_lifecycle("Org", "Library")
+    satellite.collections["products"] = [{"id": 8, "name": "Prod"}]
+    satelliteapi.invalidate("Org", "products")
+    assert satelliteapi.find_product("Org", "Prod")["id"] == 8
+    assert satellite.searches.count(satelliteapi.COLLECTIONS["lifecycles"]) == 1
+
+
+def test_run_command_invalidates_its_collections(satellite, monkeypatch):
+    monkeypatch.setattr(sshmux, "run_command", lambda item: False)
+    satellite.collections["activation_keys"] = []
+    assert satelliteapi.find_activation_key("Org", "key") is None
+    satellite.collections["activation_keys"] = [{"id": 3, "name": "key"}]
+    satelliteapi.run_command({"orgname": "Org",
+                              "invalidates": ["activation_keys"]})
+    assert satelliteapi.find_activation_key("Org", "key")["id"] == 3
+
+
+def test_remove_org_forgets_the_organization_id(satellite, monkeypatch):
+    monkeypatch.setattr(sshmux, "run_command", lambda item: False)
+    assert satelliteapi.organization_id("Org") == 1
+    satellite.collections["organizations"] = [{"id": 2, "name": "Org"}]
+    assert satelliteapi.organization_id("Org") == 1
+    item = newcourselib.remove_org("Org")
+    item["task"](item)
+    assert satelliteapi.organization_id("Org") == 2
+
+
+def test_search_reads_every_foreman_page(satellite):
+    satellite.collections["hosts"] = [{"id": i, "name": "host%d" % i}
+                                      for i in range(45)]
+    hosts = satelliteapi._all("Org", "hosts")
+    assert [h["id"] for h in hosts] == list(range(45))
+    assert satellite.searches.count(satelliteapi.COLLECTIONS["hosts"]) == 3
+
+
+def test_search_reads_katello_at_once(satellite):
+    satellite.collections["products"] = [{"id": i, "name": "product%d" % i}
+                                         for i in range(45)]
+    assert len(satelliteapi._all("Org", "products")) == 45
+    assert satellite.searches.count(satelliteapi.COLLECTIONS["products"]) == 1
+
+
+def test_task_falls_back_to_hammer_shell(monkeypatch):
+    ran = []
+
+    def run_command(item):
+        ran.append(item["command"])
+        item["failed"] = False
+        return False
+    monkeypatch.setattr(hammershell, "run_command", run_command)
+
+    @satelliteapi._task
+    def unreachable(item):
+        raise requests.exceptions.ConnectionError()
+    item = {"command": "hammer organization list", "student_msg": "Failed."}
+    assert unreachable(item) is False
+    assert ran == ["hammer organization list"]
+
+
+def test_task_reports_other_errors():
+    @satelliteapi._task
+    def broken(item):
+        raise Exception("no such product")
+    item = {"command": "hammer product list", "student_msg": "Failed."}
+    assert broken(item) is True
+    assert item["msgs"] == [{"text": "Failed. no such product"}]
+
+
+def test_remove_content_views_order(satellite):
+    satellite.collections.update(
+        content_views=[
+            {"id": 1, "name": "Default Organization View", "default": True,
+             "environments": [], "versions": []},
+            {"id": 2, "name": "base", "environments": [], "versions": []},
+            {"id": 3, "name": "composite", "component_ids": [2],
+             "environments": [], "versions": []},
+        ],
+        lifecycles=[{"id": 10, "name": "Library"}],
+        hosts=[{"id": 20, "name": "servera", "content_view_id": 2},
+               {"id": 21, "name": "serverb", "content_view_id": 1}],
+        activation_keys=[{"id": 30, "name": "key", "content_view_id": 3}],
+    )
+    satelliteapi.remove_content_views("Org")
+    assert satellite.calls == [
+        ("put", "hosts/bulk/environment_content_view"),
+        ("delete", "activation_keys/30"),
+        ("delete", "content_views/3"),
+        ("delete", "content_views/2"),
+    ]
+
+
+def _plan(state):
+    return satelliteapi.plan_content_view("Org", "cv", state)
+
+
+def test_plan_content_view_from_scratch(satellite):
+    satellite.collections.update(
+        repositories=[{"id": 4, "name": "BaseOS", "label": "base"}],
+        lifecycles=[{"id": 10, "name": "Library"}, {"id": 11, "name": "Dev"}],
+    )
+    ops, matches = _plan({"versions": [{"repositories": ["base"],
+                                        "environments": ["Library", "Dev"]}]})
+    assert ops == [("create",), ("repositories", ["base"]), ("publish", 0),
+                   ("promote", 0, "Dev")]
+    assert matches == [None]
+
+
+def test_plan_content_view_skips_matching_versions(satellite):
+    base = [{"label": "base"}]
+    satellite.collections.update(
+        repositories=[{"id": 4, "name": "BaseOS", "label": "base"}],
+        lifecycles=[{"id": 10, "name": "Library"}, {"id": 11, "name": "Dev"},
+                    {"id": 12, "name": "Prod"}],
+        content_views=[{"id": 2, "name": "cv", "repositories": base,
+                        "environments": [], "versions": []}],
+        content_view_versions=[
+            {"id": 5, "version": "1.0", "repositories": base,
+             "environments": [{"name": "Library"}, {"name": "Dev"}]}],
+    )
+    ops, matches = _plan({"versions": [{"repositories": ["base"],
+                                        "environments": ["Library", "Dev",
+                                                         "Prod"]}]})
+    assert ops == [("promote", 0, "Prod")]
+    assert [v["id"] for v in matches] == [5]
+
+
+def test_plan_content_view_missing_repository(satellite):
+    satellite.collections.update(
+        repositories=[{"id": 4, "name": "BaseOS", "label": "base"}],
+        lifecycles=[{"id": 10, "name": "Library"}],
+    )
+    with pytest.raises(Exception, match="Repositories not found .*: app"):
+        _plan({"versions": [{"repositories": ["base", "app"],
+                             "environments": ["Library"]}]})
+
+
+def test_plan_content_view_missing_lifecycle(satellite):
+    satellite.collections.update(
+        repositories=[{"id": 4, "name": "BaseOS", "label": "base"}],
+        lifecycles=[{"id": 10, "name": "Library"}],
+    )
+    with pytest.raises(Exception, match="Lifecycle environment 'Dev' not"):
+        _plan({"versions": [{"repositories": ["base"],
+                             "environments": ["Library", "Dev"]}]})
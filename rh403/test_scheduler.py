@@ -0,0 +1,121 @@
+import time
+import threading
+
+from rh403 import newcourselib
+from rh403 import scheduler
+
+
+def _run_items(items):
+    # Runs the tasks in list order, like Console.run_items
+    for item in items:
+        item["task"](item)
+        if item.get("fatal") and item.get("failed"):
+            break
+
+
+def _recorder(log, lock, delay=0.0, failed=False):
+    def task(item):
+        with lock:
+            log.append(("start", item["label"]))
+        time.sleep(delay)
+        with lock:
+            log.append(("end", item["label"]))
+        item["failed"] = failed
+        return failed
+    return task
+
+
+def _item(label, task, **keys):
+    return dict(label=label, task=task, **keys)
+
+
+def test_nothing_runs_before_console():
+    log, lock = [], threading.Lock()
+    items = scheduler.parallel([_item("a", _recorder(log, lock), resources=["r"])])
+    time.sleep(0.1)
+    assert log == []
+    _run_items(items)
+    assert log == [("start", "a"), ("end", "a")]
+
+
+def test_shared_resources_run_in_list_order():
+    log, lock = [], threading.Lock()
+    items = scheduler.parallel([
+        _item("a", _recorder(log, lock, 0.1), resources=["org:A"]),
+        _item("b", _recorder(log, lock), resources=["org:A"]),
+    ])
+    _run_items(items)
+    assert log == [("start", "a"), ("end", "a"), ("start", "b"), ("end", "b")]
+
+
+def test_depends_on_waits_for_label():
+    log, lock = [], threading.Lock()
+    items = scheduler.parallel([
+        _item("a", _recorder(log, lock, 0.1), resources=["org:A"]),
+        _item("b", _recorder(log, lock), resources=["org:B"], depends_on=["a"]),
+    ])
+    _run_items(items)
+    assert log.index(("end", "a")) < log.index(("start", "b"))
+
+
+def test_independent_items_overlap():
+    log, lock = [], threading.Lock()
+    items = scheduler.parallel([
+        _item("a", _recorder(log, lock, 0.2), resources=["org:A"]),
+        _item("b", _recorder(log, lock, 0.2), resources=["org:B"]),
+    ])
+    _run_items(items)
+    assert log.index(("start", "b")) < log.index(("end", "a"))
+
+
+def test_barrier_waits_for_earlier_and_blocks_later():
+    log, lock = [], threading.Lock()
+    items = scheduler.parallel([
+        _item("a", _recorder(log, lock, 0.1), resources=["org:A"]),
+        _item("b", _recorder(log, lock, 0.2), resources=["org:B"]),
+        _item("barrier", _recorder(log, lock)),
+        _item("c", _recorder(log, lock), resources=["org:C"]),
+    ])
+    _run_items(items)
+    start = log.index(("start", "barrier"))
+    assert log.index(("end", "a")) < start
+    assert log.index(("end", "b")) < start
+    assert log.index(("end", "barrier")) < log.index(("start", "c"))
+
+
+def test_failed_fatal_item_cancels_dependents():
+    log, lock = [], threading.Lock()
+    items = scheduler.parallel([
+        _item("a", _recorder(log, lock), resources=["org:A"]),
+        _item("fatal", _recorder(log, lock, failed=True), fatal=True),
+        _item("b", _recorder(log, lock), resources=["org:A"]),
+        _item("c", _recorder(log, lock)),
+    ])
+    _run_items(items)
+    time.sleep(0.1)
+    labels = [label for event, label in log if event == "start"]
+    assert labels == ["a", "fatal"]
+    assert items[1]["failed"]
+
+
+def test_task_errors_reach_console():
+    def task(item):
+        raise RuntimeError("boom")
+    items = scheduler.parallel([_item("a", task)])
+    try:
+        items[0]["task"](items[0])
+    except RuntimeError as e:
+        assert str(e) == "boom"
+    else:
+        assert False, "the error of the task was not raised"
+
+
+def test_lab_actions_run_through_the_scheduler():
+    log, lock = [], threading.Lock()
+    newcourselib.run_items([
+        _item("a", _recorder(log, lock, 0.2), resources=["org:A"]),
+        _item("b", _recorder(log, lock, 0.2), resources=["org:B"]),
+        _item("c", _recorder(log, lock)),
+    ], [], action="Starting")
+    assert log.index(("start", "b")) < log.index(("end", "a"))
+    assert log[-2:] == [("start", "c"), ("end", "c")]
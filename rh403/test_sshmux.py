@@ -0,0 +1,118 @@
+import types
+import subprocess
+
+import pytest
+from labs.common import tasks
+
+from rh403 import hammershell
+from rh403 import newcourselib
+from rh403 import scheduler
+from rh403 import sshmux
+
+
+@pytest.fixture
+def local_run(monkeypatch, tmp_path):
+    """
+    Run the remote scripts with a local bash. Returns the 'path' of the
+    file where the commands of the tests write their execution order, and
+    the list of the 'scripts' that ran.
+    """
+    log = types.SimpleNamespace(path=tmp_path / "log", scripts=[])
+
+    def run(host, item, command=None):
+        log.scripts.append(command or item["command"])
+        return subprocess.run(["bash", "-c", command or item["command"]],
+                              stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE,
+                              universal_newlines=True)
+    monkeypatch.setattr(sshmux, "_run", run)
+    monkeypatch.setattr(sshmux, "_control_dir", str(tmp_path))
+    return log
+
+
+def _item(label, command, host="satellite", **keys):
+    return dict(label=label, command=command, hosts=[host],
+                task=sshmux.run_command, **keys)
+
+
+def _log(log, name, delay=0):
+    return "sleep %s; echo %s >> %s" % (delay, name, log)
+
+
+def _run_items(items):
+    for item in items:
+        item["task"](item)
+
+
+def test_coalesce_keeps_results_per_item(local_run):
+    items = sshmux.coalesce([
+        _item("a", "echo one", prints="one"),
+        _item("b", "printf two; exit 3", returns="3", prints="two"),
+        _item("c", "echo three", prints="four"),
+    ])
+    _run_items(items)
+    assert [i["failed"] for i in items] == [False, False, True]
+
+
+def test_prints_ignores_stderr(local_run):
+    items = sshmux.coalesce([
+        _item("a", "echo out; echo err >&2", prints="err"),
+        _item("b", "echo out; echo err >&2", prints="out"),
+    ])
+    _run_items(items)
+    assert [i["failed"] for i in items] == [True, False]
+
+
+def test_coalesce_groups_same_scheduler_keys(local_run):
+    items = sshmux.coalesce([
+        _item("a", "true", resources=["org:A"]),
+        _item("b", "true", resources=["org:A"]),
+        _item("c", "true", resources=["org:B"]),
+        _item("d", "true"),
+        _item("e", "true"),
+        _item("f", "true", host="capsule"),
+    ])
+    _run_items(items)
+    # a+b, c, d+e, and f
+    assert len(local_run.scripts) == 4
+
+
+def test_scheduler_order_with_coalesced_items(local_run):
+    log = local_run.path
+    items = sshmux.coalesce(sshmux.multiplex([
+        _item("slow", _log(log, "slow", 0.3), host="capsule",
+              resources=["host:capsule"]),
+        _item("a", _log(log, "a"), resources=["org:A"]),
+        _item("b", _log(log, "b"), resources=["org:A"]),
+        _item("barrier1", _log(log, "barrier1")),
+        _item("barrier2", _log(log, "barrier2")),
+        _item("after", _log(log, "after"), resources=["org:A"]),
+    ]))
+    _run_items(scheduler.parallel(items))
+    order = log.read_text().split()
+    assert order.index("a") < order.index("b")
+    assert order.index("slow") < order.index("barrier1")
+    assert order.index("b") < order.index("barrier1")
+    assert order.index("barrier1") < order.index("barrier2")
+    assert order.index("barrier2") < order.index("after")
+    assert all(not i["failed"] for i in items)
+
+
+def test_lab_actions_use_the_master_connections(local_run):
+    item = dict(_item("a", "echo one", prints="one"), task=tasks.run_command)
+    newcourselib.run_items([item], [], action="Starting")
+    assert local_run.scripts == ["echo one"]
+    assert not item["failed"]
+
+
+def test_coalesce_fuses_hammer_shell_items(local_run, monkeypatch):
+    monkeypatch.setattr(newcourselib, "BACKEND", "shell")
+    monkeypatch.setattr(hammershell, "alive", lambda: True)
+    items = [newcourselib.check_lifecycle("Org", lc, "", "Library")
+             for lc in ("Dev", "QA", "Prod")]
+    assert all(i["task"] is hammershell.run_command for i in items)
+    _run_items(sshmux.coalesce(sshmux.multiplex(items)))
+    [script] = local_run.scripts
+    assert script.startswith("hammer() {")
+    assert script.count("hammer() {") == 1
+    assert all(i["command"] in script for i in items)